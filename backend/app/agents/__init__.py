@@ -1,6 +1,47 @@
-"""LangGraph agent for hackathon matching and code generation."""
-from app.agents.graph import app_agent
-from app.agents.state import AgentState
+"""LangGraph agent for hackathon matching and code generation.
 
-__all__ = ["app_agent", "AgentState"]
+``app_agent`` and ``AgentState`` are resolved lazily: importing this package
+does not pull in langgraph/langchain or compile the graph. The first access
+(or ``get_agent()``, e.g. from a background warm-up) pays that cost once.
+"""
+import asyncio
+import logging
+import threading
+import time
 
+__all__ = ["app_agent", "AgentState", "get_agent", "warm_up_agent"]
+
+logger = logging.getLogger(__name__)
+
+_agent = None
+_agent_lock = threading.Lock()
+
+
+def get_agent():
+    """Import and compile the agent graph on first use (thread-safe)."""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                from app.agents.graph import app_agent as compiled
+                _agent = compiled
+    return _agent
+
+
+async def warm_up_agent():
+    """Load the agent in a worker thread so the first request does not pay for it."""
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(get_agent)
+        logger.info(f"[OK] Agent graph warmed up in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        logger.warning(f"[WARN] Agent warm-up failed (will retry on first use): {e}")
+
+
+def __getattr__(name):
+    if name == "app_agent":
+        return get_agent()
+    if name == "AgentState":
+        from app.agents.state import AgentState
+        return AgentState
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,15 +4,16 @@ from app.agents.nodes_data import analyze_profile_node
 from app.agents.nodes_match import match_hackathons_node
 from app.agents.nodes_judge import judge_simulation_node
 from app.agents.nodes_gen import generate_boilerplate_node
+from app.core.tracing import traced_node
 
 # Initialize the Graph
 workflow = StateGraph(AgentState)
 
-# Add our Nodes (the workers)
-workflow.add_node("analyze_profile", analyze_profile_node)
-workflow.add_node("match_hackathons", match_hackathons_node)
-workflow.add_node("judge_simulation", judge_simulation_node)
-workflow.add_node("generate_boilerplate", generate_boilerplate_node)
+# Add our Nodes (the workers), each traced with a span + latency histogram
+workflow.add_node("analyze_profile", traced_node("analyze_profile")(analyze_profile_node))
+workflow.add_node("match_hackathons", traced_node("match_hackathons")(match_hackathons_node))
+workflow.add_node("judge_simulation", traced_node("judge_simulation")(judge_simulation_node))
+workflow.add_node("generate_boilerplate", traced_node("generate_boilerplate")(generate_boilerplate_node))
 
 # Define the Flow (the edges)
 workflow.set_entry_point("analyze_profile")
@@ -1,16 +1,45 @@
-import httpx
-import os
+import logging
+
+from app.utils.github_client import GitHubClient
+from app.utils.github_harvester import GitHubProfileHarvester
+
+logger = logging.getLogger(__name__)
+
+# Languages must carry at least this share of the skill vector to be added as skills
+SKILL_VECTOR_MIN_SHARE = 0.05
+
 
 async def analyze_profile_node(state):
     print("---ANALYZING USER PROFILE---")
     
-    # In a real scenario, this would use the GitHubClient we wrote.
-    # For this test, we are simulating the extraction of skills.
     user_skills = state.get("skills", [])
-    github_summary = state.get("github_summary", "No summary provided.")
+    github_summary = state.get("github_summary") or "No summary provided."
+    skill_vector = state.get("github_skill_vector") or {}
+    degraded = False
+    
+    # Harvest the full GitHub profile when we only have a username
+    github_username = state.get("github_username")
+    if github_username and not state.get("github_summary"):
+        try:
+            harvester = GitHubProfileHarvester(GitHubClient())
+            profile = await harvester.harvest(github_username)
+            github_summary = profile.summary
+            skill_vector = profile.skill_vector
+        except Exception as e:
+            logger.warning(f"GitHub harvest failed for {github_username}: {e}")
+            degraded = True
+    
+    # Fold significant languages into the explicit skill list
+    known = {s.lower() for s in user_skills}
+    derived = [
+        lang for lang, share in skill_vector.items()
+        if share >= SKILL_VECTOR_MIN_SHARE and lang.lower() not in known
+    ]
     
     # Return the updated state
     return {
-        "skills": user_skills,
-        "github_summary": github_summary
-    }
\ No newline at end of file
+        "skills": user_skills + derived,
+        "github_summary": github_summary,
+        "github_skill_vector": skill_vector,
+        "degraded": degraded
+    }
@@ -1,10 +1,10 @@
 import json
-from groq import Groq
-from app.core.config import settings
+from app.core.artifacts import get_or_generate
 from app.utils.prompts import GENERATOR_PROMPT
+from app.utils.llm_governor import get_llm_governor
 
-# Initialize the Groq client once
-client = Groq(api_key=settings.GROQ_API_KEY)
+AGENT_BOILERPLATE_KIND = "agent-boilerplate"
+GENERATOR_MODEL = "llama-3.3-70b-versatile"
 
 # Mock boilerplate for when API fails
 def _get_mock_boilerplate(selected_match, user_skills):
@@ -77,10 +77,9 @@ async def generate_boilerplate_node(state):
     # 2. Construct the prompt
     prompt = f"{GENERATOR_PROMPT}\nProblem Statement: {selected_ps}\nUser Stack: {user_skills}"
     
-    try:
-        # 3. Request code generation from Groq
+    async def generate():
         # Llama-3.3-70b is currently the top-tier model on Groq for coding
-        chat_completion = client.chat.completions.create(
+        chat_completion = await get_llm_governor().chat_completion(
             messages=[
                 {
                     "role": "system", 
@@ -91,17 +90,26 @@ async def generate_boilerplate_node(state):
                     "content": prompt
                 }
             ],
-            model="llama-3.3-70b-versatile",
+            model=GENERATOR_MODEL,
             temperature=0.3, # Low temperature for precise code output
             max_tokens=2048,
         )
-
-        code_result = chat_completion.choices[0].message.content
+        return {"content": chat_completion.choices[0].message.content}
+    
+    try:
+        # 3. Request code generation from Groq, unless these inputs were generated before
+        inputs = {
+            "prompt": " ".join(prompt.split()),
+            "model": GENERATOR_MODEL,
+        }
+        artifact_id, code_result, reused = await get_or_generate(AGENT_BOILERPLATE_KIND, inputs, generate)
+        if reused:
+            print(f"♻️ Reusing stored boilerplate {artifact_id[:12]}")
         
-        return {"boilerplate_code": {"content": code_result}}
+        return {"boilerplate_code": {**code_result, "artifact_id": artifact_id}}
 
     except Exception as e:
         print(f"⚠️ Groq Generation Error: {e}")
         print("💡 Using mock boilerplate as fallback")
         # Return mock boilerplate instead of error message
-        return _get_mock_boilerplate(selected_match, user_skills)
\ No newline at end of file
+        return {**_get_mock_boilerplate(selected_match, user_skills), "degraded": True}
\ No newline at end of file
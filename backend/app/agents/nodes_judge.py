@@ -1,11 +1,8 @@
 import os
 import json
-from groq import Groq
-from app.utils.prompts import JUDGE_SYSTEM_PROMPT
 from app.core.config import settings
-
-# Initialize Groq Client using the key from your .env
-client = Groq(api_key=settings.GROQ_API_KEY)
+from app.utils.prompts import BATCH_JUDGE_SYSTEM_PROMPT, JUDGE_SYSTEM_PROMPT
+from app.utils.llm_governor import get_llm_governor
 
 # Mock evaluation for when API fails
 def _get_mock_evaluation(best_match, user_skills):
@@ -22,6 +19,66 @@ def _get_mock_evaluation(best_match, user_skills):
                          f"With focused effort, you have an excellent chance of winning."
     }
 
+def _coerce_probability(value):
+    """Win probability as a float in [0, 100], or None if unusable."""
+    try:
+        return max(0.0, min(100.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+async def _judge_batch(matches, user_skills, github_summary):
+    """
+    Judge all candidates in one structured-output call.
+    Returns the candidates re-ranked by judged win probability.
+    """
+    candidates = [
+        {"id": str(m.get("id", i)), "title": m.get("title", ""), "ps": m.get("ps", "No PS available")}
+        for i, m in enumerate(matches)
+    ]
+    chat_completion = await get_llm_governor().chat_completion(
+        messages=[
+            {
+                "role": "system",
+                "content": f"{BATCH_JUDGE_SYSTEM_PROMPT}\nResponse must be in valid JSON format."
+            },
+            {
+                "role": "user",
+                "content": json.dumps({
+                    "user_skills": user_skills,
+                    "github_summary": github_summary,
+                    "problem_statements": candidates
+                })
+            }
+        ],
+        model="llama-3.3-70b-versatile",
+        response_format={"type": "json_object"},
+        temperature=0.2,
+        max_tokens=300 * len(candidates),
+    )
+    
+    evaluations = json.loads(chat_completion.choices[0].message.content).get("evaluations", [])
+    by_id = {str(e.get("id")): e for e in evaluations if isinstance(e, dict)}
+    
+    judged = []
+    for i, (match, candidate) in enumerate(zip(matches, candidates)):
+        # Fall back to position if the model mangled the id
+        evaluation = by_id.get(candidate["id"]) or (evaluations[i] if i < len(evaluations) and isinstance(evaluations[i], dict) else {})
+        judged.append({
+            **match,
+            "win_probability": _coerce_probability(evaluation.get("win_probability")),
+            "judge_critique": evaluation.get("critique", ""),
+            "recommended_stack": evaluation.get("recommended_stack", []),
+        })
+    
+    if all(j["win_probability"] is None for j in judged):
+        raise ValueError("Batch judge returned no usable scores")
+    
+    # Unjudged candidates sink below judged ones; ties keep retrieval order
+    judged.sort(key=lambda j: -1.0 if j["win_probability"] is None else j["win_probability"], reverse=True)
+    return judged
+
+
 async def judge_simulation_node(state):
     print("---SIMULATING JUDGE RUBRIC (via Groq)---")
     
@@ -39,9 +96,23 @@ async def judge_simulation_node(state):
     user_skills = state.get('skills', [])
     problem_statement = best_match.get('ps', 'No PS available')
     
+    # 2b. Batch mode: judge the whole top-k in one round trip and re-rank
+    if settings.JUDGE_MODE == "batch" and len(matches) > 1:
+        try:
+            judged = await _judge_batch(matches[:settings.JUDGE_TOP_K], user_skills, state.get('github_summary', ''))
+            winner = judged[0]
+            return {
+                "candidate_matches": judged,
+                "selected_hackathon": winner,
+                "win_probability": winner["win_probability"],
+                "judge_critique": winner["judge_critique"]
+            }
+        except Exception as e:
+            print(f"⚠️ Batch judge failed ({e}), judging top match only")
+    
     try:
         # 3. Call Groq API (Llama 3.1 70B is great for reasoning)
-        chat_completion = client.chat.completions.create(
+        chat_completion = await get_llm_governor().chat_completion(
             messages=[
                 {
                     "role": "system",
@@ -76,4 +147,4 @@ async def judge_simulation_node(state):
         print(f"⚠️ Groq API Error: {e}")
         print("💡 Using mock evaluation as fallback")
         # Return mock evaluation instead of error message
-        return _get_mock_evaluation(best_match, user_skills)
\ No newline at end of file
+        return {**_get_mock_evaluation(best_match, user_skills), "degraded": True}
\ No newline at end of file
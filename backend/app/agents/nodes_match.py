@@ -1,4 +1,3 @@
-from app.core.database import get_pinecone_index
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,39 +27,15 @@ MOCK_HACKATHONS = [
 async def match_hackathons_node(state):
     print("---SEARCHING FOR PERFECT HACKATHONS---")
     
-    # Get Pinecone index (lazy initialization)
-    pinecone_index = get_pinecone_index()
-    
-    if not pinecone_index:
-        print("⚠️ Pinecone index not available, using mock hackathons for demo")
-        # Return mock matches as fallback
-        return {"candidate_matches": MOCK_HACKATHONS}
+    # Fuse Pinecone similarity with the in-process skill index (one pass)
+    from app.utils.hybrid_retriever import get_hybrid_retriever
     
     user_dna_text = f"{state['github_summary']} Skills: {', '.join(state['skills'])}"
-    # Lazy-load vector engine on first use
-    from app.utils.vectorizer import get_vector_engine
-    vector_engine = get_vector_engine()
-    query_vector = vector_engine.get_embedding(user_dna_text)
-
-    # Search Pinecone for the top 5 matches
-    results = pinecone_index.query(
-        vector=query_vector,
-        top_k=5,
-        include_metadata=True
-    )
-
-    matches = []
-    for res in results['matches']:
-        matches.append({
-            "id": res['id'],
-            "score": res['score'],
-            "title": res['metadata']['title'],
-            "ps": res['metadata']['problem_statement']
-        })
+    matches = await get_hybrid_retriever().retrieve(user_dna_text, state['skills'], top_k=5)
 
     # If no matches found, use mock data
     if not matches:
-        print("⚠️ No matches found in Pinecone, using mock hackathons for demo")
-        return {"candidate_matches": MOCK_HACKATHONS}
+        print("⚠️ No matches found in vector or skill index, using mock hackathons for demo")
+        return {"candidate_matches": MOCK_HACKATHONS, "degraded": True}
 
-    return {"candidate_matches": matches}
\ No newline at end of file
+    return {"candidate_matches": matches}
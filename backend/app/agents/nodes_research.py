@@ -24,5 +24,5 @@ async def research_hackathons_node(state):
     
     except Exception as e:
         logger.error(f"Error during hackathon research: {e}")
-        return {"candidate_matches": []}
+        return {"candidate_matches": [], "degraded": True}
  
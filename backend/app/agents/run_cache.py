@@ -0,0 +1,200 @@
+"""
+Whole-run agent result cache.
+
+A run's result depends only on the normalized profile inputs (skills, GitHub
+summary/username) and on the hackathon catalog. Results are cached under a
+fingerprint of those inputs plus the current catalog version, so a repeat
+request skips embedding, retrieval and both LLM calls. Bumping the catalog
+version (after a reindex or a new hackathon) makes every older entry
+unreachable; they then age out by TTL.
+
+Degraded runs (a node fell back to mock output after an LLM, GitHub or
+retrieval failure) are returned but never cached.
+
+Entries live in a per-process LRU and, when Redis is initialized, in Redis so
+all workers share them. Identical runs that are still in flight are coalesced
+with ``SingleFlight`` so they execute once.
+"""
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core import cache
+from app.core.config import settings
+from app.core.single_flight import SingleFlight
+from app.core.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "catalog:version"
+CATALOG_VERSION_REFRESH_SECONDS = 5.0
+
+_local_catalog_version = 0
+_catalog_version_cache: Tuple[float, int] = (0.0, 0)
+
+
+def profile_fingerprint(skills, github_summary: Optional[str], github_username: Optional[str]) -> str:
+    """Stable hash of the run inputs: skills are case/order/duplicate-insensitive, whitespace is collapsed."""
+    normalized = {
+        "skills": sorted({s.strip().lower() for s in skills or [] if s and s.strip()}),
+        "github_summary": " ".join((github_summary or "").split()),
+        "github_username": (github_username or "").strip().lower(),
+    }
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_catalog_version() -> int:
+    """Current catalog version (shared via Redis when available, re-read every few seconds)."""
+    global _catalog_version_cache
+    if cache.redis_client is None:
+        return _local_catalog_version
+
+    checked_at, version = _catalog_version_cache
+    if time.monotonic() - checked_at < CATALOG_VERSION_REFRESH_SECONDS:
+        return version
+    try:
+        version = int(await cache.redis_client.get(CATALOG_VERSION_KEY) or 0)
+    except Exception as e:
+        logger.warning(f"Catalog version read failed: {e}")
+        version = _local_catalog_version
+    _catalog_version_cache = (time.monotonic(), version)
+    return version
+
+
+async def bump_catalog_version() -> int:
+    """Invalidate every cached agent run (call whenever the hackathon catalog changes)."""
+    global _local_catalog_version, _catalog_version_cache
+    _local_catalog_version += 1
+    version = _local_catalog_version
+    if cache.redis_client is not None:
+        try:
+            version = int(await cache.redis_client.incr(CATALOG_VERSION_KEY))
+        except Exception as e:
+            logger.warning(f"Catalog version bump failed: {e}")
+    _catalog_version_cache = (time.monotonic(), version)
+    agent_run_cache.clear_local()
+    logger.info(f"Catalog version bumped to {version}; agent run cache invalidated")
+    return version
+
+
+def _shareable(result: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe copy of a final state. Messages hold LangChain objects and are never returned by the API."""
+    stored = {k: v for k, v in result.items() if k != "messages"}
+    stored = json.loads(json.dumps(stored, default=str))
+    stored["messages"] = []
+    return stored
+
+
+class AgentRunCache:
+    """LRU + Redis cache of final agent states."""
+
+    def __init__(self, max_entries: int = settings.AGENT_RESULT_CACHE_SIZE,
+                 ttl_seconds: int = settings.AGENT_RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def key(fingerprint: str, catalog_version: int) -> str:
+        return f"agent_run:{catalog_version}:{fingerprint}"
+
+    def clear_local(self):
+        self._entries.clear()
+
+    async def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        key = self.key(fingerprint, await get_catalog_version())
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(result)
+            del self._entries[key]
+
+        if cache.redis_client is not None:
+            result = await cache.get_cache(key)
+            if result is not None:
+                self._store_local(key, result)
+                return result
+        return None
+
+    async def set(self, fingerprint: str, result: Dict[str, Any]):
+        if not self.enabled:
+            return
+        try:
+            stored = _shareable(result)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Agent result not cacheable: {e}")
+            return
+
+        key = self.key(fingerprint, await get_catalog_version())
+        self._store_local(key, stored)
+        if cache.redis_client is not None:
+            await cache.set_cache(key, stored, ttl=self.ttl_seconds)
+
+    def _store_local(self, key: str, result: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+agent_run_cache = AgentRunCache()
+agent_run_flight = SingleFlight("agent_run", lock_ttl_seconds=settings.AGENT_RUN_LOCK_TTL)
+
+
+async def run_agent_cached(initial_state: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Run the agent graph, or reuse the final state for identical inputs.
+
+    Identical concurrent runs (in this worker or, via Redis, any worker) are
+    coalesced into one execution. Returns ``(result, cache_hit)``, where
+    ``cache_hit`` is True for cached or coalesced results; those carry the
+    caller's ``user_id`` and an empty ``messages`` list.
+    """
+    from app.agents import get_agent
+
+    fingerprint = profile_fingerprint(
+        initial_state.get("skills"),
+        initial_state.get("github_summary"),
+        initial_state.get("github_username"),
+    )
+    cached = await agent_run_cache.get(fingerprint)
+    if cached is not None:
+        cached["user_id"] = initial_state.get("user_id")
+        cached["messages"] = []
+        logger.info(f"Agent run cache hit for user {initial_state.get('user_id')}")
+        return cached, True
+
+    async def execute() -> Dict[str, Any]:
+        # A leader in another worker may have just finished and cached it
+        result = await agent_run_cache.get(fingerprint)
+        if result is None:
+            with start_span("agent.run", **{"agent.user_id": str(initial_state.get("user_id"))}):
+                result = await get_agent().ainvoke(initial_state)
+            if result.get("degraded"):
+                # Mock/fallback output from a transient failure: serve it, but let the next run retry
+                logger.warning(f"Agent run degraded for user {initial_state.get('user_id')}; not caching")
+            else:
+                await agent_run_cache.set(fingerprint, result)
+        return _shareable(result)
+
+    key = agent_run_cache.key(fingerprint, await get_catalog_version())
+    result, shared = await agent_run_flight.do(key, execute)
+    # Leader and in-process followers receive the same object
+    result = copy.deepcopy(result)
+    result["user_id"] = initial_state.get("user_id")
+    if shared:
+        logger.info(f"Agent run coalesced with an in-flight run for user {initial_state.get('user_id')}")
+    return result, shared
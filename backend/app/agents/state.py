@@ -1,5 +1,5 @@
  
-from typing import Annotated, List, TypedDict, Optional
+from typing import Annotated, Dict, List, TypedDict, Optional
 from langchain_core.messages import BaseMessage
 import operator
 
@@ -11,6 +11,8 @@ class AgentState(TypedDict):
     user_id: str
     skills: List[str]
     github_summary: str
+    github_username: Optional[str]
+    github_skill_vector: Dict[str, float] # language -> weight, sums to 1
     
     # Hackathon Data
     candidate_matches: List[dict] # Top 5 from Pinecone
@@ -21,4 +23,7 @@ class AgentState(TypedDict):
     judge_critique: str
     
     # Output
-    boilerplate_code: dict # { "main.py": "code...", "README.md": "..." }
\ No newline at end of file
+    boilerplate_code: dict # { "main.py": "code...", "README.md": "..." }
+
+    # Set by any node that fell back to mock/placeholder output; such runs are never cached
+    degraded: Annotated[bool, operator.or_]
\ No newline at end of file
@@ -96,7 +96,8 @@ def create_refresh_token(user_id: str, expires_delta: Optional[timedelta] = None
         "sub": user_id,
         "exp": expire,
         "iat": datetime.utcnow(),
-        "type": "refresh"
+        "type": "refresh",
+        "jti": uuid.uuid4().hex  # Unique even for logins within the same second
     }
     
     token = jwt.encode(
@@ -293,16 +294,14 @@ async def github_oauth_callback(
 ):
     """Handle GitHub OAuth callback with authorization code."""
     try:
-        # Exchange authorization code for access token
-        token_data = await GitHubOAuthClient.get_access_token(code, settings.GITHUB_REDIRECT_URI)
+        # Exchange authorization code and resolve the user in one pooled round
+        token_data, user_info = await GitHubOAuthClient.exchange_and_fetch_user(code, settings.GITHUB_REDIRECT_URI)
         if not token_data:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to exchange authorization code"
             )
         
-        # Get user info from GitHub
-        user_info = await GitHubOAuthClient.get_user_info(token_data.get("access_token"))
         if not user_info:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -395,16 +394,14 @@ async def google_oauth_callback(
 ):
     """Handle Google OAuth callback with authorization code."""
     try:
-        # Exchange authorization code for access token
-        token_data = await GoogleOAuthClient.get_access_token(code, settings.GOOGLE_REDIRECT_URI)
+        # Exchange authorization code and resolve the user in one pooled round
+        token_data, user_info = await GoogleOAuthClient.exchange_and_fetch_user(code, settings.GOOGLE_REDIRECT_URI)
         if not token_data:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to exchange authorization code"
             )
         
-        # Get user info from Google
-        user_info = await GoogleOAuthClient.get_user_info(token_data.get("access_token"))
         if not user_info:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
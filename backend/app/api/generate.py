@@ -1,164 +1,85 @@
 """Code generation API endpoint with agent integration."""
+import asyncio
 import logging
 import json
-from fastapi import APIRouter, HTTPException, status
+import os
+import re
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from app.models.schemas import CodeGenerationRequest, CodeGenerationResponse
-from app.core.config import settings
-from groq import Groq
+from app.core.artifacts import artifact_store, attach_artifact, find_project_artifact, get_blob_store, get_json, get_or_generate
+from app.utils.boilerplate_zip import BOILERPLATE_LAYOUT, ZIP_FORMAT_VERSION, parse_range, stream_boilerplate_zip
+from app.utils.code_templates import inline_text, project_name, template_registry
+from app.utils.file_response import ZeroCopyFileResponse
+from app.utils.llm_governor import PRIORITY_INTERACTIVE, get_llm_governor
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/generate", tags=["generation"])
 
-# Initialize Groq client for code generation
-groq_client = Groq(api_key=settings.GROQ_API_KEY)
+BOILERPLATE_ARTIFACT_KIND = "boilerplate"
+ZIP_ARTIFACT_KIND = "boilerplate-zip"
+ARTIFACT_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+BOILERPLATE_MODEL = "llama-3.3-70b-versatile"
+BOILERPLATE_PROMPT_VERSION = "1"  # Bump when the prompt below changes, so old generations aren't reused
 
-# Lazy-loaded agent to prevent heavy startup
-_agent_cache = None
 
-
-def get_agent():
-    """Lazy-load agent only when needed."""
-    global _agent_cache
-    if _agent_cache is None:
-        try:
-            from app.agents import app_agent
-            _agent_cache = app_agent
-            logger.info("Agent loaded on-demand")
-        except Exception as e:
-            logger.error(f"Failed to load agent: {e}")
-            raise
-    return _agent_cache
+def generate_project_offline(prompt: str, language: str = "python", framework: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    """Render a project scaffold without an LLM; returns ``(entrypoint code, {path: content})``."""
+    rendered = template_registry.render(language, framework, prompt=prompt, project_name=project_name(prompt))
+    if rendered is None:
+        code = f"""# Generated code
+# Language: {language}
+# Framework: {framework}
+# Prompt: {inline_text(prompt)}
+# Code generation not yet implemented for this combination"""
+        return code, {}
+    scaffold, files = rendered
+    return files[scaffold.entrypoint], files
 
 
 def generate_code_with_llm(prompt: str, language: str = "python", framework: Optional[str] = None) -> str:
-    """Generate code using LLM (placeholder for actual implementation)."""
-    code_templates = {
-        "python": {
-            None: f"""# Generated Python code
-# Prompt: {prompt}
-
-def main():
-    # Your implementation here
-    pass
-
-if __name__ == "__main__":
-    main()""",
-            "flask": f"""# Generated Flask app
-from flask import Flask, request, jsonify
-
-app = Flask(__name__)
-
-@app.route('/api/endpoint', methods=['POST'])
-def endpoint():
-    # Implementation: {prompt}
-    data = request.json
-    return jsonify({{"status": "success"}})
-
-if __name__ == '__main__':
-    app.run(debug=True)""",
-            "django": f"""# Generated Django view
-from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
-
-@require_http_methods(["POST"])
-def api_endpoint(request):
-    # Implementation: {prompt}
-    return JsonResponse({{"status": "success"}})""",
-            "fastapi": f"""# Generated FastAPI application
-from fastapi import FastAPI
-from pydantic import BaseModel
-
-app = FastAPI()
-
-class RequestData(BaseModel):
-    # Define your request schema here
-    data: str
-
-@app.post("/api/endpoint")
-async def endpoint(request: RequestData):
-    # Implementation: {prompt}
-    return {{"status": "success", "data": request.data}}
-
-@app.get("/health")
-async def health():
-    return {{"status": "healthy"}}
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)"""
-        },
-        "javascript": {
-            None: f"""// Generated JavaScript code
-// Prompt: {prompt}
-
-function main() {{
-  // Your implementation here
-}}
-
-main();""",
-            "react": f"""// Generated React component
-import React, {{ useState }} from 'react';
-
-function Component() {{
-  const [state, setState] = useState(null);
-  // Implementation: {prompt}
-  return <div>Component</div>;
-}}
-
-export default Component;""",
-            "express": f"""// Generated Express server
-const express = require('express');
-const app = express();
-
-app.use(express.json());
-
-app.post('/api/endpoint', (req, res) => {{
-  // Implementation: {prompt}
-  res.json({{ status: 'success' }});
-}});
-
-app.listen(3000);""",
-        },
-        "typescript": {
-            None: f"""// Generated TypeScript code
-// Prompt: {prompt}
-
-interface Data {{
-  // Define your types here
-}}
-
-function main(): void {{
-  // Your implementation here
-}}
-
-main();""",
-        },
+    """Generate code from the precompiled template registry (entrypoint file only)."""
+    code, _ = generate_project_offline(prompt, language, framework)
+    return code
+
+
+def _fallback_boilerplate(problem_statement: str = "", skills: Optional[list] = None) -> Dict[str, str]:
+    """Full-stack scaffold from the template registry, used when the LLM is unavailable."""
+    rendered = template_registry.render(
+        "fullstack", "fastapi-react",
+        prompt=problem_statement,
+        project_name=project_name(problem_statement),
+        skills=", ".join(skills or []) or "Python, React",
+    )
+    if rendered is None:
+        return {
+            "backend": "# Error generating code",
+            "frontend": "// Error generating code",
+            "docker_compose": "# Error generating code",
+            "requirements": "# Error generating code",
+            "package_json": "{}"
+        }
+    _, files = rendered
+    keys_by_path = {path: key for key, path in BOILERPLATE_LAYOUT.items()}
+    return {keys_by_path[path]: content for path, content in files.items() if path in keys_by_path}
+
+
+def boilerplate_inputs(problem_statement: str, skills: list) -> Dict[str, Any]:
+    """Normalized generation inputs; equal inputs reuse the stored boilerplate."""
+    return {
+        "problem_statement": " ".join(problem_statement.split()),
+        "skills": sorted({s.strip().lower() for s in skills if s and s.strip()}),
+        "model": BOILERPLATE_MODEL,
+        "prompt_version": BOILERPLATE_PROMPT_VERSION,
     }
-    
-    language = language.lower()
-    framework = framework.lower() if framework else None
-    
-    if language in code_templates:
-        templates = code_templates[language]
-        if framework in templates:
-            return templates[framework]
-        else:
-            return templates[None]
-    
-    return f"""# Generated code
-# Language: {language}
-# Framework: {framework}
-# Prompt: {prompt}
-# Code generation not yet implemented for this combination"""
 
 
-async def generate_boilerplate_with_groq(problem_statement: str, skills: list) -> Dict[str, str]:
-    """Generate boilerplate code using Groq API."""
-    try:
-        prompt = f"""Generate a complete FastAPI + React boilerplate starter code for this hackathon problem.
+async def _request_boilerplate(problem_statement: str, skills: list) -> Dict[str, str]:
+    """Ask Groq for boilerplate; raises on API or parse errors."""
+    prompt = f"""Generate a complete FastAPI + React boilerplate starter code for this hackathon problem.
         
 Problem Statement: {problem_statement}
 
@@ -172,38 +93,27 @@ Provide the following files:
 5. Package.json
 
 Format the output as JSON with keys: backend, frontend, docker_compose, requirements, package_json"""
-        
-        response = groq_client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert full-stack developer. Generate clean, production-ready boilerplate code."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.3,
-            max_tokens=4096,
-            response_format={"type": "json_object"}
-        )
-        
-        content = response.choices[0].message.content
-        boilerplate = json.loads(content)
-        
-        return boilerplate
     
-    except Exception as e:
-        logger.error(f"Error generating boilerplate with Groq: {e}")
-        return {
-            "backend": "# Error generating code",
-            "frontend": "// Error generating code",
-            "docker_compose": "# Error generating code",
-            "requirements": "# Error generating code",
-            "package_json": "{}"
-        }
+    response = await get_llm_governor().chat_completion(
+        priority=PRIORITY_INTERACTIVE,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are an expert full-stack developer. Generate clean, production-ready boilerplate code."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        model=BOILERPLATE_MODEL,
+        temperature=0.3,
+        max_tokens=4096,
+        response_format={"type": "json_object"}
+    )
+    
+    content = response.choices[0].message.content
+    return json.loads(content)
 
 
 @router.post("/code", response_model=CodeGenerationResponse)
@@ -217,7 +127,7 @@ async def generate_code(request: CodeGenerationRequest):
     
     try:
         # Generate code
-        code = generate_code_with_llm(
+        code, files = generate_project_offline(
             request.prompt,
             request.language,
             request.framework
@@ -236,6 +146,7 @@ This is a template implementation. For production use, integrate with:
             code=code,
             language=request.language,
             explanation=explanation,
+            files=files,
             timestamp=datetime.utcnow()
         )
     
@@ -247,15 +158,21 @@ This is a template implementation. For production use, integrate with:
         )
 
 
+@router.get("/templates")
+async def list_templates():
+    """Languages and frameworks with an offline project scaffold."""
+    return {"success": True, "templates": template_registry.available()}
+
+
 @router.post("/boilerplate")
 async def generate_boilerplate(
     request: CodeGenerationRequest
 ):
-    """Generate complete boilerplate for a hackathon."""
+    """Generate complete boilerplate for a hackathon (reused from the artifact store for repeat inputs)."""
     try:
-        user_id = request.user_id if hasattr(request, 'user_id') else "anonymous"
+        user_id = request.user_id or "anonymous"
         problem_statement = request.problem_statement
-        skills = request.skills if hasattr(request, 'skills') else []
+        skills = request.skills or []
         
         if not problem_statement:
             raise HTTPException(
@@ -265,15 +182,40 @@ async def generate_boilerplate(
         
         logger.info(f"Generating boilerplate for user {user_id}")
         
-        boilerplate = await generate_boilerplate_with_groq(problem_statement, skills or [])
+        try:
+            artifact_id, boilerplate, cached = await get_or_generate(
+                BOILERPLATE_ARTIFACT_KIND,
+                boilerplate_inputs(problem_statement, skills),
+                lambda: _request_boilerplate(problem_statement, skills),
+            )
+        except Exception as e:
+            # Failed generations are returned but never stored, so a retry calls the LLM again
+            logger.error(f"Error generating boilerplate with Groq: {e}")
+            return {
+                "success": True,
+                "user_id": user_id,
+                "boilerplate": _fallback_boilerplate(problem_statement, skills),
+                "artifact_id": None,
+                "download_url": None,
+                "cached": False,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        
+        if request.user_id and request.hackathon_id:
+            await attach_artifact(request.user_id, request.hackathon_id, artifact_id)
         
         return {
             "success": True,
             "user_id": user_id,
             "boilerplate": boilerplate,
+            "artifact_id": artifact_id,
+            "download_url": f"/api/generate/download/{artifact_id}",
+            "cached": cached,
             "timestamp": datetime.utcnow().isoformat()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Boilerplate generation error: {e}")
         raise HTTPException(
@@ -282,23 +224,134 @@ async def generate_boilerplate(
         )
 
 
-@router.post("/download/{submission_id}")
-async def download_boilerplate(submission_id: str):
-    """Download generated boilerplate as ZIP."""
+@router.get("/artifacts/{artifact_id}")
+async def get_boilerplate_artifact(artifact_id: str):
+    """Re-open stored boilerplate by its content hash."""
+    boilerplate = None
+    if ARTIFACT_ID_PATTERN.fullmatch(artifact_id):
+        boilerplate = await get_json(BOILERPLATE_ARTIFACT_KIND, artifact_id)
+    if boilerplate is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    
+    return {
+        "success": True,
+        "boilerplate": boilerplate,
+        "artifact_id": artifact_id,
+        "download_url": f"/api/generate/download/{artifact_id}"
+    }
+
+
+@router.get("/projects/{user_id}/{hackathon_id}")
+async def get_project_boilerplate(user_id: str, hackathon_id: str):
+    """Re-open the boilerplate last generated for a user's hackathon project."""
+    artifact_id = await find_project_artifact(user_id, hackathon_id)
+    if artifact_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No generated project found")
+    response = await get_boilerplate_artifact(artifact_id)
+    return {**response, "user_id": user_id, "hackathon_id": hackathon_id}
+
+
+def _zip_response_headers(etag: str, artifact_id: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Content-Disposition": f'attachment; filename="boilerplate-{artifact_id[:12]}.zip"',
+    }
+
+
+def _tee_zip_into_store(boilerplate: Dict[str, Any], zip_key: str):
+    """Stream the ZIP to the client while saving it to the artifact store."""
+    writer = artifact_store.writer(ZIP_ARTIFACT_KIND, zip_key)
     try:
-        # Placeholder for ZIP generation
-        return {
-            "success": True,
-            "download_url": f"/api/generate/files/{submission_id}.zip",
-            "message": "Download link generated"
-        }
+        for chunk in stream_boilerplate_zip(boilerplate):
+            writer.write(chunk)
+            yield chunk
+        writer.commit()
+    except BaseException:
+        # Client went away (GeneratorExit) or the build failed: drop the partial file
+        writer.abort()
+        raise
+
+
+def _build_zip_into_store(boilerplate: Dict[str, Any], zip_key: str):
+    writer = artifact_store.writer(ZIP_ARTIFACT_KIND, zip_key)
+    try:
+        for chunk in stream_boilerplate_zip(boilerplate):
+            writer.write(chunk)
+        writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+@router.get("/download/{artifact_id}")
+async def download_boilerplate_zip(artifact_id: str, request: Request):
+    """Download generated boilerplate as a streamed ZIP (ETag and single Range supported)."""
+    if not ARTIFACT_ID_PATTERN.fullmatch(artifact_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
     
-    except Exception as e:
-        logger.error(f"Download error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Download failed: {str(e)}"
+    # ZIPs are deterministic, so the source hash + layout version is a strong validator
+    zip_key = f"{artifact_id}-v{ZIP_FORMAT_VERSION}"
+    etag = f'"{zip_key}"'
+    headers = _zip_response_headers(etag, artifact_id)
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    zip_path = artifact_store.path(ZIP_ARTIFACT_KIND, zip_key)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        range_header = None  # Validator changed: send the full body
+    
+    if not os.path.exists(zip_path):
+        boilerplate = await get_json(BOILERPLATE_ARTIFACT_KIND, artifact_id)
+        if boilerplate is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+        if not range_header:
+            # First download: stream straight to the client and fill the store as we go
+            return StreamingResponse(
+                _tee_zip_into_store(boilerplate, zip_key),
+                media_type="application/zip",
+                headers=headers
+            )
+        # A range needs the final length, so materialize into the store first
+        await asyncio.to_thread(_build_zip_into_store, boilerplate, zip_key)
+    
+    size = os.path.getsize(zip_path)
+    byte_range = parse_range(range_header, size) if range_header else None
+    if range_header and byte_range is None:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{size}"}
         )
+    
+    start, end = byte_range or (0, size - 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return ZeroCopyFileResponse(
+        zip_path,
+        start,
+        end,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type="application/zip",
+        headers=headers
+    )
+
+
+@router.post("/download/{artifact_id}")
+async def download_boilerplate(artifact_id: str):
+    """Get the download link for a generated boilerplate."""
+    if not ARTIFACT_ID_PATTERN.fullmatch(artifact_id) or not await get_blob_store().exists(BOILERPLATE_ARTIFACT_KIND, artifact_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    
+    return {
+        "success": True,
+        "download_url": f"/api/generate/download/{artifact_id}",
+        "message": "Download link generated"
+    }
 
 
 @router.post("/code/explain")
@@ -311,7 +364,8 @@ async def explain_code(code: str):
         )
     
     try:
-        response = groq_client.chat.completions.create(
+        response = await get_llm_governor().chat_completion(
+            priority=PRIORITY_INTERACTIVE,
             messages=[
                 {
                     "role": "system",
@@ -353,7 +407,8 @@ async def optimize_code(code: str):
         )
     
     try:
-        response = groq_client.chat.completions.create(
+        response = await get_llm_governor().chat_completion(
+            priority=PRIORITY_INTERACTIVE,
             messages=[
                 {
                     "role": "system",
@@ -0,0 +1,24 @@
+"""Background job status endpoints."""
+import logging
+from fastapi import APIRouter, HTTPException, status
+
+from app.core.jobs import job_queue
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str):
+    """Get the status (and result, once finished) of a background job."""
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return {
+        "success": True,
+        "data": job
+    }
@@ -6,7 +6,10 @@ from app.models.schemas import (
     MatchRequest, FindMatchesResponse, HackathonMatch, HackathonListResponse
 )
 from app.core.database import Collections
-from app.core.cache import get_cache, set_cache, publish_message
+from app.core.cache import get_cache, set_cache, delete_cache, publish_message
+from app.agents.run_cache import bump_catalog_version
+from app.core.jobs import job_queue
+from app.utils.hybrid_retriever import get_hybrid_retriever, skill_overlap
 from datetime import datetime
 from bson.objectid import ObjectId
 
@@ -15,6 +18,112 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/matches", tags=["matches"])
 
 
+async def compute_user_matches(user: dict, limit: int = 10) -> List[HackathonMatch]:
+    """Score active hackathons against a user and cache the result."""
+    user_id = str(user["_id"])
+    user_skills = user.get("skills", [])
+    
+    # Get active hackathons
+    hackathons = await Collections.hackathons().find({
+        "end_date": {"$gte": datetime.utcnow()}
+    }).limit(limit).to_list(limit)
+    
+    matches = []
+    for hackathon in hackathons:
+        # Calculate skill match percentage
+        required = hackathon.get("required_skills", [])
+        matched, ratio = skill_overlap(user_skills, required)
+        skills_match = 0.5 if ratio is None else ratio
+        
+        # Calculate win probability (simplified)
+        win_probability = min(skills_match * 1.2, 1.0)  # Bonus for perfect match
+        if user.get("hackathons_participated", 0) > 0:
+            win_probability *= user.get("win_rate", 0.3) + 0.3
+        
+        match = HackathonMatch(
+            id=str(hackathon["_id"]),
+            title=hackathon["title"],
+            description=hackathon["description"],
+            platform=hackathon["platform"],
+            difficulty=hackathon["difficulty"],
+            skills_match=skills_match,
+            win_probability=min(win_probability, 1.0),
+            prize_pool=hackathon.get("prize_pool", 0),
+            matched_skills=matched,
+            missing_skills=[s for s in required if s not in matched],
+            start_date=hackathon["start_date"],
+            end_date=hackathon["end_date"],
+            registration_link=hackathon.get("registration_link", ""),
+            theme=hackathon.get("theme", "")
+        )
+        matches.append(match)
+    
+    # Sort by win probability
+    matches.sort(key=lambda x: x.win_probability, reverse=True)
+    
+    if matches:
+        # Cache results
+        await set_cache(f"matches:{user_id}", [m.dict() for m in matches])
+        
+        # Publish event
+        await publish_message("matches:found", {
+            "user_id": user_id,
+            "count": len(matches),
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    
+    return matches
+
+
+async def recompute_user_matches(user_id: str, limit: int = 10) -> List[HackathonMatch]:
+    """Drop a user's cached matches and compute fresh ones."""
+    user = await Collections.users().find_one({"_id": ObjectId(user_id)})
+    if not user:
+        raise ValueError(f"User {user_id} not found")
+    
+    await delete_cache(f"matches:{user_id}")
+    return await compute_user_matches(user, limit)
+
+
+@job_queue.handler("match_recompute")
+async def run_match_recompute(payload: dict, secrets: dict) -> dict:
+    """Background job: recompute a user's cached matches."""
+    matches = await recompute_user_matches(payload["user_id"], payload.get("limit", 10))
+    return {"matches": len(matches)}
+
+
+@job_queue.handler("hackathon_reindex")
+async def run_hackathon_reindex(payload: dict, secrets: dict) -> dict:
+    """Background job: embed new/changed hackathons into the embeddings store and vector index."""
+    from app.utils.hackathon_indexer import HackathonIndexer
+    
+    stats = await HackathonIndexer().reindex(force=payload.get("force", False))
+    get_hybrid_retriever().skill_index.invalidate()
+    if stats.embedded:
+        await bump_catalog_version()
+    return stats.to_dict()
+
+
+@router.post("/reindex", status_code=202)
+async def reindex_hackathons(force: bool = False):
+    """Queue a hackathon embedding reindex; poll /api/jobs/{job_id} for the result."""
+    try:
+        job = await job_queue.enqueue(
+            "hackathon_reindex",
+            {"force": force},
+            dedup_key="hackathon_reindex",
+            max_attempts=1
+        )
+        return {
+            "success": True,
+            "message": "Hackathon reindex queued",
+            "data": job
+        }
+    except Exception as e:
+        logger.error(f"Reindex queue error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to queue hackathon reindex")
+
+
 @router.post("/find", response_model=FindMatchesResponse)
 async def find_matches(req: MatchRequest):
     """Find hackathon matches for user"""
@@ -24,9 +133,6 @@ async def find_matches(req: MatchRequest):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Get user's skills
-        user_skills = set(user.get("skills", []))
-        
         # Check cache first
         cache_key = f"matches:{req.user_id}"
         cached = await get_cache(cache_key)
@@ -39,12 +145,9 @@ async def find_matches(req: MatchRequest):
                 message="Matches retrieved from cache"
             )
         
-        # Get active hackathons
-        hackathons = await Collections.hackathons().find({
-            "end_date": {"$gte": datetime.utcnow()}
-        }).limit(req.limit).to_list(req.limit)
+        matches = await compute_user_matches(user, req.limit)
         
-        if not hackathons:
+        if not matches:
             return FindMatchesResponse(
                 success=True,
                 data=[],
@@ -52,49 +155,6 @@ async def find_matches(req: MatchRequest):
                 message="No active hackathons found"
             )
         
-        matches = []
-        for hackathon in hackathons:
-            # Calculate skill match percentage
-            required = set(hackathon.get("required_skills", []))
-            matched = user_skills.intersection(required)
-            skills_match = len(matched) / len(required) if required else 0.5
-            
-            # Calculate win probability (simplified)
-            win_probability = min(skills_match * 1.2, 1.0)  # Bonus for perfect match
-            if user.get("hackathons_participated", 0) > 0:
-                win_probability *= user.get("win_rate", 0.3) + 0.3
-            
-            match = HackathonMatch(
-                id=str(hackathon["_id"]),
-                title=hackathon["title"],
-                description=hackathon["description"],
-                platform=hackathon["platform"],
-                difficulty=hackathon["difficulty"],
-                skills_match=skills_match,
-                win_probability=min(win_probability, 1.0),
-                prize_pool=hackathon.get("prize_pool", 0),
-                matched_skills=list(matched),
-                missing_skills=list(required - matched),
-                start_date=hackathon["start_date"],
-                end_date=hackathon["end_date"],
-                registration_link=hackathon.get("registration_link", ""),
-                theme=hackathon.get("theme", "")
-            )
-            matches.append(match)
-        
-        # Sort by win probability
-        matches.sort(key=lambda x: x.win_probability, reverse=True)
-        
-        # Cache results
-        await set_cache(cache_key, [m.dict() for m in matches])
-        
-        # Publish event
-        await publish_message("matches:found", {
-            "user_id": req.user_id,
-            "count": len(matches),
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
         return FindMatchesResponse(
             success=True,
             data=matches,
@@ -1,16 +1,22 @@
 """Hackathon matching and recommendation endpoints."""
-from fastapi import APIRouter, HTTPException, Depends, status, Header
+from fastapi import APIRouter, HTTPException, Depends, status, Header, Request
+from pydantic import ValidationError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import json
+import logging
 import uuid
 import jwt
 
-from app.core.db import get_db
+from app.core.db import engine, get_db, serialized
 from app.core.config import settings
 from app.models.hackathon_models import Hackathon, HackathonMatch, UserSkills
 from app.models.database import User
+from app.agents.run_cache import bump_catalog_version
+from app.utils.hybrid_retriever import difficulty_fit, get_hybrid_retriever, skill_overlap
 from app.models.schemas import (
     HackathonResponse,
     HackathonMatchResponse,
@@ -24,6 +30,7 @@ from app.models.schemas import (
 )
 
 router = APIRouter(prefix="/api", tags=["matching"])
+logger = logging.getLogger(__name__)
 
 
 def get_token(token: Optional[str] = None) -> str:
@@ -50,31 +57,11 @@ def verify_token_simple(token: str) -> dict:
 
 def calculate_skill_match(user_skills: List[str], required_skills: List[str]) -> float:
     """Calculate skill match percentage (0-100)."""
-    if not required_skills:
-        return 100.0
-    
-    matching_skills = set(user_skills) & set(required_skills)
-    return (len(matching_skills) / len(required_skills)) * 100.0
+    _, ratio = skill_overlap(user_skills, required_skills)
+    return 100.0 if ratio is None else ratio * 100.0
 
 
-def calculate_difficulty_match(user_avg_exp: float, difficulty: str) -> float:
-    """Calculate difficulty match based on experience (0-100)."""
-    difficulty_levels = {
-        "beginner": 0,
-        "intermediate": 3,
-        "advanced": 5,
-        "expert": 8
-    }
-    
-    required_exp = difficulty_levels.get(difficulty.lower(), 3)
-    
-    if user_avg_exp == 0:
-        return 50.0 if difficulty == "beginner" else 30.0
-    
-    if user_avg_exp >= required_exp:
-        return 100.0
-    
-    return 50.0 + (user_avg_exp / required_exp) * 50.0
+calculate_difficulty_match = difficulty_fit
 
 
 @router.get("/matching/recommendations")
@@ -251,6 +238,10 @@ async def create_hackathon(
     db.commit()
     db.refresh(new_hackathon)
     
+    # New catalog entry: stale skill index and cached agent runs must not hide it
+    get_hybrid_retriever().skill_index.invalidate()
+    await bump_catalog_version()
+    
     return {
         "id": new_hackathon.id,
         "title": new_hackathon.title,
@@ -263,6 +254,217 @@ async def create_hackathon(
     }
 
 
+# Columns a bulk upsert overwrites on an existing platform_id (id and created_at are kept)
+_BULK_UPDATE_COLUMNS = (
+    "title", "description", "platform", "url", "difficulty",
+    "required_skills", "prize_pool", "location", "is_active", "updated_at",
+)
+
+
+def _parse_ingest_line(raw: bytes) -> dict:
+    """Decode one NDJSON line; raises ValueError with a short reason."""
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"invalid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    return data
+
+
+def _validate_ingest_row(data: dict) -> HackathonCreateRequest:
+    """Validate one decoded row; raises ValueError listing the bad fields."""
+    try:
+        row = HackathonCreateRequest.model_validate(data)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+        ))
+    if not row.platform_id or not row.platform_id.strip():
+        raise ValueError("platform_id: required for bulk ingestion")
+    if len(row.platform_id) > 255:
+        raise ValueError("platform_id: longer than 255 characters")
+    return row
+
+
+@serialized
+def _upsert_hackathon_batch(rows: List[HackathonCreateRequest]) -> Tuple[int, int]:
+    """Upsert rows keyed by platform_id in one transaction; returns (created, updated)."""
+    now = datetime.utcnow()
+    values = [{
+        "id": str(uuid.uuid4()),
+        "platform_id": row.platform_id,
+        "title": row.title,
+        "description": row.description,
+        "platform": row.platform,
+        "url": row.registration_link,
+        "difficulty": row.difficulty,
+        "required_skills": json.dumps(row.required_skills),
+        "prize_pool": str(row.prize_pool),
+        "location": row.location,
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+    } for row in rows]
+    table = Hackathon.__table__
+    platform_ids = {v["platform_id"] for v in values}
+    statement = sqlite_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.platform_id],
+        set_={column: statement.excluded[column] for column in _BULK_UPDATE_COLUMNS},
+    )
+    with engine.begin() as conn:
+        existing = set(conn.execute(
+            table.select().with_only_columns(table.c.platform_id).where(table.c.platform_id.in_(platform_ids))
+        ).scalars())
+        conn.execute(statement, values)
+    return len(platform_ids - existing), len(existing)
+
+
+async def _mirror_hackathon_batch(rows: List[HackathonCreateRequest]) -> bool:
+    """Upsert the batch into MongoDB (the reindex source); False when MongoDB isn't available."""
+    from pymongo import UpdateOne
+    from app.core.database import Collections
+
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"platform_id": row.platform_id},
+            {
+                "$set": {**row.model_dump(exclude_none=True), "is_active": True, "updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+        for row in rows
+    ]
+    try:
+        await Collections.hackathons().bulk_write(operations, ordered=False)
+        return True
+    except RuntimeError:
+        return False  # MongoDB not initialized (SQLite-only deployment)
+    except Exception as e:
+        logger.warning(f"Bulk ingest: MongoDB mirror failed for {len(rows)} rows: {e}")
+        return False
+
+
+@router.post("/hackathons/bulk")
+async def bulk_ingest_hackathons(request: Request):
+    """
+    Stream NDJSON hackathons (one HackathonCreateRequest object per line, platform_id
+    required) and upsert them keyed by platform_id.
+
+    Rows are validated as they arrive and written in BULK_INGEST_BATCH_SIZE
+    transactions. Invalid rows, and lines longer than BULK_INGEST_MAX_LINE_BYTES
+    (discarded without being buffered), are skipped and reported by line number.
+    After the last batch the skill index and agent run cache are invalidated once and a single
+    embedding reindex job is queued.
+    """
+    batch_size = max(1, settings.BULK_INGEST_BATCH_SIZE)
+    max_line_bytes = settings.BULK_INGEST_MAX_LINE_BYTES
+    batch: Dict[str, HackathonCreateRequest] = {}  # platform_id -> row; a later line wins
+    batch_lines: Dict[str, int] = {}
+    errors: List[dict] = []
+    counts = {"received": 0, "created": 0, "updated": 0, "failed": 0}
+
+    def reject(line_number: int, platform_id: Optional[str], reason: str):
+        counts["failed"] += 1
+        if len(errors) < settings.BULK_INGEST_MAX_ERRORS:
+            errors.append({"line": line_number, "platform_id": platform_id, "error": reason})
+
+    async def flush():
+        nonlocal batch, batch_lines
+        if not batch:
+            return
+        rows, lines = list(batch.values()), batch_lines
+        batch, batch_lines = {}, {}
+        try:
+            created, updated = await asyncio.to_thread(_upsert_hackathon_batch, rows)
+        except Exception as e:
+            logger.error(f"Bulk ingest: batch of {len(rows)} rows failed: {e}")
+            for platform_id, line_number in lines.items():
+                reject(line_number, platform_id, f"database error: {e.__class__.__name__}")
+            return
+        counts["created"] += created
+        counts["updated"] += updated
+        await _mirror_hackathon_batch(rows)
+
+    def handle(raw: bytes, line_number: int):
+        if not raw.strip():
+            return
+        counts["received"] += 1
+        platform_id = None
+        try:
+            data = _parse_ingest_line(raw)
+            if isinstance(data.get("platform_id"), str):
+                platform_id = data["platform_id"]
+            row = _validate_ingest_row(data)
+        except ValueError as e:
+            reject(line_number, platform_id, str(e))
+            return
+        batch[row.platform_id] = row
+        batch_lines[row.platform_id] = line_number
+
+    pending = bytearray()  # Start of the current line (only new chunks are scanned for newlines)
+    oversized = False  # Current line is over the limit; its remaining bytes are dropped
+    line_number = 0
+
+    def end_line():
+        nonlocal oversized, line_number
+        line_number += 1
+        if oversized:
+            counts["received"] += 1
+            reject(line_number, None, f"line exceeds {max_line_bytes} bytes")
+        else:
+            handle(bytes(pending), line_number)
+        pending.clear()
+        oversized = False
+
+    async for chunk in request.stream():
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            piece = chunk[start:] if end < 0 else chunk[start:end]
+            if not oversized:
+                if len(pending) + len(piece) > max_line_bytes:
+                    oversized = True
+                    pending.clear()
+                else:
+                    pending += piece
+            if end < 0:
+                break
+            end_line()
+            start = end + 1
+        if len(batch) >= batch_size:
+            await flush()
+    if pending or oversized:
+        end_line()
+    await flush()
+
+    reindex_job, reindex_error = None, None
+    if counts["created"] or counts["updated"]:
+        # One invalidation and one reindex for the whole upload instead of one per row
+        get_hybrid_retriever().skill_index.invalidate()
+        await bump_catalog_version()
+        from app.core.jobs import job_queue
+        try:
+            reindex_job = await job_queue.enqueue(
+                "hackathon_reindex", {"force": False}, dedup_key="hackathon_reindex", max_attempts=1,
+            )
+        except Exception as e:
+            logger.warning(f"Bulk ingest: could not queue reindex: {e}")
+            reindex_error = f"reindex not queued ({e}); run POST /api/matches/reindex"
+
+    return {
+        "success": counts["failed"] == 0,
+        **counts,
+        "errors": errors,
+        "errors_truncated": counts["failed"] > len(errors),
+        "reindex_job": reindex_job,
+        "reindex_error": reindex_error,
+    }
+
+
 @router.post("/hackathons/search")
 async def search_hackathons(
     search: SearchRequest,
@@ -1,11 +1,15 @@
 """User profile API endpoints"""
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException
 from app.models.schemas import UpdateProfileRequest, UserProfileResponse, UserProfile
 from app.core.database import Collections
+from app.core.jobs import job_queue
+from app.api.matches import recompute_user_matches
+from app.utils.github_client import GitHubClient
+from app.utils.github_harvester import GitHubProfileHarvester, SyncCursor
 from bson.objectid import ObjectId
 from datetime import datetime
-import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -116,73 +120,132 @@ async def update_profile(user_id: str, req: UpdateProfileRequest):
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
 
-@router.post("/{user_id}/sync-github")
+@job_queue.handler("github_sync")
+async def run_github_sync(payload: dict, secrets: dict) -> dict:
+    """Background job: incrementally sync a user's GitHub profile."""
+    user_id = payload["user_id"]
+    user = await Collections.users().find_one({"_id": ObjectId(user_id)})
+    if not user:
+        raise ValueError(f"User {user_id} not found")
+    
+    github_username = user.get("github_username")
+    if not github_username:
+        raise ValueError("GitHub username not set")
+    
+    # User-initiated: never fall back to the server's GITHUB_TOKEN (identity, private repos, rate budget)
+    github_token = secrets.get("github_token")
+    if not github_token:
+        raise PermissionError("GitHub token unavailable for this sync")
+    
+    # Resume from the stored cursor so only changed repos are re-fetched
+    github = GitHubClient(token=github_token)
+    gh_user = await github.get_user(github_username)
+    if gh_user is None:
+        raise RuntimeError("Failed to fetch GitHub data")
+    
+    cursor_doc = await Collections.github_sync().find_one({"user_id": user_id})
+    cursor = SyncCursor.from_dict(cursor_doc.get("cursor") if cursor_doc else None)
+    sync = await GitHubProfileHarvester(github).harvest_incremental(
+        github_username, cursor, public_repos=gh_user.get("public_repos")
+    )
+    harvested = sync.profile
+    total_stars = harvested.total_stars
+    
+    await Collections.github_sync().update_one(
+        {"user_id": user_id},
+        {"$set": {"cursor": sync.cursor.to_dict(), "synced_at": datetime.utcnow()}},
+        upsert=True
+    )
+    
+    # Update user
+    update_data = {
+        "github_profile_url": gh_user.get("html_url"),
+        "github_stars": total_stars,
+        "github_repos": gh_user.get("public_repos", 0),
+        "github_followers": gh_user.get("followers", 0),
+        "avatar_url": gh_user.get("avatar_url"),
+        "bio": gh_user.get("bio") or user.get("bio"),
+        "github_skill_vector": harvested.skill_vector,
+        "github_summary": harvested.summary,
+        "updated_at": datetime.utcnow()
+    }
+    
+    await Collections.users().update_one(
+        {"_id": ObjectId(user_id)},
+        {"$set": update_data}
+    )
+    
+    # Only re-embed (and then recompute matches) if the profile actually moved
+    if sync.skill_vector_moved:
+        await job_queue.enqueue(
+            "user_embedding", {"user_id": user_id}, dedup_key=f"user_embedding:{user_id}"
+        )
+    
+    logger.info(
+        f"GitHub profile synced: {github_username} "
+        f"({len(sync.changed_repos)} repos changed, skill vector moved: {sync.skill_vector_moved})"
+    )
+    
+    return {
+        "stars": total_stars,
+        "repos": gh_user.get("public_repos", 0),
+        "followers": gh_user.get("followers", 0),
+        "changed_repos": len(sync.changed_repos),
+        "skill_vector_moved": sync.skill_vector_moved
+    }
+
+
+@job_queue.handler("user_embedding")
+async def run_user_embedding(payload: dict, secrets: dict) -> dict:
+    """Background job: recompute the user's profile embedding, then their matches."""
+    from app.utils.vectorizer import get_vector_engine
+    
+    user_id = payload["user_id"]
+    user = await Collections.users().find_one({"_id": ObjectId(user_id)})
+    if not user:
+        raise ValueError(f"User {user_id} not found")
+    
+    text = f"{user.get('github_summary', '')} Skills: {', '.join(user.get('skills', []))}"
+    vector = await asyncio.to_thread(get_vector_engine().get_embedding, text)
+    await Collections.embeddings().update_one(
+        {"owner_type": "user", "owner_id": user_id},
+        {"$set": {"vector": vector, "updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+    matches = await recompute_user_matches(user_id)
+    return {"dimensions": len(vector), "matches": len(matches)}
+
+
+@router.post("/{user_id}/sync-github", status_code=202)
 async def sync_github_profile(user_id: str, github_token: str):
-    """Sync GitHub profile data"""
+    """Queue a GitHub profile sync; poll /api/jobs/{job_id} for the result."""
     try:
         user = await Collections.users().find_one({"_id": ObjectId(user_id)})
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        github_username = user.get("github_username")
-        if not github_username:
+        if not user.get("github_username"):
             raise HTTPException(status_code=400, detail="GitHub username not set")
         
-        # Fetch GitHub data
-        async with httpx.AsyncClient() as client:
-            # Get user data
-            user_response = await client.get(
-                f"https://api.github.com/users/{github_username}",
-                headers={"Authorization": f"Bearer {github_token}"}
-            )
-            
-            if user_response.status_code != 200:
-                raise HTTPException(status_code=400, detail="Failed to fetch GitHub data")
-            
-            gh_user = user_response.json()
-            
-            # Get repositories
-            repos_response = await client.get(
-                f"https://api.github.com/users/{github_username}/repos",
-                headers={"Authorization": f"Bearer {github_token}"}
-            )
-            
-            repos = repos_response.json() if repos_response.status_code == 200 else []
-            total_stars = sum(repo.get("stargazers_count", 0) for repo in repos)
-        
-        # Update user
-        update_data = {
-            "github_profile_url": gh_user.get("html_url"),
-            "github_stars": total_stars,
-            "github_repos": gh_user.get("public_repos", 0),
-            "github_followers": gh_user.get("followers", 0),
-            "avatar_url": gh_user.get("avatar_url"),
-            "bio": gh_user.get("bio") or user.get("bio"),
-            "updated_at": datetime.utcnow()
-        }
-        
-        await Collections.users().update_one(
-            {"_id": ObjectId(user_id)},
-            {"$set": update_data}
+        # Deduplicated per user: a second request while one is pending joins it
+        job = await job_queue.enqueue(
+            "github_sync",
+            {"user_id": user_id},
+            dedup_key=f"github_sync:{user_id}",
+            secrets={"github_token": github_token}
         )
         
-        logger.info(f"GitHub profile synced: {github_username}")
-        
         return {
             "success": True,
-            "message": "GitHub profile synced successfully",
-            "data": {
-                "stars": total_stars,
-                "repos": gh_user.get("public_repos", 0),
-                "followers": gh_user.get("followers", 0)
-            }
+            "message": "GitHub profile sync queued",
+            "data": job
         }
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"GitHub sync error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to sync GitHub profile")
+        raise HTTPException(status_code=500, detail="Failed to queue GitHub profile sync")
 
 
 @router.get("/{user_id}/stats")
@@ -1,22 +1,45 @@
 """Agent integration router for hackathon matching workflow."""
 import logging
 import json
-from fastapi import APIRouter, HTTPException, status, WebSocket
-from typing import Optional
+from fastapi import APIRouter, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 
-from app.agents import app_agent, AgentState
+from app.agents.run_cache import profile_fingerprint, run_agent_cached
 from app.models.schemas import (
     AgentQueryRequest,
     AgentResponse,
     HackathonMatchResponse
 )
 from app.core.config import settings
+from app.core.jobs import agent_queue
+from app.utils.llm_governor import PRIORITY_BACKGROUND, llm_priority
+
+if TYPE_CHECKING:
+    from app.agents import AgentState
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/agent", tags=["agent"])
 
 
+def _initial_state(user_id: str, skills, github_summary, github_username) -> "AgentState":
+    return {
+        "messages": [],
+        "user_id": user_id,
+        "skills": skills or [],
+        "github_summary": github_summary or "",
+        "github_username": github_username,
+        "github_skill_vector": {},
+        "candidate_matches": [],
+        "selected_hackathon": None,
+        "win_probability": 0.0,
+        "judge_critique": "",
+        "boilerplate_code": {},
+        "degraded": False
+    }
+
+
 @router.post("/analyze", response_model=AgentResponse)
 async def analyze_user(request: AgentQueryRequest):
     """
@@ -31,24 +54,14 @@ async def analyze_user(request: AgentQueryRequest):
             )
         
         # Initialize agent state
-        initial_state: AgentState = {
-            "messages": [],
-            "user_id": request.user_id,
-            "skills": request.skills or [],
-            "github_summary": request.github_summary or "",
-            "candidate_matches": [],
-            "selected_hackathon": None,
-            "win_probability": 0.0,
-            "judge_critique": "",
-            "boilerplate_code": {}
-        }
+        initial_state = _initial_state(request.user_id, request.skills, request.github_summary, request.github_username)
         
         logger.info(f"Starting agent workflow for user {request.user_id}")
         
         # Run the agent workflow
-        result = await app_agent.ainvoke(initial_state)
+        result, cached = await run_agent_cached(initial_state)
         
-        logger.info(f"Agent workflow completed for user {request.user_id}")
+        logger.info(f"Agent workflow completed for user {request.user_id} (cached: {cached})")
         
         return AgentResponse(
             status="success",
@@ -82,24 +95,14 @@ async def run_agent(request: AgentQueryRequest):
             )
         
         # Initialize agent state
-        initial_state: AgentState = {
-            "messages": [],
-            "user_id": request.user_id,
-            "skills": request.skills or [],
-            "github_summary": request.github_summary or "",
-            "candidate_matches": [],
-            "selected_hackathon": None,
-            "win_probability": 0.0,
-            "judge_critique": "",
-            "boilerplate_code": {}
-        }
+        initial_state = _initial_state(request.user_id, request.skills, request.github_summary, request.github_username)
         
         logger.info(f"Running agent for user {request.user_id}")
         
         # Run the agent workflow
-        result = await app_agent.ainvoke(initial_state)
+        result, cached = await run_agent_cached(initial_state)
         
-        logger.info(f"Agent completed for user {request.user_id}")
+        logger.info(f"Agent completed for user {request.user_id} (cached: {cached})")
         
         return {
             "status": "success",
@@ -108,6 +111,7 @@ async def run_agent(request: AgentQueryRequest):
             "win_probability": result.get("win_probability", 0.0),
             "judge_critique": result.get("judge_critique", ""),
             "boilerplate_code": result.get("boilerplate_code", {}),
+            "cached": cached,
             "timestamp": datetime.utcnow().isoformat()
         }
     
@@ -119,6 +123,113 @@ async def run_agent(request: AgentQueryRequest):
         )
 
 
+@agent_queue.handler("agent_run")
+async def run_agent_job(payload: dict, secrets: dict) -> dict:
+    """Background job: run the agent graph for a submitted profile."""
+    initial_state = _initial_state(
+        payload["user_id"], payload.get("skills"), payload.get("github_summary"), payload.get("github_username")
+    )
+    # Queued runs yield the LLM budget to interactive requests
+    with llm_priority(PRIORITY_BACKGROUND):
+        result, cached = await run_agent_cached(initial_state)
+    return {
+        "user_id": payload["user_id"],
+        "selected_hackathon": result.get("selected_hackathon"),
+        "win_probability": result.get("win_probability", 0.0),
+        "judge_critique": result.get("judge_critique", ""),
+        "boilerplate_code": result.get("boilerplate_code", {}),
+        "cached": cached
+    }
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_agent_job(request: AgentQueryRequest):
+    """
+    Queue an agent run and return its job id immediately.
+    Poll /api/jobs/{job_id} or connect to /api/agent/ws/jobs/{job_id} for the result.
+    """
+    if not request.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="user_id is required"
+        )
+    
+    # Admission control: shed load instead of letting the queue grow unbounded
+    depth = await agent_queue.depth()
+    if depth >= settings.AGENT_QUEUE_MAX_DEPTH:
+        retry_after = max(1, depth // max(1, settings.AGENT_WORKER_CONCURRENCY) * 10)
+        logger.warning(f"Agent queue full ({depth} jobs), rejecting run for user {request.user_id}")
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "error": "Too Many Requests",
+                "detail": "Agent queue is full. Please try again later.",
+                "retry_after": retry_after
+            },
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    payload = {
+        "user_id": request.user_id,
+        "skills": request.skills or [],
+        "github_summary": request.github_summary or "",
+        "github_username": request.github_username
+    }
+    fingerprint = profile_fingerprint(payload["skills"], payload["github_summary"], payload["github_username"])
+    # Resubmitting an identical profile while a run is pending joins that run
+    job = await agent_queue.enqueue(
+        "agent_run",
+        payload,
+        dedup_key=f"agent_run:{request.user_id}:{fingerprint}",
+        max_attempts=1
+    )
+    
+    logger.info(f"Queued agent job {job['id']} for user {request.user_id} (queue depth {depth})")
+    return {
+        "success": True,
+        "message": "Agent run queued",
+        "data": job
+    }
+
+
+@router.websocket("/ws/jobs/{job_id}")
+async def websocket_agent_job(websocket: WebSocket, job_id: str):
+    """
+    WebSocket that pushes an agent job's status until it finishes, then closes.
+    """
+    await websocket.accept()
+    
+    try:
+        job = await agent_queue.get(job_id)
+        if not job:
+            await websocket.send_json({"event": "error", "message": "Job not found"})
+            return
+        
+        last_status = None
+        while True:
+            if job["status"] != last_status:
+                last_status = job["status"]
+                await websocket.send_json({"event": "status", "job": job})
+            if job["status"] not in ("queued", "running"):
+                event = "analysis_complete" if job["status"] == "succeeded" else "error"
+                await websocket.send_json({"event": event, "job": job})
+                return
+            job = await agent_queue.wait(job_id, timeout=15.0)
+            if job is None:
+                await websocket.send_json({"event": "error", "message": "Job not found"})
+                return
+    
+    except WebSocketDisconnect:
+        logger.info(f"Job WebSocket disconnected for job {job_id}")
+    except Exception as e:
+        logger.error(f"Job WebSocket error for job {job_id}: {str(e)}")
+    finally:
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass
+
+
 @router.get("/hackathons/{user_id}/matches")
 async def get_user_matches(
     user_id: str,
@@ -214,20 +325,10 @@ async def websocket_agent(websocket: WebSocket, user_id: str):
                 })
                 
                 # Initialize and run agent
-                initial_state: AgentState = {
-                    "messages": [],
-                    "user_id": user_id,
-                    "skills": skills,
-                    "github_summary": github_summary,
-                    "candidate_matches": [],
-                    "selected_hackathon": None,
-                    "win_probability": 0.0,
-                    "judge_critique": "",
-                    "boilerplate_code": {}
-                }
+                initial_state = _initial_state(user_id, skills, github_summary, data.get("github_username"))
                 
                 try:
-                    result = await app_agent.ainvoke(initial_state)
+                    result, cached = await run_agent_cached(initial_state)
                     
                     await websocket.send_json({
                         "event": "analysis_complete",
@@ -235,6 +336,7 @@ async def websocket_agent(websocket: WebSocket, user_id: str):
                         "win_probability": result.get("win_probability", 0.0),
                         "judge_critique": result.get("judge_critique", ""),
                         "boilerplate_code": result.get("boilerplate_code", {}),
+                        "cached": cached,
                         "progress": 100
                     })
                 
@@ -0,0 +1,316 @@
+"""
+Content-addressed artifact store.
+
+Artifacts are immutable blobs named by the SHA-256 of their content, so
+storing the same output twice is a no-op and a hash is also a strong ETag.
+Files live under ``ARTIFACT_DIR`` as ``<kind>/<hash[:2]>/<hash>``; writes go
+to a sibling ``.partial`` file and are renamed into place, so readers never
+see a half-written artifact. With ``ARTIFACT_BACKEND=gridfs`` generated code
+is kept in MongoDB GridFS instead (derived ZIPs stay on local disk).
+
+Generations are remembered in the ``generated_artifacts`` table, which maps a
+hash of the normalized inputs to the artifact they produced. ``get_or_generate``
+consults it first, so regenerating or re-opening a past project costs no LLM
+call, and identical concurrent generations are coalesced into one.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.db import SessionLocal, serialized
+from app.core.single_flight import SingleFlight
+from app.models.artifact_models import GeneratedArtifact
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def canonical_json(value: Any) -> bytes:
+    """Stable JSON encoding, so equal documents hash equally."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ArtifactWriter:
+    """Streams bytes into the store under a name chosen up front (e.g. a derived artifact)."""
+
+    def __init__(self, final_path: str):
+        self.final_path = final_path
+        self.partial_path = f"{final_path}.{uuid.uuid4().hex}.partial"
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        self._file = open(self.partial_path, "wb")
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def commit(self):
+        self._file.close()
+        os.replace(self.partial_path, self.final_path)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self.partial_path)
+        except FileNotFoundError:
+            pass
+
+
+class ArtifactStore:
+    """Filesystem-backed content-addressed store."""
+
+    def __init__(self, root: str = settings.ARTIFACT_DIR):
+        self.root = root
+
+    def path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, kind, key[:2], key)
+
+    def exists(self, kind: str, key: str) -> bool:
+        return os.path.exists(self.path(kind, key))
+
+    def put_bytes(self, kind: str, data: bytes) -> str:
+        """Store ``data`` and return its hash (no write if it's already stored)."""
+        key = content_hash(data)
+        if not self.exists(kind, key):
+            writer = ArtifactWriter(self.path(kind, key))
+            try:
+                writer.write(data)
+                writer.commit()
+            except Exception:
+                writer.abort()
+                raise
+        return key
+
+    def get_bytes(self, kind: str, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path(kind, key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put_json(self, kind: str, value: Any) -> str:
+        return self.put_bytes(kind, canonical_json(value))
+
+    def get_json(self, kind: str, key: str) -> Optional[Any]:
+        data = self.get_bytes(kind, key)
+        return json.loads(data) if data is not None else None
+
+    def writer(self, kind: str, key: str) -> ArtifactWriter:
+        """Writer for a derived artifact keyed by its source's hash (e.g. a ZIP of a boilerplate)."""
+        return ArtifactWriter(self.path(kind, key))
+
+
+class FileSystemBlobStore:
+    """Async view of an ``ArtifactStore`` (file I/O runs in worker threads)."""
+
+    def __init__(self, store: ArtifactStore):
+        self.store = store
+
+    async def exists(self, kind: str, key: str) -> bool:
+        return await asyncio.to_thread(self.store.exists, kind, key)
+
+    async def put_bytes(self, kind: str, data: bytes) -> str:
+        return await asyncio.to_thread(self.store.put_bytes, kind, data)
+
+    async def get_bytes(self, kind: str, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.store.get_bytes, kind, key)
+
+
+class GridFSBlobStore:
+    """MongoDB GridFS store; files are named ``<kind>/<hash>``."""
+
+    def __init__(self, bucket_name: str = "artifacts"):
+        self.bucket_name = bucket_name
+        self._bucket = None
+
+    @property
+    def bucket(self):
+        if self._bucket is None:
+            from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+            from app.core.database import get_db
+            self._bucket = AsyncIOMotorGridFSBucket(get_db(), bucket_name=self.bucket_name)
+        return self._bucket
+
+    async def exists(self, kind: str, key: str) -> bool:
+        files = await self.bucket.find({"filename": f"{kind}/{key}"}, limit=1).to_list(1)
+        return bool(files)
+
+    async def put_bytes(self, kind: str, data: bytes) -> str:
+        key = content_hash(data)
+        if not await self.exists(kind, key):
+            await self.bucket.upload_from_stream(f"{kind}/{key}", data, metadata={"kind": kind, "sha256": key})
+        return key
+
+    async def get_bytes(self, kind: str, key: str) -> Optional[bytes]:
+        from gridfs.errors import NoFile
+        try:
+            stream = await self.bucket.open_download_stream_by_name(f"{kind}/{key}")
+        except NoFile:
+            return None
+        return await stream.read()
+
+
+artifact_store = ArtifactStore()
+_blob_store = None
+
+
+def get_blob_store():
+    """Async store for generated code, per ``ARTIFACT_BACKEND``."""
+    global _blob_store
+    if _blob_store is None:
+        if settings.ARTIFACT_BACKEND == "gridfs":
+            _blob_store = GridFSBlobStore()
+        else:
+            _blob_store = FileSystemBlobStore(artifact_store)
+    return _blob_store
+
+
+async def put_json(kind: str, value: Any) -> str:
+    return await get_blob_store().put_bytes(kind, canonical_json(value))
+
+
+async def get_json(kind: str, key: str) -> Optional[Any]:
+    data = await get_blob_store().get_bytes(kind, key)
+    return json.loads(data) if data is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Generation reuse
+# ---------------------------------------------------------------------------
+
+def generation_key(kind: str, inputs: Dict[str, Any]) -> str:
+    """Hash of a generation's inputs; callers normalize them (case, order, whitespace) first."""
+    return content_hash(canonical_json({"kind": kind, "inputs": inputs}))
+
+
+@serialized
+def _lookup_generation(input_key: str) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        row = db.get(GeneratedArtifact, input_key)
+        if row is None:
+            return None
+        row.hits = (row.hits or 0) + 1
+        row.last_used_at = datetime.utcnow()
+        db.commit()
+        return row.artifact_id
+    finally:
+        db.close()
+
+
+@serialized
+def _record_generation(input_key: str, kind: str, artifact_id: str, size: int):
+    db = SessionLocal()
+    try:
+        row = db.get(GeneratedArtifact, input_key)
+        if row is None:
+            db.add(GeneratedArtifact(input_key=input_key, kind=kind, artifact_id=artifact_id, size=size))
+        else:
+            row.artifact_id = artifact_id
+            row.size = size
+        db.commit()
+    finally:
+        db.close()
+
+
+generation_flight = SingleFlight("artifact_gen", lock_ttl_seconds=180)
+
+
+async def get_or_generate(
+    kind: str,
+    inputs: Dict[str, Any],
+    generate: Callable[[], Awaitable[Any]],
+) -> Tuple[str, Any, bool]:
+    """Return ``(artifact_id, value, reused)`` for a JSON-serializable generation.
+
+    ``generate`` only runs when these inputs have never produced a stored
+    artifact; if it raises, nothing is recorded and the error propagates.
+    """
+    input_key = generation_key(kind, inputs)
+
+    artifact_id = await asyncio.to_thread(_lookup_generation, input_key)
+    if artifact_id is not None:
+        value = await get_json(kind, artifact_id)
+        if value is not None:
+            return artifact_id, value, True
+        logger.warning(f"Artifact {kind}/{artifact_id} missing from the store; regenerating")
+
+    async def produce() -> Dict[str, Any]:
+        value = await generate()
+        data = canonical_json(value)
+        key = await get_blob_store().put_bytes(kind, data)
+        await asyncio.to_thread(_record_generation, input_key, kind, key, len(data))
+        return {"artifact_id": key, "value": value}
+
+    produced, shared = await generation_flight.do(input_key, produce)
+    return produced["artifact_id"], produced["value"], shared
+
+
+# ---------------------------------------------------------------------------
+# References
+# ---------------------------------------------------------------------------
+
+@serialized
+def _attach_to_matches(user_id: str, hackathon_id: str, artifact_id: str) -> int:
+    from app.models.hackathon_models import HackathonMatch
+    db = SessionLocal()
+    try:
+        updated = db.query(HackathonMatch).filter(
+            HackathonMatch.user_id == user_id,
+            HackathonMatch.hackathon_id == hackathon_id,
+        ).update({HackathonMatch.artifact_id: artifact_id, HackathonMatch.updated_at: datetime.utcnow()})
+        db.commit()
+        return updated
+    finally:
+        db.close()
+
+
+async def attach_artifact(user_id: str, hackathon_id: str, artifact_id: str):
+    """Reference an artifact from the user's match row and submissions for a hackathon."""
+    await asyncio.to_thread(_attach_to_matches, user_id, hackathon_id, artifact_id)
+    try:
+        from app.core.database import Collections
+        await Collections.submissions().update_many(
+            {"user_id": user_id, "hackathon_id": hackathon_id},
+            {"$set": {"artifact_id": artifact_id, "updated_at": datetime.utcnow()}},
+        )
+    except RuntimeError:
+        pass  # MongoDB not initialized (lite mode)
+
+
+@serialized
+def _find_match_artifact(user_id: str, hackathon_id: str) -> Optional[str]:
+    from app.models.hackathon_models import HackathonMatch
+    db = SessionLocal()
+    try:
+        row = db.query(HackathonMatch).filter(
+            HackathonMatch.user_id == user_id,
+            HackathonMatch.hackathon_id == hackathon_id,
+            HackathonMatch.artifact_id.isnot(None),
+        ).order_by(HackathonMatch.updated_at.desc()).first()
+        return row.artifact_id if row else None
+    finally:
+        db.close()
+
+
+async def find_project_artifact(user_id: str, hackathon_id: str) -> Optional[str]:
+    """Artifact last generated for a user's hackathon project, if any."""
+    artifact_id = await asyncio.to_thread(_find_match_artifact, user_id, hackathon_id)
+    if artifact_id is not None:
+        return artifact_id
+    try:
+        from app.core.database import Collections
+        submission = await Collections.submissions().find_one(
+            {"user_id": user_id, "hackathon_id": hackathon_id, "artifact_id": {"$ne": None}},
+            sort=[("updated_at", -1)],
+        )
+        return submission.get("artifact_id") if submission else None
+    except RuntimeError:
+        return None
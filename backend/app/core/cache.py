@@ -6,6 +6,7 @@ from typing import Any, Optional
 import json
 import logging
 from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +35,12 @@ async def get_cache(key: str) -> Optional[Any]:
     try:
         data = await redis_client.get(key)
         if data:
+            CACHE_REQUESTS.labels("hit").inc()
             return json.loads(data)
+        CACHE_REQUESTS.labels("miss").inc()
         return None
     except Exception as e:
+        CACHE_REQUESTS.labels("error").inc()
         logger.error(f"Cache get error: {e}")
         return None
 
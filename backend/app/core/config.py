@@ -44,19 +44,105 @@ class Settings(BaseSettings):
     RATE_LIMIT_DEFAULT: str = os.getenv("RATE_LIMIT_DEFAULT", "100/minute")
     # Storage for rate limit state (memory, redis, etc.)
     RATE_LIMIT_STORAGE: str = os.getenv("RATE_LIMIT_STORAGE", "memory://")
-    # Strategy: fixed-window or moving-window
+    # Strategy: fixed-window, moving-window or gcra (distributed, see app/core/rate_limit.py)
     RATE_LIMIT_STRATEGY: str = os.getenv("RATE_LIMIT_STRATEGY", "fixed-window")
+    # Per-authenticated-user limit (gcra strategy), applied in addition to the per-IP default
+    RATE_LIMIT_USER: str = os.getenv("RATE_LIMIT_USER", "300/minute")
     
     # Per-endpoint rate limits (can be customized)
-    RATE_LIMIT_AUTH: str = "10/minute"  # Stricter for auth endpoints
+    RATE_LIMIT_AUTH: str = os.getenv("RATE_LIMIT_AUTH", "10/minute")  # Stricter for auth endpoints
     RATE_LIMIT_API: str = "100/minute"  # Standard for API endpoints
     RATE_LIMIT_UPLOAD: str = "5/minute"  # Stricter for upload endpoints
     
+    # --- Background Jobs ---
+    # Concurrent job executions per worker process
+    JOB_WORKER_CONCURRENCY: int = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    # Seconds a running job may go without finishing before another worker reclaims it
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    # Queue liveness heartbeat; a queue silent for JOB_OWNER_TIMEOUT_SECONDS is dead
+    # and the jobs holding its (in-memory) secrets are failed by the other workers
+    JOB_HEARTBEAT_SECONDS: int = int(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+    JOB_OWNER_TIMEOUT_SECONDS: int = int(os.getenv("JOB_OWNER_TIMEOUT_SECONDS", "60"))
+    # Concurrent agent runs per worker process, and the queued+running agent
+    # jobs above which new submissions are rejected with 429
+    AGENT_WORKER_CONCURRENCY: int = int(os.getenv("AGENT_WORKER_CONCURRENCY", "4"))
+    AGENT_QUEUE_MAX_DEPTH: int = int(os.getenv("AGENT_QUEUE_MAX_DEPTH", "100"))
+    
+    # --- Startup ---
+    # Load the agent graph (langgraph/langchain/groq) in the background after boot
+    # instead of on the first agent request. Disable for the fastest possible boot.
+    AGENT_WARMUP: bool = os.getenv("AGENT_WARMUP", "true").lower() == "true"
+    # Load the embedding model and run a dummy encode in the background after boot
+    MODEL_WARMUP: bool = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+    # Subsystems that must be ready for /api/ready to return 200
+    # (any of: model, db, redis, vector_index, agent)
+    READINESS_REQUIRED: str = os.getenv("READINESS_REQUIRED", "model,db")
+    
+    # --- Embeddings ---
+    # "torch" loads sentence-transformers; "onnx" runs the exported model on
+    # onnxruntime (no PyTorch, smaller workers). Export with export_embedding_model.py.
+    # "hash" is a deterministic, non-semantic feature-hashing embedder for
+    # offline load and scale tests only.
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch")
+    EMBEDDING_ONNX_DIR: str = os.getenv("EMBEDDING_ONNX_DIR", "models/all-MiniLM-L6-v2-onnx")
+    EMBEDDING_ONNX_QUANTIZED: bool = os.getenv("EMBEDDING_ONNX_QUANTIZED", "true").lower() == "true"
+    # onnxruntime intra-op threads per worker (0 = onnxruntime default)
+    EMBEDDING_THREADS: int = int(os.getenv("EMBEDDING_THREADS", "0"))
+    # Hackathon reindex: documents embedded per batch, vectors per Pinecone
+    # upsert request, and concurrent upsert requests
+    REINDEX_BATCH_SIZE: int = int(os.getenv("REINDEX_BATCH_SIZE", "256"))
+    VECTOR_UPSERT_CHUNK_SIZE: int = int(os.getenv("VECTOR_UPSERT_CHUNK_SIZE", "100"))
+    VECTOR_UPSERT_CONCURRENCY: int = int(os.getenv("VECTOR_UPSERT_CONCURRENCY", "4"))
+    # "pinecone", or "local" for the in-process index (app/utils/local_vector_index.py),
+    # optionally persisted to LOCAL_VECTOR_INDEX_PATH (.npz)
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "pinecone")
+    LOCAL_VECTOR_INDEX_PATH: str = os.getenv("LOCAL_VECTOR_INDEX_PATH", "")
+    # Bulk NDJSON hackathon ingestion: rows upserted per transaction, the most
+    # per-row errors echoed back in the response, and the longest accepted line
+    BULK_INGEST_BATCH_SIZE: int = int(os.getenv("BULK_INGEST_BATCH_SIZE", "1000"))
+    BULK_INGEST_MAX_ERRORS: int = int(os.getenv("BULK_INGEST_MAX_ERRORS", "1000"))
+    BULK_INGEST_MAX_LINE_BYTES: int = int(os.getenv("BULK_INGEST_MAX_LINE_BYTES", str(1024 * 1024)))
+    
+    # --- Agent result cache ---
+    # Seconds a whole agent run is reused for identical profile inputs (0 disables)
+    AGENT_RESULT_CACHE_TTL: int = int(os.getenv("AGENT_RESULT_CACHE_TTL", "3600"))
+    AGENT_RESULT_CACHE_SIZE: int = int(os.getenv("AGENT_RESULT_CACHE_SIZE", "512"))
+    # Max seconds an agent run holds its cross-worker single-flight lock
+    AGENT_RUN_LOCK_TTL: int = int(os.getenv("AGENT_RUN_LOCK_TTL", "180"))
+    
+    # --- Artifacts ---
+    # Root directory of the content-addressed store for generated code and ZIPs
+    ARTIFACT_DIR: str = os.getenv("ARTIFACT_DIR", "artifacts")
+    # "fs" keeps generated code under ARTIFACT_DIR; "gridfs" stores it in MongoDB
+    # (derived ZIPs are always cached on the local filesystem)
+    ARTIFACT_BACKEND: str = os.getenv("ARTIFACT_BACKEND", "fs")
+    
     # --- LLM & AI ---
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "test-key-replace-in-production")
+    # Override the Groq API host (e.g. the fake LLM server used by load_test.py)
+    GROQ_BASE_URL: Optional[str] = os.getenv("GROQ_BASE_URL") or None
+    # Provider (account-wide) limits for every Groq call (see app/utils/llm_governor.py)
+    LLM_REQUESTS_PER_MINUTE: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+    LLM_TOKENS_PER_MINUTE: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "12000"))
+    # Processes sharing the account; each worker's buckets get 1/LLM_WORKERS of the limits
+    LLM_WORKERS: int = int(os.getenv("LLM_WORKERS", os.getenv("WEB_CONCURRENCY", "1")))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    # "batch" judges all top candidates in one LLM call and picks the best;
+    # "single" judges only the top retrieval hit
+    JUDGE_MODE: str = os.getenv("JUDGE_MODE", "batch")
+    JUDGE_TOP_K: int = int(os.getenv("JUDGE_TOP_K", "5"))
     PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY", "test-key-replace-in-production")
     PINECONE_INDEX: str = "hackathons"
     
+    # --- Tracing ---
+    # Span exporter: "none", "console", "file" (OTLP/JSON lines) or "otlp" (OTLP/HTTP JSON)
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")
+    TRACING_FILE: str = os.getenv("TRACING_FILE", "traces.jsonl")
+    TRACING_OTLP_ENDPOINT: str = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318")
+    TRACING_SERVICE_NAME: str = os.getenv("TRACING_SERVICE_NAME", "hackquest-api")
+    
     # --- OAuth Configuration ---
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
     GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
@@ -1,9 +1,12 @@
 """MongoDB async database connection and management"""
 import logging
+import threading
+import time
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 from pymongo.errors import ServerSelectionTimeoutError
 from contextlib import asynccontextmanager
 from app.core.config import settings
+from app.core.metrics import MongoPoolListener
 
 logger = logging.getLogger(__name__)
 
@@ -11,22 +14,39 @@ logger = logging.getLogger(__name__)
 _db: AsyncIOMotorDatabase | None = None
 _client: AsyncIOMotorClient | None = None
 _pinecone_index = None
+_pinecone_lock = threading.Lock()
+_pinecone_retry_at = 0.0
+
+# A failed Pinecone connect is not retried sooner than this, so readiness
+# probes and queries don't each make a network round trip while it is down
+PINECONE_RETRY_SECONDS = 30.0
 
 
 def get_pinecone_index():
-    """Get or initialize Pinecone index (lazy initialization)"""
-    global _pinecone_index
+    """Get or initialize Pinecone index (lazy initialization, cached)"""
+    global _pinecone_index, _pinecone_retry_at
+    if _pinecone_index is not None:
+        return _pinecone_index
     
-    if _pinecone_index is None:
-        try:
-            from pinecone import Pinecone
-            api_key = settings.pinecone_api_key.strip()
-            pc = Pinecone(api_key=api_key)
-            _pinecone_index = pc.Index(settings.pinecone_index)
-            logger.info(f"✅ Pinecone initialized for index: {settings.pinecone_index}")
-        except Exception as e:
-            logger.error(f"❌ Pinecone initialization error: {e}")
-            return None
+    with _pinecone_lock:
+        if _pinecone_index is None and settings.VECTOR_BACKEND == "local":
+            from app.utils.local_vector_index import LocalVectorIndex
+            _pinecone_index = LocalVectorIndex(path=settings.LOCAL_VECTOR_INDEX_PATH or None)
+            logger.info(f"✅ Local vector index initialized ({len(_pinecone_index)} vectors)")
+        
+        if _pinecone_index is None:
+            if time.monotonic() < _pinecone_retry_at:
+                return None
+            try:
+                from pinecone import Pinecone
+                api_key = settings.PINECONE_API_KEY.strip()
+                pc = Pinecone(api_key=api_key)
+                _pinecone_index = pc.Index(settings.PINECONE_INDEX)
+                logger.info(f"✅ Pinecone initialized for index: {settings.PINECONE_INDEX}")
+            except Exception as e:
+                _pinecone_retry_at = time.monotonic() + PINECONE_RETRY_SECONDS
+                logger.error(f"❌ Pinecone initialization error: {e}")
+                return None
     
     return _pinecone_index
 
@@ -41,17 +61,18 @@ async def init_db() -> AsyncIOMotorDatabase:
     
     try:
         _client = AsyncIOMotorClient(
-            settings.mongodb_url,
+            settings.MONGODB_URL,
             serverSelectionTimeoutMS=5000,
             connectTimeoutMS=10000,
             retryWrites=True,
+            event_listeners=[MongoPoolListener()],
         )
         
         # Verify connection
         await _client.admin.command('ping')
-        _db = _client[settings.mongodb_db]
+        _db = _client[settings.DATABASE_NAME]
         
-        logger.info(f"✅ Connected to MongoDB: {settings.mongodb_db}")
+        logger.info(f"✅ Connected to MongoDB: {settings.DATABASE_NAME}")
         await _create_indexes()
         return _db
         
@@ -63,6 +84,16 @@ async def init_db() -> AsyncIOMotorDatabase:
         raise
 
 
+async def init_db_optional() -> bool:
+    """Connect MongoDB if reachable; Mongo-backed endpoints and jobs stay unavailable otherwise."""
+    try:
+        await init_db()
+        return True
+    except Exception:
+        logger.warning("⚠️ MongoDB unavailable; profile, match and GitHub sync features are disabled")
+        return False
+
+
 async def close_db():
     """Close MongoDB connection"""
     global _client, _db
@@ -122,6 +153,12 @@ async def _create_indexes():
         await matches.create_index("hackathon_id")
         await matches.create_index([("user_id", 1), ("hackathon_id", 1)], unique=True)
         
+        # Embeddings (one vector per owner; content_hash drives incremental reindex)
+        await db["embeddings"].create_index([("owner_type", 1), ("owner_id", 1)], unique=True)
+        
+        # GitHub sync cursors
+        await db["github_sync"].create_index("user_id", unique=True)
+        
         logger.info("✅ Database indexes created successfully")
         
     except Exception as e:
@@ -154,4 +191,8 @@ class Collections:
     
     @staticmethod
     def scrape_log() -> AsyncIOMotorCollection:
-        return get_db()["scrape_log"]
\ No newline at end of file
+        return get_db()["scrape_log"]
+    
+    @staticmethod
+    def github_sync() -> AsyncIOMotorCollection:
+        return get_db()["github_sync"]
\ No newline at end of file
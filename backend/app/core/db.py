@@ -1,12 +1,15 @@
 """SQLite database setup and session management."""
+import functools
 import os
-from sqlalchemy import create_engine, event
+import threading
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+from app.core.metrics import instrument_engine
 from app.models.database import Base
 
 # Use SQLite database file
-DB_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "hackquest.db")
+DB_PATH = os.getenv("SQLITE_PATH") or os.path.join(os.path.dirname(__file__), "..", "..", "hackquest.db")
 DATABASE_URL = f"sqlite:///{DB_PATH.replace(chr(92), '/')}"
 
 # Create engine with SQLite configuration
@@ -24,9 +27,24 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.close()
 
+instrument_engine(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# StaticPool shares one connection; code running sessions from worker threads
+# (asyncio.to_thread) serializes on this lock
+db_lock = threading.Lock()
+
+
+def serialized(func):
+    """Run ``func`` while holding ``db_lock``."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with db_lock:
+            return func(*args, **kwargs)
+    return wrapper
+
 
 def get_db():
     """Dependency for FastAPI to get database session."""
@@ -37,7 +55,25 @@ def get_db():
         db.close()
 
 
+def _add_missing_columns():
+    """Add nullable columns (and their indexes) that were added to models after their table was created."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+                    print(f"[OK] Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
     print("[OK] Database initialized successfully")
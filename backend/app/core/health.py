@@ -0,0 +1,127 @@
+"""
+Readiness checks for load balancers.
+
+``/api/ready`` reports per-subsystem state so traffic is only routed to
+workers whose embedding model is loaded and whose database answers. Optional
+subsystems (Redis, vector index, agent graph) are reported but do not fail
+readiness unless listed in ``READINESS_REQUIRED``. If the model is not loaded
+(``MODEL_WARMUP`` off, or warm-up failed) the probe starts loading it in the
+background, so the worker becomes ready without waiting for a first request.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import SessionLocal, serialized
+
+logger = logging.getLogger(__name__)
+
+CHECK_TIMEOUT_SECONDS = 2.0
+
+# Background model load started by the readiness probe (MODEL_WARMUP off or failed)
+_model_loader: Optional[threading.Thread] = None
+_model_loader_lock = threading.Lock()
+
+
+def _load_model_in_background(engine):
+    try:
+        seconds = engine.warm_up()
+        logger.info(f"[OK] Embedding model loaded for readiness in {seconds:.2f}s")
+    except Exception as e:
+        logger.warning(f"[WARN] Embedding model load failed (readiness will retry): {e}")
+
+
+def _check_model() -> Tuple[str, str]:
+    global _model_loader
+    from app.utils.vectorizer import get_vector_engine
+    engine = get_vector_engine()
+    if engine.is_loaded:
+        return "ready", "embedding model loaded"
+    with _model_loader_lock:
+        if _model_loader is None or not _model_loader.is_alive():
+            _model_loader = threading.Thread(
+                target=_load_model_in_background, args=(engine,), name="model-loader", daemon=True
+            )
+            _model_loader.start()
+    return "not_ready", "embedding model loading"
+
+
+@serialized
+def _check_db() -> Tuple[str, str]:
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        return "ready", "sqlite ok"
+    finally:
+        db.close()
+
+
+async def _check_redis() -> Tuple[str, str]:
+    from app.core import cache
+    if cache.redis_client is None:
+        return "not_configured", "redis not initialized"
+    await cache.redis_client.ping()
+    return "ready", "redis ok"
+
+
+def _check_vector_index() -> Tuple[str, str]:
+    # Reports the cached handle; a failed connect is retried at most every
+    # PINECONE_RETRY_SECONDS rather than on every probe
+    from app.core.database import get_pinecone_index
+    if get_pinecone_index() is None:
+        return "not_ready", "pinecone index unavailable"
+    return "ready", "pinecone index ok"
+
+
+def _check_agent() -> Tuple[str, str]:
+    import app.agents as agents
+    if agents._agent is not None:
+        return "ready", "agent graph compiled"
+    return "not_ready", "agent graph loading"
+
+
+async def _run_check(name: str, check) -> Dict[str, str]:
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(check):
+            state, detail = await asyncio.wait_for(check(), CHECK_TIMEOUT_SECONDS)
+        else:
+            state, detail = await asyncio.wait_for(asyncio.to_thread(check), CHECK_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        state, detail = "not_ready", "check timed out"
+    except Exception as e:
+        state, detail = "not_ready", str(e)
+    return {
+        "status": state,
+        "detail": detail,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+async def check_database() -> Dict[str, str]:
+    """SQLite liveness for ``/api/health``."""
+    return await _run_check("db", _check_db)
+
+
+CHECKS = {
+    "model": _check_model,
+    "db": _check_db,
+    "redis": _check_redis,
+    "vector_index": _check_vector_index,
+    "agent": _check_agent,
+}
+
+
+async def check_readiness() -> Tuple[bool, Dict[str, Dict[str, str]]]:
+    """Run all subsystem checks concurrently; ready iff every required one is ready."""
+    names = list(CHECKS)
+    results = await asyncio.gather(*[_run_check(name, CHECKS[name]) for name in names])
+    subsystems = dict(zip(names, results))
+    required = [n.strip() for n in settings.READINESS_REQUIRED.split(",") if n.strip()]
+    ready = all(subsystems.get(name, {}).get("status") == "ready" for name in required)
+    return ready, subsystems
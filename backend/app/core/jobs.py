@@ -0,0 +1,467 @@
+"""
+Persistent background job queue.
+
+Jobs are stored in the SQLite ``background_jobs`` table, so they survive a
+restart and are shared by every uvicorn worker on the host. Each worker runs a
+bounded pool of asyncio consumers that claim jobs atomically, execute the
+registered handler and retry failures with exponential backoff.
+
+Each ``JobQueue`` only claims the job kinds it has handlers for, so separate
+queues (``job_queue``, ``agent_queue``) partition work into independent pools.
+
+Jobs are deduplicated by ``dedup_key``: enqueuing while an identical job is
+still queued or running returns the existing job instead of a new one (a
+partial unique index makes this hold across processes too).
+
+Secrets passed to ``enqueue`` (e.g. a user's OAuth token) are never persisted;
+they stay in the enqueuing queue's memory and the job records that queue as
+its ``owner_id``. Every started queue heartbeats a ``job_workers`` row. Only
+the owner claims such jobs while its heartbeat is fresh; once the owner is
+gone (restart, crash) another worker claims the job and fails it instead of
+running it without its secrets.
+
+Usage:
+    @job_queue.handler("github_sync")
+    async def run_sync(payload: dict, secrets: dict) -> dict:
+        ...
+
+    job = await job_queue.enqueue("github_sync", {"user_id": uid}, dedup_key=f"github_sync:{uid}")
+"""
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.db import SessionLocal, serialized
+from app.models.job_models import BackgroundJob, JobWorker
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+ACTIVE_STATUSES = ("queued", "running")
+POLL_INTERVAL_SECONDS = 1.0
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 300.0
+STALE_WORKER_ROWS_SECONDS = 86400  # Heartbeat rows of dead queues are deleted after a day
+
+
+class LeaseLost(Exception):
+    """Another worker reclaimed the job while this one was still running it."""
+
+
+def serialize_job(job: BackgroundJob) -> dict:
+    """Public view of a job row (never includes secrets)."""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+class JobQueue:
+    """SQLite-backed job queue with a bounded asyncio worker pool."""
+
+    def __init__(self, concurrency: int = settings.JOB_WORKER_CONCURRENCY, name: str = "Job queue"):
+        self.concurrency = concurrency
+        self.name = name
+        # Identifies this queue instance as the owner of the secrets it holds
+        self.owner_id = str(uuid.uuid4())
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._handlers: Dict[str, JobHandler] = {}
+        # Secrets (e.g. user tokens) are kept in memory only and never persisted
+        self._secrets: Dict[str, Dict[str, Any]] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._running = False
+        # Local waiters for jobs finishing in this process (see wait())
+        self._finished: Dict[str, asyncio.Event] = {}
+
+    def handler(self, kind: str):
+        """Decorator registering the coroutine that executes jobs of ``kind``."""
+        def register(func: JobHandler) -> JobHandler:
+            self._handlers[kind] = func
+            return func
+        return register
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _active_job(db, dedup_key: str) -> Optional[BackgroundJob]:
+        return db.query(BackgroundJob).filter(
+            BackgroundJob.dedup_key == dedup_key,
+            BackgroundJob.status.in_(ACTIVE_STATUSES),
+        ).first()
+
+    @serialized
+    def _enqueue_sync(
+        self, kind: str, payload: dict, dedup_key: Optional[str], max_attempts: int, needs_secrets: bool
+    ) -> tuple:
+        db = SessionLocal()
+        try:
+            if dedup_key:
+                existing = self._active_job(db, dedup_key)
+                if existing:
+                    return serialize_job(existing), False
+
+            job = BackgroundJob(
+                id=str(uuid.uuid4()),
+                kind=kind,
+                dedup_key=dedup_key,
+                status="queued",
+                payload=json.dumps(payload),
+                max_attempts=max_attempts,
+                run_after=datetime.utcnow(),
+                needs_secrets=needs_secrets,
+                owner_id=self.owner_id if needs_secrets else None,
+            )
+            db.add(job)
+            if needs_secrets:
+                # Owner must look alive even before this queue's heartbeat loop runs
+                db.merge(JobWorker(id=self.owner_id, heartbeat_at=datetime.utcnow()))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another process inserted the same active dedup_key since our check
+                db.rollback()
+                existing = self._active_job(db, dedup_key) if dedup_key else None
+                if existing is None:
+                    raise
+                return serialize_job(existing), False
+            db.refresh(job)
+            return serialize_job(job), True
+        finally:
+            db.close()
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        dedup_key: Optional[str] = None,
+        secrets: Optional[dict] = None,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+    ) -> dict:
+        """Queue a job, or return the active job already queued under ``dedup_key``."""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+
+        job, created = await asyncio.to_thread(
+            self._enqueue_sync, kind, payload, dedup_key, max_attempts, bool(secrets)
+        )
+        if created and secrets:
+            self._secrets[job["id"]] = secrets
+        if created:
+            self._wakeup.set()
+        return job
+
+    @serialized
+    def _get_sync(self, job_id: str) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+            return serialize_job(job) if job else None
+        finally:
+            db.close()
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Get job status by id."""
+        return await asyncio.to_thread(self._get_sync, job_id)
+
+    @serialized
+    def _depth_sync(self, kinds: List[str]) -> int:
+        db = SessionLocal()
+        try:
+            return db.query(BackgroundJob).filter(
+                BackgroundJob.kind.in_(kinds),
+                BackgroundJob.status.in_(ACTIVE_STATUSES),
+            ).count()
+        finally:
+            db.close()
+
+    async def depth(self) -> int:
+        """Number of queued or running jobs of the kinds this queue handles."""
+        return await asyncio.to_thread(self._depth_sync, list(self._handlers))
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[dict]:
+        """Return the job once it leaves queued/running, or its current state after ``timeout``.
+
+        Jobs finished by this process wake the waiter immediately; jobs run by
+        another worker process are picked up by polling.
+        """
+        deadline = asyncio.get_running_loop().time() + timeout
+        event = self._finished.setdefault(job_id, asyncio.Event())
+        try:
+            while True:
+                job = await self.get(job_id)
+                remaining = deadline - asyncio.get_running_loop().time()
+                if job is None or job["status"] not in ACTIVE_STATUSES or remaining <= 0:
+                    return job
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=min(POLL_INTERVAL_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._finished.pop(job_id, None)
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    @serialized
+    def _heartbeat_sync(self):
+        """Mark this queue alive (and prune rows of long-dead queues)."""
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            db.merge(JobWorker(id=self.owner_id, heartbeat_at=now))
+            db.query(JobWorker).filter(
+                JobWorker.heartbeat_at < now - timedelta(seconds=STALE_WORKER_ROWS_SECONDS)
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @serialized
+    def _retire_sync(self):
+        """Drop this queue's heartbeat so its secret-bearing jobs are failed promptly."""
+        db = SessionLocal()
+        try:
+            db.query(JobWorker).filter(JobWorker.id == self.owner_id).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    async def _heartbeat_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._heartbeat_sync)
+            except Exception as e:
+                logger.warning(f"{self.name} heartbeat failed: {e}")
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+
+    @serialized
+    def _claim_sync(self) -> Optional[tuple]:
+        """Atomically move one due job to ``running`` (or reclaim an expired lease)."""
+        now = datetime.utcnow()
+        owner_alive = exists().where(
+            JobWorker.id == BackgroundJob.owner_id,
+            JobWorker.heartbeat_at >= now - timedelta(seconds=settings.JOB_OWNER_TIMEOUT_SECONDS),
+        )
+        db = SessionLocal()
+        try:
+            candidate = db.query(BackgroundJob).filter(
+                BackgroundJob.kind.in_(list(self._handlers)),
+                or_(
+                    and_(BackgroundJob.status == "queued", BackgroundJob.run_after <= now),
+                    and_(BackgroundJob.status == "running", BackgroundJob.lease_expires_at < now),
+                ),
+                # Secret-bearing jobs belong to the queue holding the secrets; anyone
+                # else only picks them up once that owner is dead, to fail them
+                or_(
+                    BackgroundJob.needs_secrets.isnot(True),
+                    BackgroundJob.owner_id == self.owner_id,
+                    ~owner_alive,
+                ),
+            ).order_by(BackgroundJob.run_after).first()
+            if candidate is None:
+                return None
+            # Read before commit expires the instance
+            job_id, kind, attempts = candidate.id, candidate.kind, candidate.attempts
+            payload, max_attempts = json.loads(candidate.payload or "{}"), candidate.max_attempts
+            needs_secrets = bool(candidate.needs_secrets)
+
+            # Compare-and-set on the previous state so only one worker wins
+            claimed = db.query(BackgroundJob).filter(
+                BackgroundJob.id == job_id,
+                BackgroundJob.status == candidate.status,
+                BackgroundJob.attempts == attempts,
+            ).update({
+                "status": "running",
+                "attempts": attempts + 1,
+                "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                "updated_at": now,
+            }, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                return None
+            return job_id, kind, payload, attempts + 1, max_attempts, needs_secrets
+        finally:
+            db.close()
+
+    @serialized
+    def _renew_sync(self, job_id: str, attempt: int) -> bool:
+        """Extend the lease of a job this worker still owns; False if it was reclaimed."""
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            renewed = db.query(BackgroundJob).filter(
+                BackgroundJob.id == job_id,
+                BackgroundJob.status == "running",
+                BackgroundJob.attempts == attempt,
+            ).update({
+                "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+            }, synchronize_session=False)
+            db.commit()
+            return bool(renewed)
+        finally:
+            db.close()
+
+    @serialized
+    def _finish_sync(self, job_id: str, attempt: int, status: str, result: Any = None,
+                     error: Optional[str] = None, retry_in: Optional[float] = None) -> bool:
+        """Record the outcome, only if this worker's claim (``attempt``) still owns the job."""
+        db = SessionLocal()
+        try:
+            values = {
+                "status": status,
+                "error": error,
+                "lease_expires_at": None,
+                "updated_at": datetime.utcnow(),
+            }
+            if result is not None:
+                values["result"] = json.dumps(result, default=str)
+            if retry_in is not None:
+                values["run_after"] = datetime.utcnow() + timedelta(seconds=retry_in)
+            finished = db.query(BackgroundJob).filter(
+                BackgroundJob.id == job_id,
+                BackgroundJob.status == "running",
+                BackgroundJob.attempts == attempt,
+            ).update(values, synchronize_session=False)
+            db.commit()
+            if not finished:
+                logger.warning(f"Job {job_id} attempt {attempt} no longer owns the job; result discarded")
+            return bool(finished)
+        finally:
+            db.close()
+
+    async def _run_with_heartbeat(self, job_id: str, attempt: int, coro: Awaitable):
+        """Await ``coro`` while renewing the lease; cancels it and raises LeaseLost if reclaimed."""
+        task = asyncio.ensure_future(coro)
+        lost = False
+
+        async def heartbeat():
+            nonlocal lost
+            interval = max(settings.JOB_LEASE_SECONDS / 3, 1.0)
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    renewed = await asyncio.to_thread(self._renew_sync, job_id, attempt)
+                except Exception as e:
+                    logger.warning(f"Job {job_id} lease renewal failed: {e}")
+                    continue
+                if not renewed:
+                    lost = True
+                    task.cancel()
+                    return
+
+        beat = asyncio.create_task(heartbeat())
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if lost:
+                raise LeaseLost(job_id)
+            raise
+        finally:
+            beat.cancel()
+
+    async def _run_one(self, job_id: str, kind: str, payload: dict, attempt: int, max_attempts: int,
+                       needs_secrets: bool):
+        try:
+            await self._execute(job_id, kind, payload, attempt, max_attempts, needs_secrets)
+        finally:
+            event = self._finished.get(job_id)
+            if event is not None:
+                event.set()
+
+    async def _execute(self, job_id: str, kind: str, payload: dict, attempt: int, max_attempts: int,
+                       needs_secrets: bool):
+        handler = self._handlers[kind]
+        secrets = self._secrets.get(job_id)
+        if needs_secrets and secrets is None:
+            # Never run a user-initiated job with server credentials instead
+            error = "Job secrets are not available in this worker (restarted or orphaned); submit the request again"
+            await asyncio.to_thread(self._finish_sync, job_id, attempt, "failed", None, error)
+            logger.error(f"Job {kind}:{job_id} failed: secrets unavailable")
+            return
+        try:
+            result = await self._run_with_heartbeat(job_id, attempt, handler(payload, secrets or {}))
+            await asyncio.to_thread(self._finish_sync, job_id, attempt, "succeeded", result or {})
+            self._secrets.pop(job_id, None)
+            logger.info(f"Job {kind}:{job_id} succeeded (attempt {attempt})")
+        except LeaseLost:
+            self._secrets.pop(job_id, None)
+            logger.warning(f"Job {kind}:{job_id} lost its lease (attempt {attempt}); abandoned this run")
+        except Exception as e:
+            if attempt < max_attempts:
+                retry_in = min(RETRY_BASE_SECONDS * 2 ** (attempt - 1), RETRY_MAX_SECONDS)
+                await asyncio.to_thread(self._finish_sync, job_id, attempt, "queued", None, str(e), retry_in)
+                logger.warning(f"Job {kind}:{job_id} failed (attempt {attempt}), retrying in {retry_in:.0f}s: {e}")
+            else:
+                await asyncio.to_thread(self._finish_sync, job_id, attempt, "failed", None, str(e))
+                self._secrets.pop(job_id, None)
+                logger.error(f"Job {kind}:{job_id} failed permanently: {e}")
+
+    async def _worker(self, index: int):
+        while self._running:
+            try:
+                claimed = await asyncio.to_thread(self._claim_sync)
+            except Exception as e:
+                logger.error(f"Job worker {index} claim error: {e}")
+                claimed = None
+
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run_one(*claimed)
+
+    async def start(self):
+        """Start the worker pool (call from application startup)."""
+        if self._running:
+            return
+        self._running = True
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self._heartbeat_sync)
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        logger.info(f"[OK] {self.name} started with {self.concurrency} workers")
+
+    async def stop(self):
+        """Stop the worker pool; in-flight jobs are reclaimed after their lease expires."""
+        self._running = False
+        self._wakeup.set()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+            await asyncio.to_thread(self._retire_sync)
+        logger.info(f"[OK] {self.name} stopped")
+
+
+job_queue = JobQueue()
+
+# Agent runs are long and LLM-bound; they get their own bounded pool so they
+# can't starve sync/embedding jobs (each queue only claims its own kinds)
+agent_queue = JobQueue(concurrency=settings.AGENT_WORKER_CONCURRENCY, name="Agent queue")
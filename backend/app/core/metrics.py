@@ -0,0 +1,237 @@
+"""
+Prometheus metrics.
+
+``/metrics`` exposes request latency per route template, in-flight requests,
+WebSocket connections, cache hits/misses, SQLAlchemy and MongoDB pool usage,
+LLM call counts, errors, latency and token usage, and agent node, embedding
+and vector query latency.
+
+Multi-worker uvicorn: set ``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable
+directory before the workers start (wipe it on deploy). Each worker then
+writes its samples there and any worker serving ``/metrics`` aggregates all
+of them; gauges are summed over live workers.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from pymongo import monitoring
+from starlette.routing import Match
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Seconds; fine-grained at the low end for embeds and vector queries
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served",
+    ["method", "route"], multiprocess_mode="livesum",
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections", "Open WebSocket connections",
+    ["route"], multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Redis cache lookups",
+    ["result"],  # hit, miss, error
+)
+SQLALCHEMY_POOL_CONNECTIONS = Gauge(
+    "sqlalchemy_pool_connections", "Open SQLAlchemy DBAPI connections", multiprocess_mode="livesum",
+)
+SQLALCHEMY_POOL_CHECKED_OUT = Gauge(
+    "sqlalchemy_pool_checked_out", "SQLAlchemy connections checked out of the pool", multiprocess_mode="livesum",
+)
+SQLALCHEMY_POOL_CHECKOUTS = Counter(
+    "sqlalchemy_pool_checkouts_total", "SQLAlchemy pool checkouts",
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections", "Open MongoDB connections", ["address"], multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongo_pool_checked_out", "MongoDB connections checked out of the pool", ["address"], multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total", "Failed MongoDB connection checkouts", ["address", "reason"],
+)
+LLM_REQUESTS = Counter(
+    "llm_requests_total", "LLM calls by final outcome", ["model", "status"],
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total", "LLM call errors, including ones that were retried", ["model", "error"],
+)
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds", "LLM call latency (including retries)",
+    ["model", "status"], buckets=LATENCY_BUCKETS,
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds", "LLM time to first token", ["model"], buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens", "Tokens per LLM call", ["model", "kind"], buckets=TOKEN_BUCKETS,
+)
+AGENT_NODE_DURATION = Histogram(
+    "agent_node_duration_seconds", "Agent graph node latency", ["node", "status"], buckets=LATENCY_BUCKETS,
+)
+EMBEDDING_DURATION = Histogram(
+    "embedding_duration_seconds", "Text embedding latency", ["backend"], buckets=LATENCY_BUCKETS,
+)
+VECTOR_QUERY_DURATION = Histogram(
+    "vector_query_duration_seconds", "Vector index query latency", ["index"], buckets=LATENCY_BUCKETS,
+)
+
+
+# ---------------------------------------------------------------------------
+# HTTP / WebSocket
+# ---------------------------------------------------------------------------
+
+def _route_template(scope) -> str:
+    """Route path template (e.g. ``/api/generate/download/{artifact_id}``) to keep labels low-cardinality."""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency, in-flight requests and open WebSockets."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            gauge = WEBSOCKET_CONNECTIONS.labels(_route_template(scope))
+            gauge.inc()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                gauge.dec()
+            return
+        if scope["type"] != "http" or scope.get("path") == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(time.perf_counter() - start)
+
+
+# ---------------------------------------------------------------------------
+# Connection pools
+# ---------------------------------------------------------------------------
+
+def instrument_engine(engine):
+    """Track SQLAlchemy pool usage through pool events."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        SQLALCHEMY_POOL_CONNECTIONS.inc()
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        SQLALCHEMY_POOL_CONNECTIONS.dec()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        SQLALCHEMY_POOL_CHECKED_OUT.inc()
+        SQLALCHEMY_POOL_CHECKOUTS.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        SQLALCHEMY_POOL_CHECKED_OUT.dec()
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Pass to ``AsyncIOMotorClient(event_listeners=[...])`` to track pool usage."""
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(self._address(event), str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).dec()
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+
+def render_metrics():
+    """``(body, content_type)`` for ``/metrics``, aggregated across workers in multiprocess mode."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead():
+    """Drop this worker's live gauges from the shared directory (call on shutdown)."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,13 +1,53 @@
 """OAuth integration for Google and GitHub authentication."""
+import asyncio
 import httpx
 import json
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlencode
+import jwt
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared connection pool for all OAuth provider calls. Logins come in bursts,
+# so keep connections to the providers warm instead of handshaking per call.
+OAUTH_POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=120.0,
+)
+# Fail fast on connect/pool waits; providers normally answer well within read timeout
+OAUTH_TIMEOUT = httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=2.0)
+
+DISCOVERY_TTL_SECONDS = 24 * 3600
+
+_oauth_client: Optional[httpx.AsyncClient] = None
+
+
+def get_oauth_http_client() -> httpx.AsyncClient:
+    """Get or create the shared OAuth HTTP client."""
+    global _oauth_client
+    if _oauth_client is None or _oauth_client.is_closed:
+        _oauth_client = httpx.AsyncClient(limits=OAUTH_POOL_LIMITS, timeout=OAUTH_TIMEOUT)
+    return _oauth_client
+
+
+async def init_oauth_http_client():
+    """Create the shared OAuth client (call from application startup)."""
+    get_oauth_http_client()
+    logger.info("[OK] OAuth HTTP client pool ready")
+
+
+async def close_oauth_http_client():
+    """Close the shared OAuth client (call from application shutdown)."""
+    global _oauth_client
+    if _oauth_client is not None and not _oauth_client.is_closed:
+        await _oauth_client.aclose()
+        logger.info("OAuth HTTP client closed")
+    _oauth_client = None
+
 
 class GoogleOAuthClient:
     """Google OAuth 2.0 client for authentication."""
@@ -15,6 +55,31 @@ class GoogleOAuthClient:
     OAUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
     TOKEN_URL = "https://oauth2.googleapis.com/token"
     USER_INFO_URL = "https://openidconnect.googleapis.com/v1/userinfo"
+    DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+    
+    _discovery: Optional[Dict[str, Any]] = None
+    _discovery_expires_at: float = 0.0
+    
+    @staticmethod
+    async def get_discovery() -> Dict[str, Any]:
+        """Get the OpenID discovery document (cached; falls back to static endpoints)."""
+        if GoogleOAuthClient._discovery and time.time() < GoogleOAuthClient._discovery_expires_at:
+            return GoogleOAuthClient._discovery
+        
+        try:
+            response = await get_oauth_http_client().get(GoogleOAuthClient.DISCOVERY_URL)
+            response.raise_for_status()
+            GoogleOAuthClient._discovery = response.json()
+            GoogleOAuthClient._discovery_expires_at = time.time() + DISCOVERY_TTL_SECONDS
+        except Exception as e:
+            logger.warning(f"Google discovery fetch failed, using static endpoints: {e}")
+            if not GoogleOAuthClient._discovery:
+                return {
+                    "authorization_endpoint": GoogleOAuthClient.OAUTH_URL,
+                    "token_endpoint": GoogleOAuthClient.TOKEN_URL,
+                    "userinfo_endpoint": GoogleOAuthClient.USER_INFO_URL,
+                }
+        return GoogleOAuthClient._discovery
     
     @staticmethod
     def get_authorization_url(redirect_uri: str) -> str:
@@ -33,37 +98,77 @@ class GoogleOAuthClient:
     async def get_access_token(code: str, redirect_uri: str) -> Optional[Dict[str, Any]]:
         """Exchange authorization code for access token."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    GoogleOAuthClient.TOKEN_URL,
-                    data={
-                        "client_id": settings.GOOGLE_CLIENT_ID,
-                        "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                        "code": code,
-                        "grant_type": "authorization_code",
-                        "redirect_uri": redirect_uri
-                    }
-                )
-                response.raise_for_status()
-                return response.json()
+            discovery = await GoogleOAuthClient.get_discovery()
+            response = await get_oauth_http_client().post(
+                discovery.get("token_endpoint", GoogleOAuthClient.TOKEN_URL),
+                data={
+                    "client_id": settings.GOOGLE_CLIENT_ID,
+                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                    "code": code,
+                    "grant_type": "authorization_code",
+                    "redirect_uri": redirect_uri
+                }
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Failed to get Google access token: {e}")
             return None
     
+    @staticmethod
+    def get_user_info_from_id_token(token_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Read user claims from the ID token returned by the token endpoint.
+        
+        The ID token came straight from Google's token endpoint over TLS, so per
+        OpenID Connect Core 3.1.3.7 its signature need not be re-verified here.
+        This saves the separate userinfo round trip.
+        """
+        id_token = token_data.get("id_token")
+        if not id_token:
+            return None
+        try:
+            claims = jwt.decode(id_token, options={"verify_signature": False})
+        except jwt.InvalidTokenError as e:
+            logger.warning(f"Unreadable Google ID token: {e}")
+            return None
+        if claims.get("aud") != settings.GOOGLE_CLIENT_ID or not claims.get("email"):
+            return None
+        return {
+            "sub": claims.get("sub"),
+            "email": claims.get("email"),
+            "email_verified": claims.get("email_verified"),
+            "name": claims.get("name"),
+            "picture": claims.get("picture"),
+        }
+    
     @staticmethod
     async def get_user_info(access_token: str) -> Optional[Dict[str, Any]]:
         """Get user info from Google using access token."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    GoogleOAuthClient.USER_INFO_URL,
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-                response.raise_for_status()
-                return response.json()
+            discovery = await GoogleOAuthClient.get_discovery()
+            response = await get_oauth_http_client().get(
+                discovery.get("userinfo_endpoint", GoogleOAuthClient.USER_INFO_URL),
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Failed to get Google user info: {e}")
             return None
+    
+    @staticmethod
+    async def exchange_and_fetch_user(
+        code: str, redirect_uri: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Exchange the code and resolve the user, skipping userinfo when the ID token suffices."""
+        token_data = await GoogleOAuthClient.get_access_token(code, redirect_uri)
+        if not token_data:
+            return None, None
+        user_info = GoogleOAuthClient.get_user_info_from_id_token(token_data)
+        if user_info is None:
+            user_info = await GoogleOAuthClient.get_user_info(token_data.get("access_token"))
+        return token_data, user_info
 
 
 class GitHubOAuthClient:
@@ -85,21 +190,23 @@ class GitHubOAuthClient:
         return f"{GitHubOAuthClient.OAUTH_URL}?{urlencode(params)}"
     
     @staticmethod
-    async def get_access_token(code: str) -> Optional[Dict[str, Any]]:
+    async def get_access_token(code: str, redirect_uri: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Exchange authorization code for access token."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    GitHubOAuthClient.TOKEN_URL,
-                    data={
-                        "client_id": settings.GITHUB_CLIENT_ID,
-                        "client_secret": settings.GITHUB_CLIENT_SECRET,
-                        "code": code
-                    },
-                    headers={"Accept": "application/json"}
-                )
-                response.raise_for_status()
-                return response.json()
+            data = {
+                "client_id": settings.GITHUB_CLIENT_ID,
+                "client_secret": settings.GITHUB_CLIENT_SECRET,
+                "code": code
+            }
+            if redirect_uri:
+                data["redirect_uri"] = redirect_uri
+            response = await get_oauth_http_client().post(
+                GitHubOAuthClient.TOKEN_URL,
+                data=data,
+                headers={"Accept": "application/json"}
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Failed to get GitHub access token: {e}")
             return None
@@ -107,34 +214,44 @@ class GitHubOAuthClient:
     @staticmethod
     async def get_user_info(access_token: str) -> Optional[Dict[str, Any]]:
         """Get user info from GitHub using access token."""
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        client = get_oauth_http_client()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    GitHubOAuthClient.USER_INFO_URL,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Accept": "application/vnd.github.v3+json"
-                    }
-                )
-                response.raise_for_status()
-                user_data = response.json()
-                
-                # Get primary email if not public
-                if not user_data.get("email"):
-                    email_response = await client.get(
-                        f"{GitHubOAuthClient.USER_INFO_URL}/emails",
-                        headers={
-                            "Authorization": f"Bearer {access_token}",
-                            "Accept": "application/vnd.github.v3+json"
-                        }
-                    )
-                    if email_response.status_code == 200:
-                        emails = email_response.json()
-                        primary = next((e for e in emails if e.get("primary")), None)
-                        if primary:
-                            user_data["email"] = primary.get("email")
-                
-                return user_data
+            # Fetch the profile and the email list concurrently; the email list is
+            # only used when the profile has no public email.
+            response, email_response = await asyncio.gather(
+                client.get(GitHubOAuthClient.USER_INFO_URL, headers=headers),
+                client.get(f"{GitHubOAuthClient.USER_INFO_URL}/emails", headers=headers),
+                return_exceptions=True
+            )
+            if isinstance(response, Exception):
+                raise response
+            response.raise_for_status()
+            user_data = response.json()
+            
+            # Get primary email if not public
+            if not user_data.get("email") and not isinstance(email_response, Exception):
+                if email_response.status_code == 200:
+                    emails = email_response.json()
+                    primary = next((e for e in emails if e.get("primary")), None)
+                    if primary:
+                        user_data["email"] = primary.get("email")
+            
+            return user_data
         except Exception as e:
             logger.error(f"Failed to get GitHub user info: {e}")
             return None
+    
+    @staticmethod
+    async def exchange_and_fetch_user(
+        code: str, redirect_uri: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Exchange the code, then fetch profile and emails in one concurrent step."""
+        token_data = await GitHubOAuthClient.get_access_token(code, redirect_uri)
+        if not token_data or not token_data.get("access_token"):
+            return token_data, None
+        user_info = await GitHubOAuthClient.get_user_info(token_data["access_token"])
+        return token_data, user_info
@@ -0,0 +1,242 @@
+"""
+Distributed GCRA rate limiting.
+
+The generic cell rate algorithm (GCRA) stores a single "theoretical arrival
+time" (TAT) per key. Unlike a fixed window it has no boundary at which a client
+can burst to twice the limit. In Redis the whole check-and-update runs as one
+Lua script, so every uvicorn worker shares the same budget and a limit of
+``100/minute`` stays ``100/minute`` whatever the worker count.
+
+To keep Redis off the hot path, each worker pre-fetches a small batch of tokens
+per key in the same script call and spends them locally. Unused tokens expire
+after ``PREFETCH_TTL_SECONDS``, so pre-fetching can only make a limit stricter,
+never looser.
+
+Enable with ``RATE_LIMIT_STRATEGY=gcra``. ``RATE_LIMIT_STORAGE`` selects the
+backend: ``redis://...`` for the shared limiter, ``memory://`` for per-process.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import jwt
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from slowapi.util import get_remote_address
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_FRACTION = 0.05  # Reserve up to 5% of a limit per Redis round trip
+PREFETCH_MAX = 20
+PREFETCH_TTL_SECONDS = 1.0
+SWEEP_INTERVAL_SECONDS = 10.0  # How often idle per-key state is pruned from memory
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Probe and scrape endpoints: kubelet/Prometheus hit these from one IP, and a 429
+# there would mark the pod unready
+EXEMPT_PATHS = frozenset({"/metrics", "/api/health", "/api/ready"})
+
+# KEYS[1] = TAT key
+# ARGV = emission interval (ms), burst tolerance (ms), now (ms), requested tokens
+# Returns {granted, retry_after_ms, remaining}
+GCRA_LUA = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+
+local available = math.floor((now + tolerance - tat) / interval)
+if available <= 0 then
+  return {0, tat - tolerance + interval - now, 0}
+end
+
+local granted = math.min(requested, available)
+local new_tat = tat + granted * interval
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {granted, 0, available - granted}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A parsed limit such as ``100/minute``."""
+    amount: int
+    period_seconds: int
+
+    @property
+    def interval_ms(self) -> float:
+        """Time between tokens."""
+        return self.period_seconds * 1000.0 / self.amount
+
+    @property
+    def tolerance_ms(self) -> float:
+        """Burst tolerance: the full limit may be spent at once."""
+        return self.period_seconds * 1000.0
+
+    @property
+    def prefetch(self) -> int:
+        return max(1, min(PREFETCH_MAX, int(self.amount * PREFETCH_FRACTION)))
+
+
+def parse_limit(value: str) -> RateLimit:
+    """Parse ``"100/minute"``, ``"100 per minute"`` or ``"10/2 seconds"``-style strings."""
+    match = re.match(r"^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$", value.lower())
+    if not match:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    amount, multiplier, unit = match.groups()
+    return RateLimit(int(amount), int(multiplier or 1) * _PERIODS[unit])
+
+
+class MemoryGCRABackend:
+    """In-process GCRA (per worker); used for ``memory://`` storage and as a fallback."""
+
+    def __init__(self):
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def _sweep(self, now: float):
+        """Drop keys whose TAT has passed: they are indistinguishable from unseen keys."""
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS * 1000.0
+
+    async def acquire(self, key: str, limit: RateLimit, requested: int) -> Tuple[int, float]:
+        now = time.time() * 1000.0
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            tat = max(self._tats.get(key, now), now)
+            available = math.floor((now + limit.tolerance_ms - tat) / limit.interval_ms)
+            if available <= 0:
+                return 0, tat - limit.tolerance_ms + limit.interval_ms - now
+            granted = min(requested, available)
+            self._tats[key] = tat + granted * limit.interval_ms
+            return granted, 0.0
+
+
+class RedisGCRABackend:
+    """Shared GCRA state in Redis, updated atomically by a Lua script."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(GCRA_LUA)
+
+    async def acquire(self, key: str, limit: RateLimit, requested: int) -> Tuple[int, float]:
+        granted, retry_after_ms, _ = await self._script(
+            keys=[key],
+            args=[limit.interval_ms, limit.tolerance_ms, int(time.time() * 1000), requested],
+        )
+        return int(granted), float(retry_after_ms)
+
+    async def close(self):
+        await self._redis.close()
+
+
+class GCRARateLimiter:
+    """GCRA limiter with local token pre-fetching on top of a shared backend."""
+
+    def __init__(self, storage_uri: str = settings.RATE_LIMIT_STORAGE):
+        self._fallback = MemoryGCRABackend()
+        if storage_uri.startswith(("redis://", "rediss://")):
+            self.backend = RedisGCRABackend(storage_uri)
+        else:
+            self.backend = self._fallback
+        # key -> (tokens left, expires at)
+        self._local: Dict[str, Tuple[int, float]] = {}
+        self._next_sweep = 0.0
+
+    def _sweep(self, now: float):
+        """Drop expired pre-fetched batches (unbounded otherwise when many IPs hit us)."""
+        self._local = {key: entry for key, entry in self._local.items() if entry[1] > now}
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+
+    async def hit(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        """Consume one token; returns ``(allowed, retry_after_seconds)``."""
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+        tokens, expires_at = self._local.get(key, (0, 0.0))
+        if tokens > 0 and now < expires_at:
+            self._local[key] = (tokens - 1, expires_at)
+            return True, 0.0
+
+        try:
+            granted, retry_after_ms = await self.backend.acquire(key, limit, limit.prefetch)
+        except Exception as e:
+            logger.warning(f"Rate limit backend unavailable, using local limiter: {e}")
+            granted, retry_after_ms = await self._fallback.acquire(key, limit, limit.prefetch)
+
+        if granted <= 0:
+            self._local.pop(key, None)
+            return False, retry_after_ms / 1000.0
+        self._local[key] = (granted - 1, now + PREFETCH_TTL_SECONDS)
+        return True, 0.0
+
+
+def _user_id_from_request(request: Request) -> Optional[str]:
+    """Best-effort user id from a Bearer token or ``?token=`` (no DB lookup)."""
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header[7:] if auth_header.lower().startswith("bearer ") else request.query_params.get("token")
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.JWT_ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get("sub")
+
+
+def create_rate_limit_middleware(
+    limiter: Optional[GCRARateLimiter] = None,
+    ip_limit: str = settings.RATE_LIMIT_DEFAULT,
+    user_limit: str = settings.RATE_LIMIT_USER,
+    exempt_paths: frozenset = EXEMPT_PATHS,
+) -> Callable:
+    """Build an HTTP middleware enforcing per-IP and per-user GCRA limits (except on ``exempt_paths``)."""
+    limiter = limiter or GCRARateLimiter()
+    ip_rate = parse_limit(ip_limit)
+    user_rate = parse_limit(user_limit)
+
+    async def rate_limit_middleware(request: Request, call_next: Callable):
+        if request.method == "OPTIONS" or request.url.path in exempt_paths:
+            return await call_next(request)
+
+        checks = [(f"rl:ip:{get_remote_address(request)}", ip_rate)]
+        user_id = _user_id_from_request(request)
+        if user_id:
+            checks.append((f"rl:user:{user_id}", user_rate))
+
+        for key, rate in checks:
+            allowed, retry_after = await limiter.hit(key, rate)
+            if not allowed:
+                retry_seconds = max(1, math.ceil(retry_after))
+                logger.warning(f"Rate limit exceeded for {key}")
+                return JSONResponse(
+                    status_code=429,
+                    content={
+                        "error": "Too Many Requests",
+                        "detail": "Rate limit exceeded. Please try again later.",
+                        "retry_after": retry_seconds,
+                    },
+                    headers={
+                        "Retry-After": str(retry_seconds),
+                        "RateLimit-Limit": str(rate.amount),
+                        "RateLimit-Remaining": "0",
+                        "RateLimit-Reset": str(retry_seconds),
+                    },
+                )
+
+        return await call_next(request)
+
+    return rate_limit_middleware
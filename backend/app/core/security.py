@@ -39,12 +39,18 @@ class SecurityLimiter:
     """
     
     def __init__(self):
+        # GCRA is enforced globally by app.core.rate_limit; per-endpoint
+        # decorators then use SlowAPI's sliding window on the same storage.
+        strategy = settings.RATE_LIMIT_STRATEGY
+        if strategy == "gcra":
+            strategy = "moving-window"
+        
         # Key function uses IP address for public endpoints
         self._limiter = Limiter(
             key_func=get_remote_address,
             default_limits=settings.RATE_LIMIT_DEFAULT,
             storage_uri=settings.RATE_LIMIT_STORAGE,
-            strategy=settings.RATE_LIMIT_STRATEGY,
+            strategy=strategy,
         )
     
     @property
@@ -52,6 +58,11 @@ class SecurityLimiter:
         """Get the SlowAPI limiter instance."""
         return self._limiter
     
+    @property
+    def distributed(self) -> bool:
+        """Whether the global GCRA middleware should be installed."""
+        return settings.RATE_LIMIT_STRATEGY == "gcra"
+    
     def get_middleware(self) -> SlowAPIMiddleware:
         """Get rate limiting middleware for FastAPI."""
         return SlowAPIMiddleware()
@@ -0,0 +1,131 @@
+"""
+Single-flight coalescing of identical in-flight work.
+
+Concurrent calls with the same key share one execution:
+
+* within a worker, followers await the leader's asyncio task
+* across workers (when Redis is initialized), the leader holds a Redis lock
+  (``SET NX PX``) and publishes the result on a per-key channel; followers in
+  other workers subscribe and wait for it. If the leader dies, the lock expires
+  and a follower runs the work itself.
+
+Results crossing workers must be JSON-serializable.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.core import cache
+
+logger = logging.getLogger(__name__)
+
+# Delete the lock only if we still own it
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_NO_RESULT = object()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls per key, in-process and across workers via Redis."""
+
+    def __init__(self, namespace: str, lock_ttl_seconds: float = 120.0):
+        self.namespace = namespace
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run ``fn`` once per key at a time; returns ``(result, shared)``.
+
+        ``shared`` is True when the result came from another caller's execution.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            result, _ = await asyncio.shield(task)
+            return result, True
+
+        task = asyncio.ensure_future(self._run_distributed(key, fn))
+        self._inflight[key] = task
+        try:
+            result, shared = await asyncio.shield(task)
+            return result, shared
+        finally:
+            if task.done():
+                self._inflight.pop(key, None)
+            else:
+                task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+
+    async def _run_distributed(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        redis_client = cache.redis_client
+        if redis_client is None:
+            return await fn(), False
+
+        lock_key = f"{self.namespace}:lock:{key}"
+        channel = f"{self.namespace}:done:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(lock_key, token, nx=True, px=int(self.lock_ttl_seconds * 1000))
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable, running locally: {e}")
+            return await fn(), False
+
+        if acquired:
+            return await self._lead(redis_client, lock_key, channel, token, fn), False
+
+        result = await self._follow(redis_client, lock_key, channel)
+        if result is not _NO_RESULT:
+            return result, True
+        logger.warning(f"Single-flight leader for {key} vanished; running locally")
+        return await fn(), False
+
+    async def _lead(self, redis_client, lock_key: str, channel: str, token: str, fn) -> Any:
+        try:
+            result = await fn()
+            try:
+                await redis_client.publish(channel, json.dumps({"ok": True, "result": result}, default=str))
+            except Exception as e:
+                logger.warning(f"Single-flight publish failed: {e}")
+            return result
+        except Exception as e:
+            try:
+                await redis_client.publish(channel, json.dumps({"ok": False, "error": str(e)}))
+            except Exception:
+                pass
+            raise
+        finally:
+            try:
+                await redis_client.eval(_RELEASE_LUA, 1, lock_key, token)
+            except Exception as e:
+                logger.warning(f"Single-flight lock release failed: {e}")
+
+    async def _follow(self, redis_client, lock_key: str, channel: str) -> Any:
+        """Wait for the leader's result; ``_NO_RESULT`` if the leader failed or disappeared."""
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            deadline = asyncio.get_running_loop().time() + self.lock_ttl_seconds
+            while asyncio.get_running_loop().time() < deadline:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    # Subscribed after the publish, or the leader crashed: check the lock
+                    if not await redis_client.exists(lock_key):
+                        return _NO_RESULT
+                    continue
+                payload = json.loads(message["data"])
+                return payload["result"] if payload.get("ok") else _NO_RESULT
+            return _NO_RESULT
+        except Exception as e:
+            logger.warning(f"Single-flight follow failed: {e}")
+            return _NO_RESULT
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.close()
+            except Exception:
+                pass
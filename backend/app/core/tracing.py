@@ -0,0 +1,244 @@
+"""
+Lightweight tracing.
+
+Spans follow the OpenTelemetry data model (trace/span ids, parent links,
+attributes, status) and are exported as OTLP/JSON, so the output can be read
+by any OTLP collector or replayed offline:
+
+* ``console`` – one OTLP/JSON document per batch on stdout
+* ``file``    – OTLP/JSON lines appended to ``TRACING_FILE``
+* ``otlp``    – POSTed to ``{TRACING_OTLP_ENDPOINT}/v1/traces``
+
+Finished spans are buffered and flushed by a daemon thread, so exporting
+never blocks a request. ``traced_node`` also records node latency in the
+``agent_node_duration_seconds`` Prometheus histogram (``app.core.metrics``)
+regardless of the exporter.
+
+Usage::
+
+    with start_span("vector.query", top_k=10) as span:
+        ...
+        span.set_attribute("vector.matches", len(results))
+
+    @traced_node("match_hackathons")
+    async def match_hackathons_node(state): ...
+"""
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import AGENT_NODE_DURATION
+
+logger = logging.getLogger(__name__)
+
+EXPORT_INTERVAL_SECONDS = 5.0
+MAX_QUEUED_SPANS = 10_000
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+def _random_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+class Span:
+    """One timed operation; ids and timestamps follow the OTel data model."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else _random_id(16)
+        self.span_id = _random_id(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes)
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error or ""} if self.status == "error" else {"code": 1},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time a block as a child of the current span (works in sync and async code)."""
+    span = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.error = f"{e.__class__.__name__}: {e}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        span_processor.on_end(span)
+
+
+def traced_node(node_name: str):
+    """Wrap an async LangGraph node in an ``agent.node`` span and record its latency."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(state, *args, **kwargs):
+            with start_span(f"agent.node.{node_name}", **{"agent.node": node_name}) as span:
+                try:
+                    return await func(state, *args, **kwargs)
+                finally:
+                    AGENT_NODE_DURATION.labels(node_name, span.status).observe(span.duration)
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _otlp_document(spans: List[Span]) -> Dict[str, Any]:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                _otlp_attribute("service.name", settings.TRACING_SERVICE_NAME),
+                _otlp_attribute("service.version", settings.VERSION),
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "app.core.tracing"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]
+    }
+
+
+class ConsoleSpanExporter:
+    def export(self, spans: List[Span]):
+        sys.stdout.write(json.dumps(_otlp_document(spans)) + "\n")
+        sys.stdout.flush()
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON document per batch (JSON lines)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(_otlp_document(spans)) + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """OTLP/HTTP with JSON encoding (no protobuf dependency)."""
+
+    def __init__(self, endpoint: str):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+
+    def export(self, spans: List[Span]):
+        import httpx
+        response = httpx.post(self.url, json=_otlp_document(spans), timeout=10.0)
+        response.raise_for_status()
+
+
+class BatchSpanProcessor:
+    """Buffers finished spans and hands them to the exporter from a daemon thread."""
+
+    def __init__(self, exporter=None, interval: float = EXPORT_INTERVAL_SECONDS):
+        self.exporter = exporter
+        self.interval = interval
+        self._queue: deque = deque(maxlen=MAX_QUEUED_SPANS)
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._export_lock = threading.Lock()
+
+    def on_end(self, span: Span):
+        if self.exporter is None:
+            return
+        self._queue.append(span)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self._export_lock:
+            spans = []
+            while self._queue:
+                spans.append(self._queue.popleft())
+            if not spans:
+                return
+            try:
+                self.exporter.export(spans)
+            except Exception as e:
+                logger.warning(f"Span export failed ({len(spans)} spans dropped): {e}")
+
+
+def _build_exporter():
+    kind = settings.TRACING_EXPORTER.lower()
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "file":
+        return FileSpanExporter(settings.TRACING_FILE)
+    if kind == "otlp":
+        return OTLPHttpSpanExporter(settings.TRACING_OTLP_ENDPOINT)
+    return None
+
+
+span_processor = BatchSpanProcessor(_build_exporter())
+atexit.register(span_processor.flush)
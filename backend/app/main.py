@@ -1,7 +1,9 @@
 """FastAPI application entry point with production-grade security."""
+import asyncio
 import logging
 from datetime import datetime
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
@@ -10,12 +12,14 @@ from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
 from app.core.db import init_db
+from app.core.health import check_database, check_readiness
+from app.core.metrics import MetricsMiddleware, mark_worker_dead, render_metrics
 from app.core.security import (
     get_limiter,
     CORSConfig,
     add_security_headers,
 )
-from app.api import auth_db, generate, matching, password_reset, router, websocket
+from app.api import auth_db, generate, jobs, matches, matching, password_reset, profile, router, websocket
 
 # Configure logging
 logging.basicConfig(
@@ -51,6 +55,27 @@ async def lifespan(app: FastAPI):
         except Exception as cleanup_err:
             logger.warning(f"[WARN] Token cleanup failed: {cleanup_err}")
         
+        # Warm the shared OAuth connection pool
+        from app.core.oauth import init_oauth_http_client
+        await init_oauth_http_client()
+        
+        # Connect MongoDB (profiles, matches, GitHub sync) without blocking startup
+        from app.core.database import init_db_optional
+        app.state.mongo_init = asyncio.create_task(init_db_optional())
+        
+        # Start background job workers
+        from app.core.jobs import agent_queue, job_queue
+        await job_queue.start()
+        await agent_queue.start()
+        
+        # Load heavy agent dependencies off the startup path
+        if settings.AGENT_WARMUP:
+            from app.agents import warm_up_agent
+            app.state.agent_warmup = asyncio.create_task(warm_up_agent())
+        if settings.MODEL_WARMUP:
+            from app.utils.vectorizer import warm_up_vector_engine
+            app.state.model_warmup = asyncio.create_task(warm_up_vector_engine())
+        
     except Exception as e:
         logger.error(f"[ERROR] Startup error: {e}")
         raise
@@ -59,6 +84,16 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("[SHUTDOWN] Shutting down HackQuest AI Backend...")
+    from app.core.jobs import agent_queue, job_queue
+    await job_queue.stop()
+    await agent_queue.stop()
+    from app.utils.github_client import close_http_client
+    await close_http_client()
+    from app.core.oauth import close_oauth_http_client
+    await close_oauth_http_client()
+    from app.core.database import close_db
+    await close_db()
+    mark_worker_dead()
     logger.info("[OK] Shutdown complete")
 
 
@@ -87,6 +122,9 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 limiter = get_limiter()
 app.state.limiter = limiter.limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+if limiter.distributed:
+    from app.core.rate_limit import create_rate_limit_middleware
+    app.middleware("http")(create_rate_limit_middleware())
 
 # 4. CORS (should be near outermost for security)
 if settings.DEBUG:
@@ -111,6 +149,9 @@ else:
         **cors_config
     )
 
+# 5. Metrics (outermost, so latency covers every other middleware)
+app.add_middleware(MetricsMiddleware)
+
 logger.info(f"Security configuration loaded for environment: {settings.environment}")
 logger.info(f"Rate limiting: {settings.RATE_LIMIT_DEFAULT}")
 logger.info(f"CORS origins: {cors_config['allow_origins']}")
@@ -118,8 +159,11 @@ logger.info(f"CORS origins: {cors_config['allow_origins']}")
 # Include routers
 app.include_router(auth_db.router)
 app.include_router(generate.router)
+app.include_router(jobs.router)
+app.include_router(matches.router)
 app.include_router(matching.router)
 app.include_router(password_reset.router)
+app.include_router(profile.router)
 app.include_router(router.router)  # Agent router
 app.include_router(websocket.router)  # WebSocket router
 
@@ -138,13 +182,36 @@ async def root():
 @app.get("/api/health")
 async def api_health():
     """Detailed health check"""
+    database = await check_database()
     return {
         "status": "operational",
-        "database": "connected",
+        "database": "connected" if database["status"] == "ready" else "disconnected",
+        "database_latency_ms": database["latency_ms"],
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (aggregated across workers in multiprocess mode)"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/api/ready")
+async def api_ready():
+    """Readiness probe: 200 only when required subsystems are warm"""
+    ready, subsystems = await check_readiness()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "subsystems": subsystems,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     
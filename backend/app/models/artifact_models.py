@@ -0,0 +1,17 @@
+"""Generated artifact database models."""
+from sqlalchemy import Column, String, DateTime, Integer
+from app.models.database import Base
+from datetime import datetime
+
+
+class GeneratedArtifact(Base):
+    """Maps a generation's normalized inputs to the artifact it produced (see app.core.artifacts)."""
+    __tablename__ = "generated_artifacts"
+
+    input_key = Column(String(64), primary_key=True)  # SHA-256 of the normalized generation inputs
+    kind = Column(String(50), nullable=False)
+    artifact_id = Column(String(64), nullable=False, index=True)  # SHA-256 of the stored content
+    size = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
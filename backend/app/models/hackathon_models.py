@@ -13,6 +13,7 @@ class Hackathon(Base):
     description = Column(Text, nullable=True)
     platform = Column(String(50), nullable=False)
     url = Column(String(500), nullable=True)
+    platform_id = Column(String(255), nullable=True, unique=True, index=True)  # Source platform's id; bulk upsert key
     difficulty = Column(String(50), default="intermediate")
     required_skills = Column(String(2000), default="[]")  # JSON
     prize_pool = Column(String(255), nullable=True)
@@ -23,6 +24,16 @@ class Hackathon(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class HackathonEmbedding(Base):
+    """Content hash of each SQLite hackathon's indexed vector (the vector itself lives in the vector index)."""
+    __tablename__ = "hackathon_embeddings"
+
+    owner_id = Column(String(36), primary_key=True)  # Hackathon.id
+    content_hash = Column(String(64), nullable=True)  # None: vector index upsert failed, retry next run
+    model = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class HackathonMatch(Base):
     """User-Hackathon match scores."""
     __tablename__ = "hackathon_matches"
@@ -35,6 +46,7 @@ class HackathonMatch(Base):
     difficulty_match = Column(Float, default=0.0)
     reasoning = Column(Text, nullable=True)
     is_applied = Column(Boolean, default=False)
+    artifact_id = Column(String(64), nullable=True)  # Generated boilerplate (content hash)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
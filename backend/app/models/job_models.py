@@ -0,0 +1,43 @@
+"""Background job database models."""
+from sqlalchemy import Boolean, Column, String, DateTime, Index, Integer, Text
+from app.models.database import Base
+from datetime import datetime
+
+
+class BackgroundJob(Base):
+    """Persistent background job (see app.core.jobs)."""
+    __tablename__ = "background_jobs"
+
+    id = Column(String(36), primary_key=True)
+    kind = Column(String(50), nullable=False, index=True)
+    dedup_key = Column(String(255), nullable=True, index=True)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    payload = Column(Text, default="{}")  # JSON
+    result = Column(Text, nullable=True)  # JSON
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    run_after = Column(DateTime, default=datetime.utcnow, index=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    # Secrets live only in the enqueuing process's memory; see JobQueue.enqueue
+    needs_secrets = Column(Boolean, nullable=True, default=False)
+    # JobWorker.id of the queue holding the secrets
+    owner_id = Column(String(36), nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # At most one active job per dedup_key, even when two processes enqueue at once
+        Index(
+            "uq_background_jobs_active_dedup", "dedup_key", unique=True,
+            sqlite_where=status.in_(("queued", "running")),
+        ),
+    )
+
+
+class JobWorker(Base):
+    """Liveness of a JobQueue instance; its secret-bearing jobs are orphaned once the heartbeat stops."""
+    __tablename__ = "job_workers"
+
+    id = Column(String(36), primary_key=True)
+    heartbeat_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -345,6 +345,7 @@ class Submission(SubmissionBase):
     status: SubmissionStatusEnum
     judge_feedback: Optional[JudgingFeedback] = None
     score: Optional[float] = None
+    artifact_id: Optional[str] = None  # Generated boilerplate (content hash)
     created_at: datetime
     updated_at: datetime
 
@@ -429,10 +430,15 @@ class PasswordResetConfirm(BaseModel):
 
 class CodeGenerationRequest(BaseModel):
     """Code generation request"""
-    prompt: str
+    prompt: str = ""
     language: str = "python"
     framework: Optional[str] = None
     requirements: Optional[List[str]] = None
+    # Boilerplate generation (/api/generate/boilerplate)
+    user_id: Optional[str] = None
+    problem_statement: Optional[str] = None
+    skills: Optional[List[str]] = None
+    hackathon_id: Optional[str] = None  # Links the stored artifact to the user's match and submissions
 
 
 class CodeGenerationResponse(BaseModel):
@@ -440,6 +446,7 @@ class CodeGenerationResponse(BaseModel):
     code: str
     language: str
     explanation: Optional[str] = None
+    files: Dict[str, str] = {}  # Full project scaffold (path -> content)
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -487,6 +494,7 @@ class AgentQueryRequest(BaseModel):
     user_id: str
     skills: Optional[List[str]] = []
     github_summary: Optional[str] = None
+    github_username: Optional[str] = None
     experience_level: Optional[str] = "intermediate"
 
 
@@ -0,0 +1,42 @@
+"""$project_name API.
+
+Problem: $prompt
+Stack: $skills
+"""
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
+
+app = FastAPI(title="$project_name")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+class Item(BaseModel):
+    title: str
+    description: str = ""
+
+
+items: list[Item] = []
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
+
+
+@app.get("/api/items")
+async def list_items():
+    return items
+
+
+@app.post("/api/items")
+async def create_item(item: Item):
+    # TODO: replace the in-memory list with your data model
+    items.append(item)
+    return item
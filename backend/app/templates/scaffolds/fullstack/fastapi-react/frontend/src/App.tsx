@@ -0,0 +1,40 @@
+// $project_name
+// Problem: $prompt
+import { useEffect, useState } from 'react';
+
+interface Item {
+  title: string;
+  description: string;
+}
+
+const API_URL = import.meta.env.VITE_API_URL ?? 'http://localhost:8000';
+
+export default function App() {
+  const [items, setItems] = useState<Item[]>([]);
+  const [title, setTitle] = useState('');
+
+  useEffect(() => {
+    fetch(`${API_URL}/api/items`).then((r) => r.json()).then(setItems);
+  }, []);
+
+  const addItem = async () => {
+    const response = await fetch(`${API_URL}/api/items`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ title, description: '' }),
+    });
+    setItems([...items, await response.json()]);
+    setTitle('');
+  };
+
+  return (
+    <main>
+      <h1>$project_name</h1>
+      <input value={title} onChange={(e) => setTitle(e.target.value)} />
+      <button onClick={addItem} disabled={!title}>Add</button>
+      <ul>
+        {items.map((item, i) => <li key={i}>{item.title}</li>)}
+      </ul>
+    </main>
+  );
+}
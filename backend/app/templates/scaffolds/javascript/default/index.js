@@ -0,0 +1,8 @@
+// Generated JavaScript code
+// Prompt: $prompt
+
+function main() {
+  // Your implementation here
+}
+
+main();
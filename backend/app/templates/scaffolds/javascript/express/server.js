@@ -0,0 +1,14 @@
+// Generated Express server
+const express = require('express');
+const app = express();
+
+app.use(express.json());
+
+app.post('/api/endpoint', (req, res) => {
+  // Implementation: $prompt
+  res.json({ status: 'success' });
+});
+
+app.get('/health', (req, res) => res.json({ status: 'healthy' }));
+
+app.listen(process.env.PORT || 3000);
@@ -0,0 +1,10 @@
+// Generated React component
+import React, { useState } from 'react';
+
+function Component() {
+  const [state, setState] = useState(null);
+  // Implementation: $prompt
+  return <div>Component</div>;
+}
+
+export default Component;
@@ -0,0 +1,5 @@
+import React from 'react';
+import ReactDOM from 'react-dom/client';
+import Component from './Component';
+
+ReactDOM.createRoot(document.getElementById('root')).render(<Component />);
@@ -0,0 +1,9 @@
+# Generated Python code
+# Prompt: $prompt
+
+def main():
+    # Your implementation here
+    pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("api/endpoint", views.api_endpoint, name="api_endpoint"),
+]
@@ -0,0 +1,8 @@
+# Generated Django view
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+@require_http_methods(["POST"])
+def api_endpoint(request):
+    # Implementation: $prompt
+    return JsonResponse({"status": "success"})
@@ -0,0 +1,22 @@
+# Generated FastAPI application
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+app = FastAPI()
+
+class RequestData(BaseModel):
+    # Define your request schema here
+    data: str
+
+@app.post("/api/endpoint")
+async def endpoint(request: RequestData):
+    # Implementation: $prompt
+    return {"status": "success", "data": request.data}
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
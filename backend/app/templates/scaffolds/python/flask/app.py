@@ -0,0 +1,17 @@
+# Generated Flask app
+from flask import Flask, request, jsonify
+
+app = Flask(__name__)
+
+@app.route('/api/endpoint', methods=['POST'])
+def endpoint():
+    # Implementation: $prompt
+    data = request.get_json(silent=True) or {}
+    return jsonify({"status": "success", "data": data})
+
+@app.route('/health')
+def health():
+    return jsonify({"status": "healthy"})
+
+if __name__ == '__main__':
+    app.run(debug=True)
@@ -0,0 +1,12 @@
+// Generated TypeScript code
+// Prompt: $prompt
+
+interface Data {
+  // Define your types here
+}
+
+function main(): void {
+  // Your implementation here
+}
+
+main();
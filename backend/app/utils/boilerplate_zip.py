@@ -0,0 +1,94 @@
+"""
+Streaming ZIP export of generated boilerplate.
+
+The archive is produced file by file into a small chunk sink, so it is never
+held in memory or written to a temp file. Entries use fixed timestamps and
+permissions, so the same boilerplate always yields byte-identical ZIPs. That
+lets the boilerplate's content hash double as the ZIP's strong ETag.
+"""
+import io
+import json
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ZIP_FORMAT_VERSION = "1"  # Bump if the layout below changes, to invalidate stored ZIPs
+
+# Boilerplate key -> path inside the archive
+BOILERPLATE_LAYOUT = {
+    "backend": "backend/main.py",
+    "requirements": "backend/requirements.txt",
+    "frontend": "frontend/src/App.tsx",
+    "package_json": "frontend/package.json",
+    "docker_compose": "docker-compose.yml",
+}
+
+_FIXED_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target; zipfile then emits data descriptors instead of seeking back."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def boilerplate_files(boilerplate: Dict[str, object]) -> List[Tuple[str, str]]:
+    """(archive path, text) pairs in a stable order."""
+    files = []
+    for key in sorted(boilerplate):
+        value = boilerplate[key]
+        text = value if isinstance(value, str) else json.dumps(value, indent=2)
+        path = BOILERPLATE_LAYOUT.get(key, f"extra/{key}.txt")
+        files.append((path, text))
+    return sorted(files)
+
+
+def stream_boilerplate_zip(boilerplate: Dict[str, object], root: str = "boilerplate") -> Iterator[bytes]:
+    """Yield the ZIP archive of ``boilerplate`` chunk by chunk."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path, text in boilerplate_files(boilerplate):
+            info = zipfile.ZipInfo(f"{root}/{path}", date_time=_FIXED_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            archive.writestr(info, text.encode("utf-8"))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    chunk = sink.drain()  # Central directory
+    if chunk:
+        yield chunk
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive (start, end); None if absent or unsatisfiable."""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text == "":
+            # Suffix range: last N bytes
+            length = int(end_text)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
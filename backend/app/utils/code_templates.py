@@ -0,0 +1,233 @@
+"""
+Precompiled project scaffold templates for offline (no-LLM) code generation.
+
+Scaffolds live under ``app/templates/scaffolds/<language>/<framework>/``
+(``default`` when no framework is given). Every file in a scaffold directory
+is a project file; ``$prompt``, ``$project_name``, ``$language`` and
+``$framework`` are substituted (``$$`` is a literal ``$``; other ``$names``
+are left untouched, so shell and JS snippets survive). Values land in line
+comments and docstrings, so they are collapsed to one line first (see
+``inline_text``). An optional
+``scaffold.json`` names the ``entrypoint`` file returned as the single-snippet
+answer.
+
+The registry parses every template once into literal/placeholder segments,
+caches rendered projects per parameters, and rescans the tree (at most every
+``RELOAD_CHECK_SECONDS``) so edited templates are picked up without a restart.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from string import Template
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "scaffolds")
+MANIFEST_NAME = "scaffold.json"
+DEFAULT_FRAMEWORK = "default"
+RELOAD_CHECK_SECONDS = 2.0
+RENDER_CACHE_SIZE = 256
+IGNORED_DIRS = {"__pycache__", "node_modules"}
+IGNORED_SUFFIXES = (".pyc", ".pyo")
+
+_PLACEHOLDER = Template.pattern
+
+
+class CompiledTemplate:
+    """Template split once into literal text and placeholder names."""
+
+    __slots__ = ("literals", "names", "raw")
+
+    def __init__(self, text: str):
+        # literals[i] precedes names[i]; len(literals) == len(names) + 1
+        self.literals: List[str] = []
+        self.names: List[str] = []
+        self.raw: List[str] = []  # Original text, kept for placeholders without a value
+        buffer = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(text):
+            buffer.append(text[position:match.start()])
+            position = match.end()
+            name = match.group("named") or match.group("braced")
+            if match.group("escaped") is not None:
+                buffer.append("$")
+            elif name is None:
+                buffer.append(match.group(0))  # Invalid "$" (e.g. "$1"): keep it as text
+            else:
+                self.literals.append("".join(buffer))
+                self.names.append(name)
+                self.raw.append(match.group(0))
+                buffer = []
+        buffer.append(text[position:])
+        self.literals.append("".join(buffer))
+
+    def render(self, values: Dict[str, str]) -> str:
+        out = [self.literals[0]]
+        for name, raw, literal in zip(self.names, self.raw, self.literals[1:]):
+            out.append(values.get(name, raw))
+            out.append(literal)
+        return "".join(out)
+
+
+def inline_text(value: str) -> str:
+    """Single-line form of ``value`` that is safe inside a line comment or docstring."""
+    return " ".join(str(value).split()).replace('"""', "'''")
+
+
+class Scaffold:
+    """One language/framework project: compiled files plus the entrypoint path."""
+
+    def __init__(self, language: str, framework: str, files: Dict[str, CompiledTemplate], entrypoint: str):
+        self.language = language
+        self.framework = framework
+        self.files = files
+        self.entrypoint = entrypoint
+
+    def render(self, values: Dict[str, str]) -> Dict[str, str]:
+        return {path: template.render(values) for path, template in self.files.items()}
+
+
+def _load_scaffold(language: str, framework: str, directory: str) -> Optional[Scaffold]:
+    manifest = {}
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    files: Dict[str, CompiledTemplate] = {}
+    for root, names in _walk_templates(directory):
+        for name in sorted(names):
+            if name == MANIFEST_NAME:
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            with open(path, "r", encoding="utf-8") as f:
+                files[relative] = CompiledTemplate(f.read())
+    if not files:
+        return None
+
+    entrypoint = manifest.get("entrypoint") or sorted(files)[0]
+    if entrypoint not in files:
+        logger.warning(f"Scaffold {language}/{framework}: entrypoint {entrypoint} not found")
+        entrypoint = sorted(files)[0]
+    return Scaffold(language, framework, dict(sorted(files.items())), entrypoint)
+
+
+def _walk_templates(root: str):
+    """``os.walk`` minus bytecode caches and dependency folders (e.g. from running compileall)."""
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        yield directory, [n for n in names if not n.endswith(IGNORED_SUFFIXES)]
+
+
+def _tree_signature(root: str) -> Tuple:
+    """Cheap change detector: (path, mtime, size) of every template file."""
+    entries = []
+    for directory, names in _walk_templates(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+class TemplateRegistry:
+    """Loads, precompiles and renders scaffolds; hot-reloads on template changes."""
+
+    def __init__(self, root: str = TEMPLATE_ROOT, cache_size: int = RENDER_CACHE_SIZE):
+        self.root = root
+        self.cache_size = cache_size
+        self._scaffolds: Dict[Tuple[str, str], Scaffold] = {}
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._rendered: "OrderedDict[Tuple, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        with self._lock:
+            if self._signature is not None and now - self._checked_at < RELOAD_CHECK_SECONDS:
+                return
+            signature = _tree_signature(self.root)
+            self._checked_at = now
+            if signature == self._signature:
+                return
+            self._scaffolds = self._load_all()
+            self._rendered.clear()
+            self._signature = signature
+            logger.info(f"Loaded {len(self._scaffolds)} code scaffolds from {self.root}")
+
+    def _load_all(self) -> Dict[Tuple[str, str], Scaffold]:
+        scaffolds = {}
+        if not os.path.isdir(self.root):
+            return scaffolds
+        for language in sorted(os.listdir(self.root)):
+            language_dir = os.path.join(self.root, language)
+            if not os.path.isdir(language_dir):
+                continue
+            for framework in sorted(os.listdir(language_dir)):
+                directory = os.path.join(language_dir, framework)
+                if not os.path.isdir(directory):
+                    continue
+                try:
+                    scaffold = _load_scaffold(language, framework, directory)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping scaffold {language}/{framework}: {e}")
+                    continue
+                if scaffold is not None:
+                    scaffolds[(language, framework)] = scaffold
+        return scaffolds
+
+    def get(self, language: str, framework: Optional[str] = None) -> Optional[Scaffold]:
+        """Scaffold for ``language``/``framework``, falling back to the language default."""
+        self._maybe_reload()
+        language = (language or "").lower()
+        framework = (framework or DEFAULT_FRAMEWORK).lower()
+        return self._scaffolds.get((language, framework)) or self._scaffolds.get((language, DEFAULT_FRAMEWORK))
+
+    def available(self) -> Dict[str, List[str]]:
+        self._maybe_reload()
+        languages: Dict[str, List[str]] = {}
+        for language, framework in self._scaffolds:
+            languages.setdefault(language, []).append(framework)
+        return languages
+
+    def render(self, language: str, framework: Optional[str] = None, **values: str) -> Optional[Tuple[Scaffold, Dict[str, str]]]:
+        """``(scaffold, {path: content})`` or None if the language has no scaffold."""
+        scaffold = self.get(language, framework)
+        if scaffold is None:
+            return None
+        values.setdefault("language", scaffold.language)
+        values.setdefault("framework", scaffold.framework)
+        values = {name: inline_text(value) for name, value in values.items()}
+        key = (scaffold.language, scaffold.framework, tuple(sorted(values.items())))
+        with self._lock:
+            files = self._rendered.get(key)
+            if files is not None:
+                self._rendered.move_to_end(key)
+                return scaffold, dict(files)
+        files = scaffold.render(values)
+        with self._lock:
+            self._rendered[key] = files
+            while len(self._rendered) > self.cache_size:
+                self._rendered.popitem(last=False)
+        return scaffold, dict(files)
+
+
+def project_name(prompt: str, default: str = "hackquest-project") -> str:
+    """Filesystem/package-friendly name derived from the prompt."""
+    words = re.findall(r"[a-z0-9]+", (prompt or "").lower())[:4]
+    return "-".join(words) or default
+
+
+template_registry = TemplateRegistry()
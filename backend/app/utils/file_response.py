@@ -0,0 +1,59 @@
+"""
+Zero-copy file responses.
+
+``ZeroCopyFileResponse`` sends a byte range of a file with the ASGI
+``http.response.zerocopysend`` extension when the server advertises it, so the
+kernel copies the file straight to the socket (``sendfile``). Servers without
+the extension (uvicorn today) get the same range read in chunks off the event
+loop.
+"""
+import asyncio
+from typing import Mapping, Optional
+
+from starlette.responses import Response
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+READ_CHUNK_SIZE = 256 * 1024
+
+
+class ZeroCopyFileResponse(Response):
+    """Serve bytes ``start..end`` (inclusive) of ``path``."""
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+    ):
+        self.path = path
+        self.start = start
+        self.count = end - start + 1
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.count)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        with open(self.path, "rb") as f:
+            if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({"type": ZEROCOPY_EXTENSION, "file": f, "offset": self.start, "count": self.count})
+                return
+            await asyncio.to_thread(f.seek, self.start)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await asyncio.to_thread(f.read, min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
@@ -1,21 +1,309 @@
-import httpx
+"""GitHub REST client with a shared connection pool and conditional requests.
+
+All GitHub traffic goes through one process-wide ``httpx.AsyncClient`` so that
+TCP/TLS handshakes are paid once per worker instead of once per call. Responses
+are cached together with their ``ETag``/``Last-Modified`` validators and
+revalidated with ``If-None-Match``; GitHub does not count ``304 Not Modified``
+answers against the rate limit, so refreshing a returning user's profile is
+almost free.
+"""
+import asyncio
+import hashlib
+import logging
 import os
-from typing import List, Dict
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Connection pool tuning for the shared client
+POOL_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+POOL_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Conditional-response cache size (number of distinct URL/token pairs)
+RESPONSE_CACHE_SIZE = int(os.getenv("GITHUB_RESPONSE_CACHE_SIZE", "2048"))
+
+# Rate-limit handling
+RATE_LIMIT_LOW_WATERMARK = 50  # Start spacing out requests below this many remaining
+MAX_BACKOFF_SECONDS = 30.0  # Never block a caller longer than this
+MAX_RETRIES = 3
+RATE_LIMIT_TRACKERS_MAX = 1024  # Distinct tokens tracked per worker (LRU)
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared, pooled GitHub HTTP client."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            base_url=GITHUB_API_URL,
+            http2=_http2_available(),
+            limits=POOL_LIMITS,
+            timeout=POOL_TIMEOUT,
+            headers={
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+        )
+    return _shared_client
+
+
+async def close_http_client():
+    """Close the shared client (call from application shutdown)."""
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+        logger.info("GitHub HTTP client closed")
+    _shared_client = None
+
+
+@dataclass
+class CachedResponse:
+    """A cached GitHub response plus the validators needed to revalidate it."""
+    data: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    links: Dict[str, str] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """Bounded LRU store of GitHub responses keyed by URL and credential."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]], token: str) -> str:
+        """Build a cache key; the token is hashed so it never sits in memory twice."""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{token_digest(token)}:{url}?{query}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def token_digest(token: Optional[str]) -> str:
+    """Short, non-reversible identifier for a token (cache and rate-limit keys)."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16] if token else "anon"
+
+
+class RateLimitTracker:
+    """Tracks GitHub's ``X-RateLimit-*`` headers for one token and paces requests adaptively."""
 
-class GitHubClient:
     def __init__(self):
-        self.base_url = "https://api.github.com"
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+    def update(self, headers: httpx.Headers):
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+    def pacing_delay(self) -> float:
+        """Spread the remaining budget evenly over the time left in the window."""
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        if self.remaining >= RATE_LIMIT_LOW_WATERMARK:
+            return 0.0
+        window_left = max(self.reset_at - time.time(), 0.0)
+        return min(window_left / max(self.remaining, 1), MAX_BACKOFF_SECONDS)
+
+    @staticmethod
+    def retry_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying a throttled response, or None."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if retry_after is not None:
+            return min(retry_after, MAX_BACKOFF_SECONDS)
+        if response.headers.get("x-ratelimit-remaining") == "0":
+            reset = float(response.headers.get("x-ratelimit-reset", time.time()))
+            return min(max(reset - time.time(), 1.0), MAX_BACKOFF_SECONDS)
+        if response.status_code == 429:
+            return min(2 ** attempt, MAX_BACKOFF_SECONDS)
+        return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class RateLimitRegistry:
+    """One tracker per token: each token has its own budget, so one nearly
+    exhausted user token must not pace requests made with other tokens."""
+
+    def __init__(self, maxsize: int = RATE_LIMIT_TRACKERS_MAX):
+        self.maxsize = maxsize
+        self._trackers: "OrderedDict[str, RateLimitTracker]" = OrderedDict()
+
+    def for_token(self, token: Optional[str]) -> RateLimitTracker:
+        key = token_digest(token)
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            tracker = self._trackers[key] = RateLimitTracker()
+        self._trackers.move_to_end(key)
+        while len(self._trackers) > self.maxsize:
+            self._trackers.popitem(last=False)
+        return tracker
+
+    def __len__(self) -> int:
+        return len(self._trackers)
+
+
+# Shared across all GitHubClient instances in this worker
+response_cache = ResponseCache()
+rate_limits = RateLimitRegistry()
+
+
+@dataclass
+class GitHubResponse:
+    """Result of a GitHub API call."""
+    status_code: int
+    data: Any
+    links: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    etag: Optional[str] = None
+
+
+class GitHubClient:
+    def __init__(self, token: Optional[str] = None):
+        self.base_url = GITHUB_API_URL
         # It's better to use an empty string as fallback to prevent 'None' errors
-        self.token = os.getenv('GITHUB_TOKEN', '')
+        self.token = token if token is not None else os.getenv('GITHUB_TOKEN', '')
         self.headers = {"Authorization": f"token {self.token}"} if self.token else {}
 
+    async def get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None,
+    ) -> GitHubResponse:
+        """
+        GET a GitHub API path with conditional revalidation and rate-limit backoff.
+
+        A ``304`` is served from the response cache. ``etag`` seeds
+        ``If-None-Match`` when this worker has no cached copy (e.g. from a
+        persisted sync cursor); a ``304`` then comes back with ``data=None``.
+        Throttled responses are retried up to ``MAX_RETRIES`` times, honouring
+        ``Retry-After`` and ``X-RateLimit-Reset``.
+        """
+        client = get_http_client()
+        key = ResponseCache.make_key(path, params, self.token)
+        cached = response_cache.get(key)
+
+        headers = dict(self.headers)
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        elif etag:
+            headers["If-None-Match"] = etag
+
+        tracker = rate_limits.for_token(self.token)
+        for attempt in range(MAX_RETRIES + 1):
+            delay = tracker.pacing_delay()
+            if delay > 0:
+                logger.info(f"GitHub rate limit low ({tracker.remaining} left), pacing {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+            response = await client.get(path, params=params, headers=headers)
+            tracker.update(response.headers)
+
+            retry_in = RateLimitTracker.retry_delay(response, attempt)
+            if retry_in is not None and attempt < MAX_RETRIES:
+                logger.warning(f"GitHub throttled {path} ({response.status_code}), retrying in {retry_in:.1f}s")
+                await asyncio.sleep(retry_in)
+                continue
+            break
+
+        links = {name: link["url"] for name, link in response.links.items()}
+
+        if response.status_code == 304:
+            if cached is not None:
+                return GitHubResponse(200, cached.data, cached.links, from_cache=True, etag=cached.etag)
+            return GitHubResponse(304, None, links, etag=etag)
+
+        if response.status_code != 200:
+            return GitHubResponse(response.status_code, None, links)
+
+        data = response.json()
+        new_etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if new_etag or last_modified:
+            response_cache.set(key, CachedResponse(data, new_etag, last_modified, links))
+        return GitHubResponse(200, data, links, etag=new_etag)
+
+    async def get_user(self, username: str) -> Optional[Dict]:
+        """Fetches the public user object."""
+        try:
+            response = await self.get_json(f"/users/{username}")
+        except Exception as e:
+            logger.error(f"❌ Network Error fetching GitHub: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"⚠️ GitHub API Error: {response.status_code}")
+            return None
+        return response.data
+
     async def get_user_summary(self, username: str) -> str:
         """
-        Fetches repos and returns a single string summary 
+        Fetches repos and returns a single string summary
         perfect for an LLM to digest.
         """
         repos = await self.get_user_data(username)
-        
+
         if not repos or "message" in str(repos):
             return "No public GitHub data available for this user."
 
@@ -25,7 +313,7 @@ class GitHubClient:
         for repo in repos:
             if repo["lang"]:
                 languages.add(repo["lang"])
-            
+
             desc = repo["desc"] if repo["desc"] else "No description"
             repo_details.append(f"- {repo['name']}: {desc} (Primary Language: {repo['lang']})")
 
@@ -33,33 +321,29 @@ class GitHubClient:
         summary = f"TECHNICAL PROFILE FOR {username}:\n"
         summary += f"Core Languages: {', '.join(languages)}\n"
         summary += "Recent Projects:\n" + "\n".join(repo_details)
-        
+
         return summary
 
     async def get_user_data(self, username: str) -> List[Dict]:
         """Fetches raw repository data."""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/users/{username}/repos?sort=updated&per_page=10", 
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                
-                if response.status_code != 200:
-                    print(f"⚠️ GitHub API Error: {response.status_code}")
-                    return []
-                
-                repos = response.json()
-                
-                profile_data = []
-                for repo in repos:
-                    profile_data.append({
-                        "name": repo.get("name"),
-                        "desc": repo.get("description"),
-                        "lang": repo.get("language")
-                    })
-                return profile_data
-            except Exception as e:
-                print(f"❌ Network Error fetching GitHub: {e}")
-                return []
\ No newline at end of file
+        try:
+            response = await self.get_json(
+                f"/users/{username}/repos",
+                params={"sort": "updated", "per_page": 10},
+            )
+
+            if response.status_code != 200:
+                logger.warning(f"⚠️ GitHub API Error: {response.status_code}")
+                return []
+
+            profile_data = []
+            for repo in response.data:
+                profile_data.append({
+                    "name": repo.get("name"),
+                    "desc": repo.get("description"),
+                    "lang": repo.get("language")
+                })
+            return profile_data
+        except Exception as e:
+            logger.error(f"❌ Network Error fetching GitHub: {e}")
+            return []
@@ -0,0 +1,385 @@
+"""Concurrent GitHub profile harvesting.
+
+Pages through every public repository of a user and fetches the per-repo
+language byte counts in parallel (bounded by a semaphore), then folds them
+into a weighted skill vector and a compact text summary for the agent.
+
+``harvest_incremental`` resumes from a persisted ``SyncCursor`` so that only
+repositories that changed since the previous sync are re-fetched.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.github_client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+REPOS_PER_PAGE = 100  # GitHub maximum
+LANGUAGE_CONCURRENCY = 16  # Parallel /languages calls per harvest
+RECENCY_HALF_LIFE_DAYS = 365.0  # A repo untouched for a year counts half
+SUMMARY_TOP_LANGUAGES = 8
+SUMMARY_TOP_REPOS = 8
+SKILL_VECTOR_MOVE_THRESHOLD = 0.05  # L1 distance below which a profile counts as unchanged
+
+# Repo fields whose change means the language breakdown/summary may be stale
+REPO_HASH_FIELDS = (
+    "pushed_at", "updated_at", "size", "language",
+    "description", "stargazers_count", "fork", "topics",
+)
+
+
+@dataclass
+class HarvestedProfile:
+    """Everything the harvester learned about a GitHub user."""
+    username: str
+    repos: List[Dict] = field(default_factory=list)
+    skill_vector: Dict[str, float] = field(default_factory=dict)  # language -> weight, sums to 1
+    total_stars: int = 0
+    summary: str = ""
+
+
+@dataclass
+class SyncCursor:
+    """Per-user state persisted between incremental syncs."""
+    last_updated_at: Optional[str] = None  # Newest repo ``updated_at`` seen
+    repos_etag: Optional[str] = None  # ETag of the first repo-listing page
+    public_repos: Optional[int] = None
+    repo_hashes: Dict[str, str] = field(default_factory=dict)  # full_name -> content hash
+    repos: Dict[str, Dict] = field(default_factory=dict)  # full_name -> trimmed repo incl. languages
+    skill_vector: Dict[str, float] = field(default_factory=dict)
+    summary: str = ""
+
+    def to_dict(self) -> Dict:
+        return {
+            "last_updated_at": self.last_updated_at,
+            "repos_etag": self.repos_etag,
+            "public_repos": self.public_repos,
+            # Mongo keys may not contain dots, which repo names can
+            "repo_hashes": [[name, digest] for name, digest in self.repo_hashes.items()],
+            "repos": list(self.repos.values()),
+            "skill_vector": [[lang, weight] for lang, weight in self.skill_vector.items()],
+            "summary": self.summary,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "SyncCursor":
+        if not data:
+            return cls()
+        return cls(
+            last_updated_at=data.get("last_updated_at"),
+            repos_etag=data.get("repos_etag"),
+            public_repos=data.get("public_repos"),
+            repo_hashes={name: digest for name, digest in data.get("repo_hashes", [])},
+            repos={repo["full_name"]: repo for repo in data.get("repos", [])},
+            skill_vector={lang: weight for lang, weight in data.get("skill_vector", [])},
+            summary=data.get("summary", ""),
+        )
+
+
+@dataclass
+class IncrementalHarvest:
+    """Result of an incremental sync."""
+    profile: HarvestedProfile
+    cursor: SyncCursor
+    changed_repos: List[str] = field(default_factory=list)
+    skill_vector_moved: bool = False
+
+
+def repo_content_hash(repo: Dict) -> str:
+    """Stable hash of the repo fields that affect languages and summary."""
+    payload = json.dumps({k: repo.get(k) for k in REPO_HASH_FIELDS}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _trim_repo(repo: Dict) -> Dict:
+    """Keep only the fields the harvester needs, to bound cursor size."""
+    keep = ("full_name", "name", "languages") + REPO_HASH_FIELDS
+    return {k: repo.get(k) for k in keep if k in repo}
+
+
+def skill_vector_distance(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """L1 distance between two skill vectors (0 = identical, 2 = disjoint)."""
+    return sum(abs(a.get(k, 0.0) - b.get(k, 0.0)) for k in set(a) | set(b))
+
+
+def _parse_github_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+
+def _last_page(links: Dict[str, str]) -> int:
+    """Read the page number out of a ``Link: <...&page=N>; rel="last"`` header."""
+    last = links.get("last")
+    if not last:
+        return 1
+    match = re.search(r"[?&]page=(\d+)", last)
+    return int(match.group(1)) if match else 1
+
+
+def repo_weight(repo: Dict, now: Optional[datetime] = None) -> float:
+    """Weight a repository by stars and recency (forks count for less)."""
+    now = now or datetime.now(timezone.utc)
+    pushed = _parse_github_time(repo.get("pushed_at") or repo.get("updated_at"))
+    age_days = (now - pushed).days if pushed else RECENCY_HALF_LIFE_DAYS * 2
+    recency = 0.5 ** (max(age_days, 0) / RECENCY_HALF_LIFE_DAYS)
+    stars = 1.0 + math.log1p(repo.get("stargazers_count", 0))
+    fork_penalty = 0.25 if repo.get("fork") else 1.0
+    return stars * recency * fork_penalty
+
+
+def build_skill_vector(repos: List[Dict]) -> Dict[str, float]:
+    """
+    Combine per-repo language byte counts into a normalized skill vector.
+
+    Each repo contributes its language *share* (not raw bytes, so one huge
+    vendored repo cannot dominate) scaled by ``repo_weight``.
+    """
+    now = datetime.now(timezone.utc)
+    totals: Dict[str, float] = {}
+    for repo in repos:
+        languages = repo.get("languages") or {}
+        if not languages and repo.get("language"):
+            languages = {repo["language"]: 1}
+        repo_bytes = sum(languages.values())
+        if repo_bytes <= 0:
+            continue
+        weight = repo_weight(repo, now)
+        for language, size in languages.items():
+            totals[language] = totals.get(language, 0.0) + weight * size / repo_bytes
+
+    norm = sum(totals.values())
+    if norm <= 0:
+        return {}
+    return dict(sorted(
+        ((language, round(value / norm, 4)) for language, value in totals.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    ))
+
+
+def build_summary(username: str, repos: List[Dict], skill_vector: Dict[str, float]) -> str:
+    """Compact, LLM-friendly profile text (bounded size regardless of repo count)."""
+    if not repos:
+        return "No public GitHub data available for this user."
+
+    top_languages = list(skill_vector.items())[:SUMMARY_TOP_LANGUAGES]
+    language_text = ", ".join(f"{lang} ({share:.0%})" for lang, share in top_languages)
+
+    now = datetime.now(timezone.utc)
+    top_repos = sorted(repos, key=lambda r: repo_weight(r, now), reverse=True)[:SUMMARY_TOP_REPOS]
+    repo_lines = []
+    for repo in top_repos:
+        desc = repo.get("description") or "No description"
+        langs = ", ".join(list((repo.get("languages") or {}).keys())[:3]) or repo.get("language") or "n/a"
+        repo_lines.append(
+            f"- {repo.get('name')}: {desc} ({langs}; {repo.get('stargazers_count', 0)} stars)"
+        )
+
+    total_stars = sum(r.get("stargazers_count", 0) for r in repos)
+    summary = f"TECHNICAL PROFILE FOR {username}:\n"
+    summary += f"Repositories: {len(repos)} ({total_stars} stars total)\n"
+    summary += f"Core Languages: {language_text}\n"
+    summary += "Notable Projects:\n" + "\n".join(repo_lines)
+    return summary
+
+
+class GitHubProfileHarvester:
+    """Fetches a complete GitHub profile with bounded concurrency."""
+
+    def __init__(self, client: Optional[GitHubClient] = None, concurrency: int = LANGUAGE_CONCURRENCY):
+        self.client = client or GitHubClient()
+        self.concurrency = concurrency
+
+    async def list_repos(self, username: str) -> List[Dict]:
+        """Fetch every public repo: page 1 first, then all remaining pages at once."""
+        params = {"sort": "updated", "per_page": REPOS_PER_PAGE}
+        path = f"/users/{username}/repos"
+
+        first = await self.client.get_json(path, params={**params, "page": 1})
+        repos, _ = await self._collect_pages(username, first)
+        return repos
+
+    async def _collect_pages(self, username: str, first) -> Tuple[List[Dict], bool]:
+        """Given the first listing page, fetch the remaining pages concurrently.
+
+        Returns ``(repos, complete)``; ``complete`` is False if any page failed.
+        """
+        params = {"sort": "updated", "per_page": REPOS_PER_PAGE}
+        path = f"/users/{username}/repos"
+
+        if first.status_code != 200 or not isinstance(first.data, list):
+            logger.warning(f"⚠️ GitHub repo listing failed for {username}: {first.status_code}")
+            return [], False
+
+        repos = list(first.data)
+        complete = True
+        last_page = _last_page(first.links)
+        if last_page > 1:
+            pages = await asyncio.gather(*[
+                self.client.get_json(path, params={**params, "page": page})
+                for page in range(2, last_page + 1)
+            ])
+            for page in pages:
+                if page.status_code == 200 and isinstance(page.data, list):
+                    repos.extend(page.data)
+                else:
+                    complete = False
+        if not complete:
+            logger.warning(f"⚠️ GitHub repo listing for {username} is missing pages")
+        return repos, complete
+
+    async def fetch_languages(self, repos: List[Dict]) -> None:
+        """Attach ``languages`` (bytes per language) to each repo in place."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(repo: Dict):
+            async with semaphore:
+                try:
+                    response = await self.client.get_json(f"/repos/{repo['full_name']}/languages")
+                    if response.status_code == 200 and isinstance(response.data, dict):
+                        repo["languages"] = response.data
+                except Exception as e:
+                    logger.warning(f"Language fetch failed for {repo.get('full_name')}: {e}")
+
+        await asyncio.gather(*[fetch(repo) for repo in repos if repo.get("full_name")])
+
+    async def harvest(self, username: str) -> HarvestedProfile:
+        """Harvest repos and languages, and derive the skill vector and summary."""
+        repos = await self.list_repos(username)
+        await self.fetch_languages(repos)
+
+        skill_vector = build_skill_vector(repos)
+        return HarvestedProfile(
+            username=username,
+            repos=repos,
+            skill_vector=skill_vector,
+            total_stars=sum(r.get("stargazers_count", 0) for r in repos),
+            summary=build_summary(username, repos, skill_vector),
+        )
+
+    async def harvest_incremental(
+        self,
+        username: str,
+        cursor: Optional[SyncCursor] = None,
+        public_repos: Optional[int] = None,
+    ) -> IncrementalHarvest:
+        """
+        Re-sync a profile, re-fetching languages only for repos that changed.
+
+        The repo listing is sorted by ``updated``, so an unchanged first page
+        (a ``304`` against the cursor's ETag) together with an unchanged
+        ``public_repos`` count means nothing changed and no further calls are
+        made. If the count is unchanged and page 1 already reaches repos no
+        newer than ``last_updated_at``, the later pages cannot hold changes and
+        are taken from the cursor instead of fetched. Otherwise every repo whose
+        content hash differs from the cursor gets its languages re-fetched; the
+        rest reuse the stored breakdown. Repos on pages that failed to load keep
+        their cursor entries instead of counting as removed.
+        """
+        cursor = cursor or SyncCursor()
+        params = {"sort": "updated", "per_page": REPOS_PER_PAGE, "page": 1}
+        first = await self.client.get_json(
+            f"/users/{username}/repos", params=params, etag=cursor.repos_etag
+        )
+
+        unchanged_listing = first.status_code == 304 or first.from_cache
+        count_unchanged = public_repos is None or public_repos == cursor.public_repos
+        if unchanged_listing and count_unchanged and cursor.repos:
+            repos = list(cursor.repos.values())
+            profile = HarvestedProfile(
+                username=username,
+                repos=repos,
+                skill_vector=cursor.skill_vector,
+                total_stars=sum(r.get("stargazers_count") or 0 for r in repos),
+                summary=cursor.summary,
+            )
+            return IncrementalHarvest(profile=profile, cursor=cursor)
+
+        if first.status_code == 304:
+            # Validator matched but we have no usable copy; fall back to a full listing
+            first = await self.client.get_json(f"/users/{username}/repos", params=params)
+        skip_later_pages = self._later_pages_unchanged(first, cursor, public_repos)
+        if skip_later_pages:
+            repos, complete = list(first.data), True
+        else:
+            repos, complete = await self._collect_pages(username, first)
+        if skip_later_pages or not complete:
+            # Unfetched and failed pages keep their repos from the cursor
+            listed = {r.get("full_name") for r in repos}
+            repos.extend(dict(r) for name, r in cursor.repos.items() if name not in listed)
+
+        changed, hashes = [], {}
+        for repo in repos:
+            name = repo.get("full_name")
+            digest = repo_content_hash(repo)
+            hashes[name] = digest
+            previous = cursor.repos.get(name)
+            if cursor.repo_hashes.get(name) == digest and previous and previous.get("languages") is not None:
+                repo["languages"] = previous["languages"]
+            else:
+                changed.append(name)
+
+        changed_names = set(changed)
+        await self.fetch_languages([r for r in repos if r.get("full_name") in changed_names])
+
+        skill_vector = build_skill_vector(repos)
+        removed = set(cursor.repos) - set(hashes)
+        if changed or removed or not cursor.summary:
+            summary = build_summary(username, repos, skill_vector)
+        else:
+            summary = cursor.summary
+
+        moved = skill_vector_distance(skill_vector, cursor.skill_vector) > SKILL_VECTOR_MOVE_THRESHOLD
+        new_cursor = SyncCursor(
+            last_updated_at=max((r.get("updated_at") or "" for r in repos), default=None) or None,
+            # Only a complete listing may short-circuit the next sync on a 304
+            repos_etag=first.etag if complete else None,
+            public_repos=public_repos if public_repos is not None else len(repos),
+            repo_hashes=hashes,
+            repos={r["full_name"]: _trim_repo(r) for r in repos if r.get("full_name")},
+            skill_vector=skill_vector,
+            summary=summary,
+        )
+        profile = HarvestedProfile(
+            username=username,
+            repos=repos,
+            skill_vector=skill_vector,
+            total_stars=sum(r.get("stargazers_count", 0) for r in repos),
+            summary=summary,
+        )
+        return IncrementalHarvest(
+            profile=profile,
+            cursor=new_cursor,
+            changed_repos=changed,
+            skill_vector_moved=moved,
+        )
+
+    @staticmethod
+    def _later_pages_unchanged(first, cursor: SyncCursor, public_repos: Optional[int]) -> bool:
+        """True if pages after the first hold only repos already in ``cursor``.
+
+        The listing is sorted newest ``updated_at`` first, so once page 1 ends
+        at or before the cursor's ``last_updated_at`` every later repo predates
+        the previous sync. New repos sort onto page 1, so with none there an
+        unchanged ``public_repos`` also means none were deleted.
+        """
+        if not cursor.repos or not cursor.last_updated_at:
+            return False
+        if public_repos is None or public_repos != cursor.public_repos:
+            return False
+        if first.status_code != 200 or not isinstance(first.data, list) or not first.data:
+            return False
+        if _last_page(first.links) <= 1:
+            return False
+        if any(r.get("full_name") not in cursor.repos for r in first.data):
+            return False
+        oldest = first.data[-1].get("updated_at")
+        return bool(oldest) and oldest <= cursor.last_updated_at
@@ -0,0 +1,26 @@
+"""Shared, lazily-created Groq client.
+
+The ``groq`` SDK is only imported when the first LLM call is made, so modules
+that may call Groq can be imported without paying for it at worker boot.
+"""
+import logging
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_groq_client():
+    """Get or create the process-wide Groq client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from groq import Groq
+                _client = Groq(api_key=settings.GROQ_API_KEY, base_url=settings.GROQ_BASE_URL)
+                logger.info("Groq client initialized")
+    return _client
@@ -0,0 +1,312 @@
+"""
+Bulk hackathon embedding pipeline.
+
+Streams hackathons from MongoDB, embeds them in large batches and writes the
+vectors to both ``Collections.embeddings()`` and the Pinecone index. Each
+embedding row stores a hash of the text it was built from, so a reindex only
+re-embeds hackathons whose content (or embedding model) changed.
+
+When MongoDB isn't initialized (SQLite-only deployments) the catalog is read
+from the SQLite ``hackathons`` table instead and the hashes are kept in
+``hackathon_embeddings``; the vectors then live only in the vector index.
+
+Embedding is CPU-bound and runs in a worker thread; while batch N is being
+embedded, the writes for batch N-1 are still in flight, and Pinecone upserts
+are split into chunks sent in parallel.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.database import Collections, get_pinecone_index
+from app.core.db import SessionLocal, serialized
+from app.models.hackathon_models import Hackathon, HackathonEmbedding
+from app.utils.vectorizer import get_vector_engine
+
+logger = logging.getLogger(__name__)
+
+OWNER_TYPE = "hackathon"
+METADATA_TEXT_LIMIT = 2000  # Keep Pinecone metadata well under its 40KB cap
+
+_PROJECTION = {
+    "title": 1, "description": 1, "theme": 1, "required_skills": 1,
+    "platform": 1, "platform_id": 1, "difficulty": 1,
+}
+
+
+def hackathon_embedding_text(hackathon: dict) -> str:
+    """Text a hackathon is embedded from."""
+    skills = ", ".join(hackathon.get("required_skills") or [])
+    parts = [
+        hackathon.get("title", ""),
+        hackathon.get("theme") or "",
+        hackathon.get("description", ""),
+        f"Skills: {skills}" if skills else "",
+    ]
+    return "\n".join(p for p in parts if p)
+
+
+def embedding_content_hash(text: str, model_id: str) -> str:
+    """Hash of the embedded text and ``VectorEngine.model_id``; unchanged hash means the vector is still valid.
+
+    The model id includes backend and quantization, so switching torch -> ONNX
+    int8 (or to the hash embedder) re-embeds everything.
+    """
+    return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _mongo_available() -> bool:
+    try:
+        Collections.hackathons()
+        return True
+    except RuntimeError:
+        return False
+
+
+@serialized
+def _sqlite_hackathon_page(after_id: Optional[str], limit: int) -> List[dict]:
+    """Next ``limit`` SQLite hackathons by id (keyset pagination), shaped like the Mongo documents."""
+    db = SessionLocal()
+    try:
+        query = db.query(Hackathon)
+        if after_id is not None:
+            query = query.filter(Hackathon.id > after_id)
+        docs = []
+        for row in query.order_by(Hackathon.id).limit(limit).all():
+            try:
+                skills = json.loads(row.required_skills) if row.required_skills else []
+            except ValueError:
+                skills = []
+            docs.append({
+                "_id": row.id,
+                "title": row.title,
+                "description": row.description or "",
+                "required_skills": skills,
+                "platform": row.platform,
+                "platform_id": row.platform_id,
+                "difficulty": row.difficulty,
+            })
+        return docs
+    finally:
+        db.close()
+
+
+@serialized
+def _sqlite_existing_hashes(ids: List[str]) -> Dict[str, str]:
+    db = SessionLocal()
+    try:
+        rows = db.query(HackathonEmbedding.owner_id, HackathonEmbedding.content_hash).filter(
+            HackathonEmbedding.owner_id.in_(ids)
+        ).all()
+        return {owner_id: content_hash for owner_id, content_hash in rows}
+    finally:
+        db.close()
+
+
+@serialized
+def _sqlite_save_hashes(rows: List[dict]):
+    db = SessionLocal()
+    try:
+        for row in rows:
+            db.merge(HackathonEmbedding(**row))
+        db.commit()
+    finally:
+        db.close()
+
+
+@dataclass
+class ReindexStats:
+    scanned: int = 0
+    embedded: int = 0
+    skipped: int = 0
+    vector_index_upserts: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "scanned": self.scanned,
+            "embedded": self.embedded,
+            "skipped": self.skipped,
+            "vector_index_upserts": self.vector_index_upserts,
+            "errors": self.errors[:20],
+            "seconds": round(self.seconds, 2),
+        }
+
+
+class HackathonIndexer:
+    """Batch (re)indexer for hackathon embeddings."""
+
+    def __init__(
+        self,
+        batch_size: int = settings.REINDEX_BATCH_SIZE,
+        upsert_chunk_size: int = settings.VECTOR_UPSERT_CHUNK_SIZE,
+        upsert_concurrency: int = settings.VECTOR_UPSERT_CONCURRENCY,
+    ):
+        self.batch_size = batch_size
+        self.upsert_chunk_size = upsert_chunk_size
+        self._upsert_semaphore = asyncio.Semaphore(upsert_concurrency)
+        self.engine = get_vector_engine()
+        self.use_mongo = True  # Decided per reindex()
+
+    async def _existing_hashes(self, ids: List[str]) -> Dict[str, str]:
+        if not self.use_mongo:
+            return await asyncio.to_thread(_sqlite_existing_hashes, ids)
+        cursor = Collections.embeddings().find(
+            {"owner_type": OWNER_TYPE, "owner_id": {"$in": ids}},
+            {"owner_id": 1, "content_hash": 1},
+        )
+        return {doc["owner_id"]: doc.get("content_hash") for doc in await cursor.to_list(None)}
+
+    async def _upsert_chunk(self, index, vectors: List[dict], stats: ReindexStats) -> List[str]:
+        """Upsert one chunk to the vector index; returns the ids that failed."""
+        async with self._upsert_semaphore:
+            try:
+                await asyncio.to_thread(index.upsert, vectors=vectors)
+                stats.vector_index_upserts += len(vectors)
+                return []
+            except Exception as e:
+                stats.errors.append(f"vector index upsert failed for {len(vectors)} vectors: {e}")
+                logger.error(f"Pinecone upsert failed: {e}")
+                return [v["id"] for v in vectors]
+
+    async def _write_batch(self, docs: List[dict], hashes: List[str],
+                           vectors: List[List[float]], stats: ReindexStats):
+        ids = [str(doc["_id"]) for doc in docs]
+
+        failed = set()
+        index = get_pinecone_index()
+        if index is not None:
+            records = [
+                {
+                    "id": owner_id,
+                    "values": vector,
+                    "metadata": {
+                        "title": doc.get("title", ""),
+                        "problem_statement": (doc.get("description") or "")[:METADATA_TEXT_LIMIT],
+                        "platform": doc.get("platform") or "",
+                        "platform_id": doc.get("platform_id") or "",
+                        "difficulty": doc.get("difficulty") or "",
+                        "required_skills": list(doc.get("required_skills") or []),
+                    },
+                }
+                for owner_id, doc, vector in zip(ids, docs, vectors)
+            ]
+            chunk_failures = await asyncio.gather(*[
+                self._upsert_chunk(index, records[i:i + self.upsert_chunk_size], stats)
+                for i in range(0, len(records), self.upsert_chunk_size)
+            ])
+            failed = {owner_id for chunk in chunk_failures for owner_id in chunk}
+
+        # Rows whose vector index upsert failed keep no hash so the next run retries them
+        now = datetime.utcnow()
+        if not self.use_mongo:
+            rows = [
+                {"owner_id": owner_id, "content_hash": None if owner_id in failed else content_hash,
+                 "model": self.engine.model_id, "updated_at": now}
+                for owner_id, content_hash in zip(ids, hashes)
+            ]
+            try:
+                await asyncio.to_thread(_sqlite_save_hashes, rows)
+            except Exception as e:
+                stats.errors.append(f"embedding hash write failed: {e}")
+                logger.error(f"Embedding hash write failed: {e}")
+            return
+        operations = [
+            UpdateOne(
+                {"owner_type": OWNER_TYPE, "owner_id": owner_id},
+                {"$set": {
+                    "vector": vector,
+                    "content_hash": None if owner_id in failed else content_hash,
+                    "model": self.engine.model_id,
+                    "updated_at": now,
+                }},
+                upsert=True,
+            )
+            for owner_id, vector, content_hash in zip(ids, vectors, hashes)
+        ]
+        try:
+            await Collections.embeddings().bulk_write(operations, ordered=False)
+        except Exception as e:
+            stats.errors.append(f"embeddings bulk write failed: {e}")
+            logger.error(f"Embeddings bulk write failed: {e}")
+
+    async def _embed_batch(self, docs: List[dict], force: bool, stats: ReindexStats):
+        """Embed the changed docs in ``docs``; returns the pending write, or None."""
+        stats.scanned += len(docs)
+        texts = [hackathon_embedding_text(doc) for doc in docs]
+        hashes = [embedding_content_hash(t, self.engine.model_id) for t in texts]
+
+        if not force:
+            existing = await self._existing_hashes([str(doc["_id"]) for doc in docs])
+            keep = [i for i, doc in enumerate(docs) if existing.get(str(doc["_id"])) != hashes[i]]
+            stats.skipped += len(docs) - len(keep)
+            docs = [docs[i] for i in keep]
+            texts = [texts[i] for i in keep]
+            hashes = [hashes[i] for i in keep]
+        if not docs:
+            return None
+
+        vectors = await asyncio.to_thread(self.engine.get_embeddings, texts, 64)
+        stats.embedded += len(docs)
+        return asyncio.create_task(self._write_batch(docs, hashes, vectors, stats))
+
+    async def _sqlite_docs(self) -> AsyncIterator[dict]:
+        after_id = None
+        while True:
+            page = await asyncio.to_thread(_sqlite_hackathon_page, after_id, self.batch_size)
+            for doc in page:
+                yield doc
+            if len(page) < self.batch_size:
+                return
+            after_id = page[-1]["_id"]
+
+    async def reindex(self, query: Optional[dict] = None, force: bool = False) -> ReindexStats:
+        """Embed every hackathon matching ``query`` whose content hash changed.
+
+        ``query`` filters the MongoDB catalog; the SQLite fallback always scans every row.
+        """
+        start = time.perf_counter()
+        stats = ReindexStats()
+        pending: Optional[asyncio.Task] = None
+
+        self.use_mongo = _mongo_available()
+        if self.use_mongo:
+            docs = Collections.hackathons().find(query or {}, _PROJECTION).batch_size(self.batch_size)
+        else:
+            if query:
+                logger.warning("Hackathon reindex: MongoDB not initialized, ignoring query and scanning SQLite")
+            docs = self._sqlite_docs()
+        batch: List[dict] = []
+        async for doc in docs:
+            batch.append(doc)
+            if len(batch) < self.batch_size:
+                continue
+            write = await self._embed_batch(batch, force, stats)
+            # Only one batch of writes in flight at a time to bound memory
+            if pending is not None:
+                await pending
+            pending, batch = write, []
+
+        if batch:
+            write = await self._embed_batch(batch, force, stats)
+            if pending is not None:
+                await pending
+            pending = write
+        if pending is not None:
+            await pending
+
+        stats.seconds = time.perf_counter() - start
+        logger.info(
+            f"[OK] Hackathon reindex ({'mongo' if self.use_mongo else 'sqlite'}): {stats.embedded} embedded, {stats.skipped} unchanged "
+            f"of {stats.scanned} in {stats.seconds:.1f}s"
+        )
+        return stats
@@ -0,0 +1,267 @@
+"""
+Hybrid hackathon retrieval.
+
+Candidates come from two rankings computed in one pass:
+
+* vector similarity: the Pinecone query on the user's profile embedding
+* skill overlap: an in-process inverted index (skill -> hackathons) built from
+  the hackathon catalog and refreshed every ``SKILL_INDEX_TTL_SECONDS``
+
+The rankings are merged with reciprocal rank fusion (RRF), which only uses
+rank positions, so cosine scores and skill ratios never need calibrating
+against each other. The skill and difficulty scoring here is shared with the
+matching APIs so every path ranks hackathons the same way.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import VECTOR_QUERY_DURATION
+from app.core.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60  # Standard RRF damping constant
+SKILL_INDEX_TTL_SECONDS = 300
+VECTOR_CANDIDATES = 20
+SKILL_CANDIDATES = 20
+
+_DIFFICULTY_LEVELS = {
+    "beginner": 0,
+    "intermediate": 3,
+    "advanced": 5,
+    "expert": 8
+}
+
+
+def skill_overlap(user_skills: Iterable[str], required_skills: Iterable[str]) -> Tuple[List[str], Optional[float]]:
+    """Case-insensitive skill overlap: (matched required skills, ratio or None if nothing is required)."""
+    required = list(dict.fromkeys(required_skills or []))
+    if not required:
+        return [], None
+    known = {s.lower() for s in user_skills or []}
+    matched = [s for s in required if s.lower() in known]
+    return matched, len(matched) / len(required)
+
+
+def difficulty_fit(user_avg_exp: float, difficulty: str) -> float:
+    """How well a difficulty suits a user's average experience in years (0-100)."""
+    required_exp = _DIFFICULTY_LEVELS.get((difficulty or "intermediate").lower(), 3)
+
+    if user_avg_exp == 0:
+        return 50.0 if difficulty == "beginner" else 30.0
+
+    if user_avg_exp >= required_exp:
+        return 100.0
+
+    return 50.0 + (user_avg_exp / required_exp) * 50.0
+
+
+@dataclass
+class IndexedHackathon:
+    id: str
+    title: str
+    description: str
+    difficulty: str
+    required_skills: List[str] = field(default_factory=list)
+
+
+class SkillIndex:
+    """In-memory inverted index from lower-cased skill to hackathon ids."""
+
+    def __init__(self, ttl_seconds: float = SKILL_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._postings: Dict[str, Set[str]] = {}
+        self._hackathons: Dict[str, IndexedHackathon] = {}
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """Force a rebuild on next use (call after the catalog changes)."""
+        self._built_at = 0.0
+
+    def get(self, hackathon_id: str) -> Optional[IndexedHackathon]:
+        return self._hackathons.get(hackathon_id)
+
+    def build(self, hackathons: Iterable[IndexedHackathon]):
+        postings: Dict[str, Set[str]] = {}
+        by_id: Dict[str, IndexedHackathon] = {}
+        for hackathon in hackathons:
+            by_id[hackathon.id] = hackathon
+            for skill in hackathon.required_skills:
+                postings.setdefault(skill.lower(), set()).add(hackathon.id)
+        self._postings, self._hackathons = postings, by_id
+        self._built_at = time.monotonic()
+
+    async def ensure_fresh(self):
+        if time.monotonic() - self._built_at < self.ttl_seconds:
+            return
+        async with self._lock:
+            if time.monotonic() - self._built_at < self.ttl_seconds:
+                return
+            try:
+                self.build(await _load_catalog())
+                logger.info(f"Skill index built: {len(self._hackathons)} hackathons, {len(self._postings)} skills")
+            except Exception as e:
+                # Keep serving the previous index; retry after another TTL
+                logger.warning(f"Skill index rebuild failed: {e}")
+                self._built_at = time.monotonic()
+
+    def search(self, user_skills: Iterable[str], limit: int = SKILL_CANDIDATES,
+               user_avg_exp: float = 2.5) -> List[Tuple[str, float, List[str]]]:
+        """Rank hackathons sharing at least one skill: [(id, score 0-100, matched skills)]."""
+        candidate_ids: Set[str] = set()
+        for skill in user_skills or []:
+            candidate_ids |= self._postings.get(skill.lower(), set())
+
+        ranked = []
+        for hackathon_id in candidate_ids:
+            hackathon = self._hackathons[hackathon_id]
+            matched, ratio = skill_overlap(user_skills, hackathon.required_skills)
+            score = (ratio or 0.0) * 100.0 * 0.7 + difficulty_fit(user_avg_exp, hackathon.difficulty) * 0.3
+            ranked.append((hackathon_id, score, matched))
+        ranked.sort(key=lambda r: (r[1], len(r[2])), reverse=True)
+        return ranked[:limit]
+
+
+async def _load_catalog() -> List[IndexedHackathon]:
+    """Active hackathons from MongoDB, or from SQLite when MongoDB isn't initialized."""
+    from app.core.database import Collections
+    try:
+        cursor = Collections.hackathons().find(
+            {"end_date": {"$gte": datetime.utcnow()}},
+            {"title": 1, "description": 1, "difficulty": 1, "required_skills": 1},
+        )
+        return [
+            IndexedHackathon(
+                id=str(doc["_id"]),
+                title=doc.get("title", ""),
+                description=doc.get("description", ""),
+                difficulty=doc.get("difficulty") or "intermediate",
+                required_skills=list(doc.get("required_skills") or []),
+            )
+            async for doc in cursor
+        ]
+    except RuntimeError:
+        return await asyncio.to_thread(_load_sqlite_catalog)
+
+
+def _load_sqlite_catalog() -> List[IndexedHackathon]:
+    from app.core.db import SessionLocal
+    from app.models.hackathon_models import Hackathon
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Hackathon).filter(Hackathon.is_active == True).all()
+        catalog = []
+        for row in rows:
+            try:
+                skills = json.loads(row.required_skills) if row.required_skills else []
+            except ValueError:
+                skills = []
+            catalog.append(IndexedHackathon(
+                id=row.id,
+                title=row.title,
+                description=row.description or "",
+                difficulty=row.difficulty or "intermediate",
+                required_skills=skills,
+            ))
+        return catalog
+    finally:
+        db.close()
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> Dict[str, float]:
+    """RRF: score(d) = sum over rankings of 1 / (k + rank of d)."""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            fused[item_id] = fused.get(item_id, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+class HybridRetriever:
+    """Fuses vector-similarity and skill-index candidates into one top-k list."""
+
+    def __init__(self, skill_index: Optional[SkillIndex] = None):
+        self.skill_index = skill_index or SkillIndex()
+
+    async def _vector_candidates(self, query_text: str, limit: int) -> List[dict]:
+        from app.core.database import get_pinecone_index
+        pinecone_index = get_pinecone_index()
+        if not pinecone_index:
+            return []
+
+        from app.utils.vectorizer import get_vector_engine
+        engine = get_vector_engine()
+        query_vector = await asyncio.to_thread(engine.get_embedding, query_text)
+        with start_span("vector.query", **{"vector.index": settings.PINECONE_INDEX, "vector.top_k": limit}) as span:
+            results = await asyncio.to_thread(
+                pinecone_index.query, vector=query_vector, top_k=limit, include_metadata=True
+            )
+            span.set_attribute("vector.matches", len(results["matches"]))
+        VECTOR_QUERY_DURATION.labels(settings.PINECONE_INDEX).observe(span.duration)
+        return [
+            {
+                "id": res["id"],
+                "score": res["score"],
+                "title": res["metadata"].get("title", ""),
+                "ps": res["metadata"].get("problem_statement", ""),
+            }
+            for res in results["matches"]
+        ]
+
+    async def retrieve(self, query_text: str, skills: List[str], top_k: int = 5) -> List[dict]:
+        """Top-k hackathons as candidate_matches dicts (``score`` is the fused RRF score)."""
+        vector_result, _ = await asyncio.gather(
+            self._vector_candidates(query_text, VECTOR_CANDIDATES),
+            self.skill_index.ensure_fresh(),
+            return_exceptions=True,
+        )
+        if isinstance(vector_result, Exception):
+            logger.warning(f"Vector retrieval failed, using skill index only: {vector_result}")
+            vector_result = []
+        skill_result = self.skill_index.search(skills, SKILL_CANDIDATES)
+
+        vector_by_id = {m["id"]: m for m in vector_result}
+        skill_by_id = {hid: (score, matched) for hid, score, matched in skill_result}
+        fused = reciprocal_rank_fusion([
+            [m["id"] for m in vector_result],
+            [hid for hid, _, _ in skill_result],
+        ])
+
+        candidates = []
+        for hackathon_id, rrf_score in sorted(fused.items(), key=lambda kv: kv[1], reverse=True)[:top_k]:
+            vector_hit = vector_by_id.get(hackathon_id)
+            indexed = self.skill_index.get(hackathon_id)
+            skill_score, matched = skill_by_id.get(hackathon_id, (None, []))
+            candidates.append({
+                "id": hackathon_id,
+                "score": rrf_score,
+                "title": vector_hit["title"] if vector_hit else indexed.title,
+                "ps": vector_hit["ps"] if vector_hit else indexed.description,
+                "vector_score": vector_hit["score"] if vector_hit else None,
+                "skill_score": skill_score,
+                "matched_skills": matched,
+            })
+        return candidates
+
+
+_retriever: Optional[HybridRetriever] = None
+_retriever_lock = threading.Lock()
+
+
+def get_hybrid_retriever() -> HybridRetriever:
+    """Get or create the process-wide retriever (and its skill index)."""
+    global _retriever
+    if _retriever is None:
+        with _retriever_lock:
+            if _retriever is None:
+                _retriever = HybridRetriever()
+    return _retriever
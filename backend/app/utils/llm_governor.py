@@ -0,0 +1,332 @@
+"""
+Central governor for Groq LLM calls.
+
+Every chat completion goes through ``get_llm_governor().chat_completion()``,
+which:
+
+* waits in a priority queue (interactive requests before agent runs before
+  background work; see ``llm_priority``)
+* spends from a requests-per-minute and a tokens-per-minute bucket sized to
+  this worker's share of the provider limits (``LLM_WORKERS``), and clamps
+  both from the ``x-ratelimit-remaining-requests`` /
+  ``x-ratelimit-remaining-tokens`` response headers, which are account-wide
+  and so also reflect what the other workers spent
+* caps in-flight calls with an AIMD limit: +1/limit per success, halved on a
+  429 (at most once per cooldown window), so concurrency settles just under
+  what the provider accepts instead of oscillating
+* retries 429s, 5xx and connection errors with jittered backoff, honoring
+  ``retry-after`` when the provider sends it
+
+The Groq SDK call is blocking, so it runs in a worker thread. Each call is
+traced as an ``llm.chat_completion`` span with queue wait, attempts, token
+usage and time to first token (from Groq's server-side ``queue_time`` +
+``prompt_time`` when reported; calls are not streamed, so otherwise the full
+response time).
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import LLM_ERRORS, LLM_REQUEST_DURATION, LLM_REQUESTS, LLM_TIME_TO_FIRST_TOKEN, LLM_TOKENS
+from app.core.tracing import start_span
+from app.utils.groq_client import get_groq_client
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_AGENT = 1
+PRIORITY_BACKGROUND = 2
+
+# Priority for calls that don't pass one explicitly (set by ``llm_priority``)
+_default_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_AGENT)
+
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 30.0
+DECREASE_COOLDOWN_SECONDS = 2.0
+CHARS_PER_TOKEN = 4  # Rough prompt-size estimate before the provider reports usage
+
+_DURATION_PART = re.compile(r"([\d.]+)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Seconds to wait from ``retry-after`` or Groq's ``x-ratelimit-reset-*`` headers (e.g. ``1m2.5s``)."""
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+    waits = []
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        parts = _DURATION_PART.findall(headers.get(name) or "")
+        if parts:
+            waits.append(sum(float(n) * _DURATION_UNITS[u] for n, u in parts))
+    return max(waits) if waits else None
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run LLM calls made inside the block (including spawned tasks) at ``priority``."""
+    token = _default_priority.set(priority)
+    try:
+        yield
+    finally:
+        _default_priority.reset(token)
+
+
+class TokenBucket:
+    """Continuous-refill token bucket; ``capacity`` tokens per ``period`` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        # Requests larger than the bucket only need a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill(time.monotonic())
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float):
+        self._refill(time.monotonic())
+        self.level = min(self.capacity, self.level + amount)
+
+    def clamp(self, remaining: float):
+        """Never believe we have more than the provider says is left."""
+        self._refill(time.monotonic())
+        self.level = min(self.level, remaining)
+
+    def block_for(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self.level = min(self.level, 0.0)
+
+
+class LLMGovernor:
+    """Priority queue + RPM/TPM buckets + AIMD concurrency for LLM calls."""
+
+    def __init__(
+        self,
+        rpm: int = settings.LLM_REQUESTS_PER_MINUTE,
+        tpm: int = settings.LLM_TOKENS_PER_MINUTE,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        workers: int = settings.LLM_WORKERS,
+    ):
+        # The provider limits are per account: split them across the workers
+        workers = max(1, workers)
+        self.requests = TokenBucket(max(1.0, rpm / workers))
+        self.tokens = TokenBucket(max(1.0, tpm / workers))
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.limit = float(max(1, min(4, max_concurrency)))
+        self.in_flight = 0
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._last_decrease = 0.0
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _pump(self):
+        """Grant slots to queued callers in priority order while limits allow."""
+        self._timer = None
+        while self._waiters and self.in_flight < int(self.limit):
+            priority, seq, estimate, future = self._waiters[0]
+            if future.done():  # Caller gave up (cancelled)
+                heapq.heappop(self._waiters)
+                continue
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimate))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._pump)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(estimate)
+            self.in_flight += 1
+            future.set_result(None)
+
+    async def _acquire(self, priority: int, estimate: float):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), estimate, future))
+        if self._timer is None:
+            self._pump()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Slot was granted just as we were cancelled
+            raise
+
+    def _release(self):
+        self.in_flight -= 1
+        if self._timer is None:
+            self._pump()
+
+    # ------------------------------------------------------------------
+    # AIMD feedback
+    # ------------------------------------------------------------------
+
+    def _on_success(self, headers, estimate: float, usage_tokens: Optional[int]):
+        self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+        if usage_tokens is not None:
+            # Refund (or charge) the difference between estimate and real usage
+            self.tokens.give(estimate - usage_tokens)
+        if not headers:
+            return
+        for name, bucket in (("x-ratelimit-remaining-requests", self.requests),
+                             ("x-ratelimit-remaining-tokens", self.tokens)):
+            remaining = headers.get(name)
+            if remaining is not None:
+                try:
+                    bucket.clamp(float(remaining))
+                except ValueError:
+                    pass
+
+    def _on_rate_limited(self, retry_after: Optional[float]):
+        now = time.monotonic()
+        if now - self._last_decrease >= DECREASE_COOLDOWN_SECONDS:
+            self.limit = max(1.0, self.limit / 2)
+            self._last_decrease = now
+            logger.warning(f"LLM rate limited; concurrency limit -> {self.limit:.1f}")
+        if retry_after:
+            self.requests.block_for(retry_after)
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _estimate_tokens(kwargs: dict) -> float:
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+        return prompt_chars / CHARS_PER_TOKEN + kwargs.get("max_tokens", 1024)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return retry_after + random.uniform(0, min(1.0, retry_after * 0.25))
+        # Full jitter so retries from a burst don't land together
+        return random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt))
+
+    async def chat_completion(self, priority: Optional[int] = None, **kwargs) -> Any:
+        """Governed ``client.chat.completions.create(**kwargs)``; returns the parsed completion.
+
+        Without an explicit ``priority`` the call uses the one set by ``llm_priority``
+        (``PRIORITY_AGENT`` by default).
+        """
+        if priority is None:
+            priority = _default_priority.get()
+        model = kwargs.get("model", "")
+        with start_span("llm.chat_completion", **{"llm.model": model, "llm.priority": priority}) as span:
+            try:
+                completion = await self._chat_completion(span, priority, kwargs)
+            finally:
+                LLM_REQUEST_DURATION.labels(model, span.status).observe(span.duration)
+                LLM_REQUESTS.labels(model, span.status).inc()
+            usage = getattr(completion, "usage", None)
+            for kind in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                count = getattr(usage, kind, None)
+                span.set_attribute(f"llm.{kind}", count)
+                if count is not None:
+                    LLM_TOKENS.labels(model, kind.replace("_tokens", "")).observe(count)
+            return completion
+
+    async def _chat_completion(self, span, priority: int, kwargs: dict) -> Any:
+        import groq
+
+        estimate = self._estimate_tokens(kwargs)
+        client = get_groq_client()
+        for attempt in range(self.max_retries + 1):
+            span.set_attribute("llm.attempts", attempt + 1)
+            queued_at = time.perf_counter()
+            await self._acquire(priority, estimate)
+            span.set_attribute("llm.queue_wait_ms", round((time.perf_counter() - queued_at) * 1000, 1))
+            try:
+                sent_at = time.perf_counter()
+                raw = await asyncio.to_thread(client.chat.completions.with_raw_response.create, **kwargs)
+                latency = time.perf_counter() - sent_at
+                completion = raw.parse()
+                usage = getattr(completion, "usage", None)
+                self._on_success(raw.headers, estimate, getattr(usage, "total_tokens", None))
+                ttft = self._time_to_first_token(usage, latency)
+                span.set_attribute("llm.time_to_first_token_ms", round(ttft * 1000, 1))
+                LLM_TIME_TO_FIRST_TOKEN.labels(kwargs.get("model", "")).observe(ttft)
+                return completion
+            except groq.RateLimitError as e:
+                retry_after = parse_retry_after(getattr(e.response, "headers", None))
+                self._on_rate_limited(retry_after)
+                error = e
+            except groq.APIStatusError as e:
+                if e.status_code < 500:
+                    raise
+                retry_after, error = None, e
+            except (groq.APIConnectionError, groq.APITimeoutError) as e:
+                retry_after, error = None, e
+            finally:
+                self._release()
+
+            LLM_ERRORS.labels(kwargs.get("model", ""), error.__class__.__name__).inc()
+            if attempt == self.max_retries:
+                raise error
+            delay = self._backoff(attempt, retry_after)
+            logger.warning(f"LLM call failed ({error.__class__.__name__}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _time_to_first_token(usage, latency: float) -> float:
+        """Groq reports server-side queue and prompt (prefill) time; without them use the full latency."""
+        queue_time = getattr(usage, "queue_time", None)
+        prompt_time = getattr(usage, "prompt_time", None)
+        if queue_time is None or prompt_time is None:
+            return latency
+        network = max(0.0, latency - (getattr(usage, "total_time", None) or latency))
+        return min(latency, network + queue_time + prompt_time)
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": sum(1 for w in self._waiters if not w[3].done()),
+            "request_tokens": round(self.requests.level, 1),
+            "llm_tokens": round(self.tokens.level, 1),
+        }
+
+
+_governor: Optional[LLMGovernor] = None
+
+
+def get_llm_governor() -> LLMGovernor:
+    """Get or create the process-wide governor (all callers share one budget)."""
+    global _governor
+    if _governor is None:
+        _governor = LLMGovernor()
+    return _governor
+
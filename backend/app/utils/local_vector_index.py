@@ -0,0 +1,143 @@
+"""
+In-process vector index with the subset of the Pinecone ``Index`` API we use.
+
+Selected with ``VECTOR_BACKEND=local`` for offline development, load tests and
+scale tests. Vectors are kept L2-normalized in a growable NumPy matrix, so a
+query is one matrix-vector product (cosine similarity) plus ``argpartition``.
+Optionally persisted to an ``.npz`` file.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class LocalVectorIndex:
+    """Brute-force cosine index: upsert / query / delete / fetch / describe_index_stats."""
+
+    def __init__(self, dimension: int = 384, path: Optional[str] = None):
+        self.dimension = dimension
+        self.path = path
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def upsert(self, vectors: Iterable[Any], namespace: str = "", **_):
+        """Accepts Pinecone-style dicts or ``(id, values, metadata)`` tuples."""
+        records = []
+        for vector in vectors:
+            if isinstance(vector, dict):
+                records.append((vector["id"], vector["values"], vector.get("metadata") or {}))
+            else:
+                vector_id, values, *rest = vector
+                records.append((vector_id, values, rest[0] if rest else {}))
+        if not records:
+            return {"upserted_count": 0}
+
+        values = self._normalize(np.asarray([r[1] for r in records], dtype=np.float32))
+        with self._lock:
+            new_rows = []
+            for (vector_id, _, metadata), row in zip(records, values):
+                position = self._positions.get(vector_id)
+                if position is None:
+                    self._positions[vector_id] = len(self._ids) + len(new_rows)
+                    new_rows.append(row)
+                    self._ids.append(vector_id)
+                    self._metadata.append(dict(metadata))
+                else:
+                    self._vectors[position] = row
+                    self._metadata[position] = dict(metadata)
+            if new_rows:
+                self._vectors = np.vstack([self._vectors, np.asarray(new_rows, dtype=np.float32)])
+        return {"upserted_count": len(records)}
+
+    def query(self, vector=None, top_k: int = 10, include_metadata: bool = False, filter=None, **_) -> Dict[str, Any]:
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        with self._lock:
+            if not self._ids:
+                return {"matches": []}
+            scores = self._vectors @ query
+            if filter:
+                mask = np.array([_matches_filter(m, filter) for m in self._metadata], dtype=bool)
+                scores = np.where(mask, scores, -np.inf)
+            k = min(top_k, len(self._ids))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            matches = []
+            for i in top:
+                if not np.isfinite(scores[i]):
+                    continue
+                match = {"id": self._ids[i], "score": float(scores[i])}
+                if include_metadata:
+                    match["metadata"] = dict(self._metadata[i])
+                matches.append(match)
+        return {"matches": matches}
+
+    def fetch(self, ids: List[str], **_) -> Dict[str, Any]:
+        with self._lock:
+            return {"vectors": {
+                vector_id: {"id": vector_id, "values": self._vectors[p].tolist(), "metadata": dict(self._metadata[p])}
+                for vector_id in ids if (p := self._positions.get(vector_id)) is not None
+            }}
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False, **_):
+        with self._lock:
+            if delete_all:
+                keep = []
+            else:
+                drop = set(ids or [])
+                keep = [i for i, vector_id in enumerate(self._ids) if vector_id not in drop]
+            self._vectors = self._vectors[keep] if keep else np.zeros((0, self.dimension), dtype=np.float32)
+            self._ids = [self._ids[i] for i in keep]
+            self._metadata = [self._metadata[i] for i in keep]
+            self._positions = {vector_id: i for i, vector_id in enumerate(self._ids)}
+        return {}
+
+    def describe_index_stats(self, **_) -> Dict[str, Any]:
+        return {"dimension": self.dimension, "total_vector_count": len(self._ids)}
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        with self._lock:
+            np.savez(path, vectors=self._vectors, ids=np.asarray(self._ids, dtype=object),
+                     metadata=np.asarray([json.dumps(m) for m in self._metadata], dtype=object))
+
+    def _load(self, path: str):
+        data = np.load(path, allow_pickle=True)
+        self._vectors = data["vectors"].astype(np.float32)
+        self._ids = [str(i) for i in data["ids"]]
+        self._metadata = [json.loads(m) for m in data["metadata"]]
+        self._positions = {vector_id: i for i, vector_id in enumerate(self._ids)}
+        self.dimension = self._vectors.shape[1] if len(self._ids) else self.dimension
+
+
+def _matches_filter(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    """Equality and ``$in`` filters (the subset of Pinecone's syntax we need)."""
+    for key, condition in filter.items():
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+        elif value != condition:
+            return False
+    return True
@@ -0,0 +1,82 @@
+"""
+ONNX Runtime sentence encoder for CPU serving.
+
+Runs all-MiniLM-L6-v2 exported to ONNX (see ``export_embedding_model.py``)
+without importing PyTorch. It reproduces the sentence-transformers pipeline
+for this model (tokenize, mean-pool over the attention mask, L2-normalize), so
+vectors are interchangeable with ``SentenceTransformer.encode`` output.
+
+Model directory layout::
+
+    models/all-MiniLM-L6-v2-onnx/
+        model.onnx          # fp32 export
+        model.int8.onnx     # dynamically quantized (optional)
+        tokenizer.json
+"""
+import logging
+import os
+from typing import List, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_SEQ_LENGTH = 256  # all-MiniLM-L6-v2 max_seq_length
+
+
+class OnnxSentenceEncoder:
+    """Drop-in replacement for ``SentenceTransformer.encode`` backed by onnxruntime."""
+
+    def __init__(self, model_dir: str, quantized: bool = True, threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = os.path.join(model_dir, "model.int8.onnx" if quantized else "model.onnx")
+        if quantized and not os.path.exists(model_file):
+            logger.warning(f"Quantized model not found in {model_dir}, falling back to fp32")
+            model_file = os.path.join(model_dir, "model.onnx")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            model_file, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.model_file = model_file
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32) -> np.ndarray:
+        """Encode one sentence (-> 1-D array) or a list (-> 2-D array), like SentenceTransformer."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = [
+            self._encode_batch(texts[i:i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ]
+        embeddings = np.vstack(batches) if batches else np.zeros((0, 384), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens, then L2 normalization
+        mask = attention_mask[..., np.newaxis].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled = summed / counts
+        norms = np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return (pooled / norms).astype(np.float32)
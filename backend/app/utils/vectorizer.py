@@ -1,34 +1,121 @@
+import asyncio
 import numpy as np
 import logging
+import threading
+import time
+import zlib
+
+from app.core.config import settings
+from app.core.metrics import EMBEDDING_DURATION
+from app.core.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
 # Model will be loaded lazily on first use
 _vector_engine_instance = None
+_vector_engine_lock = threading.Lock()
+
+class HashingEncoder:
+    """Deterministic feature-hashing embedder (not semantic): offline load/scale tests only."""
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def _encode_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in text.lower().split():
+            digest = zlib.crc32(token.encode("utf-8"))
+            vector[digest % self.dimension] += 1.0 if digest & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, texts, batch_size: int = 64):
+        if isinstance(texts, str):
+            return self._encode_one(texts)
+        return np.stack([self._encode_one(t) for t in texts]) if texts else np.zeros((0, self.dimension))
+
 
 class VectorEngine:
-    def __init__(self, model_name='all-MiniLM-L6-v2'):
+    def __init__(self, model_name='all-MiniLM-L6-v2', backend=None):
         self.model = None
         self.model_name = model_name
+        # "torch" (sentence-transformers), "onnx" (onnxruntime, no PyTorch import) or "hash" (tests)
+        self.backend = (backend or settings.EMBEDDING_BACKEND).lower()
         self._initialized = False
+        # Guards the one-time model load against concurrent first callers
+        self._load_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._initialized
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the vector space: backend, model and quantization (e.g. ``onnx:all-MiniLM-L6-v2:int8``)."""
+        quantized = self.backend == "onnx" and settings.EMBEDDING_ONNX_QUANTIZED
+        return f"{self.backend}:{self.model_name}:{'int8' if quantized else 'fp32'}"
 
     def _ensure_loaded(self):
-        """Lazy-load the model on first use."""
-        if not self._initialized:
+        """Lazy-load the model on first use (exactly once, even under concurrency)."""
+        if self._initialized:
+            return
+        with self._load_lock:
+            if self._initialized:
+                return
             try:
-                logger.info(f"Loading SentenceTransformer model: {self.model_name}")
-                from sentence_transformers import SentenceTransformer
-                self.model = SentenceTransformer(self.model_name)
+                if self.backend == "onnx":
+                    self.model = self._load_onnx()
+                elif self.backend == "hash":
+                    self.model = HashingEncoder()
+                else:
+                    self.model = self._load_torch()
                 self._initialized = True
-                logger.info("SentenceTransformer model loaded successfully")
             except Exception as e:
-                logger.error(f"Failed to load SentenceTransformer: {e}")
+                logger.error(f"Failed to load embedding model ({self.backend}): {e}")
                 raise
 
+    def _load_torch(self):
+        logger.info(f"Loading SentenceTransformer model: {self.model_name}")
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(self.model_name)
+        logger.info("SentenceTransformer model loaded successfully")
+        return model
+
+    def _load_onnx(self):
+        from app.utils.onnx_encoder import OnnxSentenceEncoder
+        model = OnnxSentenceEncoder(
+            settings.EMBEDDING_ONNX_DIR,
+            quantized=settings.EMBEDDING_ONNX_QUANTIZED,
+            threads=settings.EMBEDDING_THREADS,
+        )
+        logger.info(f"ONNX embedding model loaded successfully: {model.model_file}")
+        return model
+
+    def warm_up(self) -> float:
+        """Load the model and run a dummy encode; returns seconds taken."""
+        start = time.perf_counter()
+        self._ensure_loaded()
+        self.model.encode("warm-up")
+        return time.perf_counter() - start
+
     def get_embedding(self, text: str):
         """Converts text into a 384-dimensional vector."""
         self._ensure_loaded()
-        return self.model.encode(text).tolist()
+        with start_span("embedding.encode", **{"embedding.backend": self.backend, "embedding.texts": 1}) as span:
+            vector = self.model.encode(text).tolist()
+        EMBEDDING_DURATION.labels(self.backend).observe(span.duration)
+        return vector
+
+    def get_embeddings(self, texts, batch_size: int = 64):
+        """Embed many texts in batches; much faster than repeated get_embedding calls."""
+        self._ensure_loaded()
+        if not texts:
+            return []
+        texts = list(texts)
+        with start_span("embedding.encode", **{"embedding.backend": self.backend, "embedding.texts": len(texts)}) as span:
+            vectors = self.model.encode(texts, batch_size=batch_size).tolist()
+        EMBEDDING_DURATION.labels(self.backend).observe(span.duration)
+        return vectors
 
     def calculate_similarity(self, vector_a, vector_b):
         """Calculates how close a dev's skill is to a problem statement."""
@@ -39,8 +126,19 @@ def get_vector_engine():
     """Get or create the vector engine instance."""
     global _vector_engine_instance
     if _vector_engine_instance is None:
-        _vector_engine_instance = VectorEngine()
+        with _vector_engine_lock:
+            if _vector_engine_instance is None:
+                _vector_engine_instance = VectorEngine()
     return _vector_engine_instance
 
 
-vector_engine = None  # Will be initialized on first use
\ No newline at end of file
+async def warm_up_vector_engine():
+    """Load the embedding model in a worker thread (call from application startup)."""
+    try:
+        seconds = await asyncio.to_thread(get_vector_engine().warm_up)
+        logger.info(f"[OK] Embedding model warmed up in {seconds:.2f}s")
+    except Exception as e:
+        logger.warning(f"[WARN] Embedding model warm-up failed (will retry on first use): {e}")
+
+
+vector_engine = None  # Will be initialized on first use
@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+"""
+Micro-benchmarks for hot functions, with stored baselines and regression gates.
+
+Each benchmark is calibrated so one round takes at least --min-round-ms, then
+repeated for --max-time seconds (at least --min-rounds rounds), split over
+--passes interleaved passes through all benchmarks. Per-call
+min/median/mean/stddev/IQR are reported (pytest-benchmark style).
+
+The gate is noise-aware: a benchmark only fails when its minimum is both more
+than its threshold percent slower than the baseline minimum *and* slower by
+more than --noise-k times the larger of the two runs' IQR. A slowdown that is
+within the run-to-run spread is reported as "noise" instead of failing.
+
+    python benchmarks.py --save                 # record benchmark_baseline.json
+    python benchmarks.py --compare              # exit 1 if any benchmark regresses past its threshold
+    python benchmarks.py --compare -k skill     # only benchmarks whose name contains "skill"
+    python benchmarks.py --embedder hash        # benchmark get_embedding without the model
+
+Recommended CI invocation (record the baseline on the same runner type from
+the target branch, then gate the change against it)::
+
+    python benchmarks.py --embedder hash --max-time 5 --save  /tmp/baseline.json   # target branch
+    python benchmarks.py --embedder hash --max-time 5 --compare /tmp/baseline.json # change
+
+Baselines are only comparable on the same machine and Python; a warning is
+printed when the stored machine info differs. Re-record the baseline whenever
+an intentional change moves a number.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 20.0  # Percent slowdown of the minimum that fails --compare
+DEFAULT_NOISE_K = 3.0  # ... and only if the slowdown also exceeds this many IQRs
+
+USER_SKILLS = ["Python", "FastAPI", "React", "Docker", "PostgreSQL", "TensorFlow"]
+REQUIRED_SKILLS = ["python", "React.js", "Kubernetes", "AWS", "machine learning"]
+PROBLEM_STATEMENT = (
+    "Build a real-time dashboard to monitor smart contract vulnerabilities using React, "
+    "ethers.js, and Solidity, with alerting for suspicious transactions."
+)
+
+
+class Benchmark:
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]], threshold: float = DEFAULT_THRESHOLD):
+        self.name = name
+        self.setup = setup  # Returns the zero-argument callable to time
+        self.threshold = threshold
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_skill_match():
+    from app.api.matching import calculate_skill_match
+    return lambda: calculate_skill_match(USER_SKILLS, REQUIRED_SKILLS)
+
+
+def bench_difficulty_match():
+    from app.api.matching import calculate_difficulty_match
+    return lambda: calculate_difficulty_match(2.5, "advanced")
+
+
+def bench_get_embedding():
+    from app.utils.vectorizer import get_vector_engine
+    engine = get_vector_engine()
+    engine.warm_up()
+    return lambda: engine.get_embedding(PROBLEM_STATEMENT)
+
+
+def bench_parse_skills():
+    from app.api.auth_db import parse_skills
+    skills = json.dumps(USER_SKILLS)
+    return lambda: parse_skills(skills)
+
+
+def bench_build_user_response():
+    from app.api.auth_db import build_user_response
+    from app.models.database import User
+    user = User(id="3f1c2b9e-0000-4000-8000-000000000001", email="dev@example.com", username="dev",
+                full_name="Dev Eloper", avatar_url=None, skills=json.dumps(USER_SKILLS), bio="Builder")
+    return lambda: build_user_response(user)
+
+
+def bench_validate_access_token():
+    from app.api.auth_db import create_access_token
+    from app.core.security import TokenValidator
+    token = create_access_token("3f1c2b9e-0000-4000-8000-000000000001")
+    return lambda: TokenValidator.validate_access_token(token)
+
+
+def bench_hackathon_match_model():
+    from datetime import datetime
+    from app.api.matches import HackathonMatch
+    hackathon = {
+        "_id": "65f0c0ffee0000000000abcd", "title": "DeFi Guard", "description": PROBLEM_STATEMENT,
+        "platform": "devpost", "difficulty": "advanced", "prize_pool": 10000,
+        "start_date": datetime(2026, 3, 1), "end_date": datetime(2026, 3, 3),
+        "registration_link": "https://devpost.com/defi-guard", "theme": "web3 security",
+    }
+    matched = ["python", "react.js"]
+
+    # Mirrors the constructor call in find_matches
+    def construct():
+        return HackathonMatch(
+            id=str(hackathon["_id"]),
+            title=hackathon["title"],
+            description=hackathon["description"],
+            platform=hackathon["platform"],
+            difficulty=hackathon["difficulty"],
+            skills_match=0.4,
+            win_probability=0.48,
+            prize_pool=hackathon.get("prize_pool", 0),
+            matched_skills=matched,
+            missing_skills=[s for s in REQUIRED_SKILLS if s not in matched],
+            start_date=hackathon["start_date"],
+            end_date=hackathon["end_date"],
+            registration_link=hackathon.get("registration_link", ""),
+            theme=hackathon.get("theme", ""),
+        )
+    return construct
+
+
+def bench_format_boilerplate():
+    from app.main_lite import _format_boilerplate
+    files = {
+        "backend/main.py": "from fastapi import FastAPI\n\napp = FastAPI()\n" * 20,
+        "frontend/App.jsx": "export default function App() {\n  return <div />;\n}\n" * 20,
+        "docker-compose.yml": "services:\n  api:\n    build: ./backend\n" * 5,
+        "requirements.txt": "fastapi\nuvicorn\n",
+    }
+    return lambda: _format_boilerplate(files)
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("matching.calculate_skill_match", bench_skill_match),
+    Benchmark("matching.calculate_difficulty_match", bench_difficulty_match),
+    Benchmark("vectorizer.get_embedding", bench_get_embedding, threshold=30.0),
+    Benchmark("auth_db.parse_skills", bench_parse_skills),
+    Benchmark("auth_db.build_user_response", bench_build_user_response),
+    Benchmark("security.validate_access_token", bench_validate_access_token),
+    Benchmark("matches.HackathonMatch", bench_hackathon_match_model),
+    Benchmark("main_lite._format_boilerplate", bench_format_boilerplate),
+]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def calibrate(func: Callable, min_round_seconds: float) -> int:
+    """Smallest power-of-ten loop count that makes one round last at least min_round_seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= min_round_seconds or loops >= 10_000_000:
+            return loops
+        loops *= 10
+
+
+def measure(func: Callable, loops: int, max_time: float, min_rounds: int) -> List[float]:
+    """Per-call seconds for each round of ``loops`` calls, for at least max_time / min_rounds."""
+    per_call = []
+    deadline = time.perf_counter() + max_time
+    while len(per_call) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_call.append((time.perf_counter() - start) / loops)
+    return per_call
+
+
+def summarize(per_call: List[float], loops: int) -> Dict[str, float]:
+    quartiles = statistics.quantiles(per_call, n=4) if len(per_call) > 1 else [per_call[0]] * 3
+    median = statistics.median(per_call)
+    return {
+        "min": min(per_call),
+        "median": median,
+        "mean": statistics.fmean(per_call),
+        "stddev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "iqr": quartiles[2] - quartiles[0],
+        "ops": 1.0 / median if median else 0.0,
+        "rounds": len(per_call),
+        "loops": loops,
+    }
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def machine_info() -> Dict[str, str]:
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def compare(results: Dict[str, dict], baseline: dict, threshold_override: Optional[float],
+            noise_k: float = DEFAULT_NOISE_K) -> bool:
+    if baseline.get("machine") != machine_info():
+        print("⚠️  Baseline was recorded on a different machine/Python; numbers may not be comparable")
+    print(f"\nvs baseline {(baseline.get('git_commit') or '?')[:10]} ({baseline.get('timestamp', '?')})")
+    print(f"{'benchmark (min)':<40}{'baseline':>14}{'current':>14}{'Δ%':>9}{'limit':>8}")
+    thresholds = {b.name: b.threshold for b in BENCHMARKS}
+    ok = True
+    for name, stats in results.items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base:
+            print(f"{name:<40}{'-':>14}{_fmt(stats['min']):>14}{'new':>9}")
+            continue
+        delta = (stats["min"] - base["min"]) / base["min"] * 100
+        limit = threshold_override if threshold_override is not None else thresholds.get(name, DEFAULT_THRESHOLD)
+        noise = noise_k * max(base.get("iqr", 0.0), stats["iqr"])
+        flag = ""
+        if delta > limit:
+            if stats["min"] - base["min"] > noise:
+                ok, flag = False, "  ❌ regression"
+            else:
+                flag = f"  ~ noise (< {noise_k:g}×IQR = {_fmt(noise)})"
+        print(f"{name:<40}{_fmt(base['min']):>14}{_fmt(stats['min']):>14}{delta:>+9.1f}{limit:>7.0f}%{flag}")
+    return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks with baseline regression gates")
+    parser.add_argument("-k", "--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="Write results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="Fail on regressions vs this baseline")
+    parser.add_argument("--threshold", type=float, help="Override every benchmark's allowed regression (percent)")
+    parser.add_argument("--embedder", choices=["configured", "hash"], default="configured",
+                        help="Embedding backend for get_embedding (hash needs no model)")
+    parser.add_argument("--noise-k", type=float, default=DEFAULT_NOISE_K,
+                        help="A slowdown must also exceed this many IQRs to fail --compare")
+    parser.add_argument("--min-round-ms", type=float, default=10.0)
+    parser.add_argument("--max-time", type=float, default=3.0, help="Seconds of rounds per benchmark (all passes)")
+    parser.add_argument("--min-rounds", type=int, default=30, help="Rounds per benchmark (all passes)")
+    parser.add_argument("--passes", type=int, default=5, help="Interleaved passes over the benchmarks")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.list:
+        for bench in BENCHMARKS:
+            print(f"{bench.name}  (threshold {bench.threshold:.0f}%)")
+        return 0
+
+    # Settings are read at import time; keep the import side effects local and quiet
+    os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.mkdtemp(prefix="hackquest-bench-"), "bench.db"))
+    os.environ["TRACING_EXPORTER"] = "none"
+    os.environ.setdefault("MODEL_WARMUP", "false")
+    if args.embedder == "hash":
+        os.environ["EMBEDDING_BACKEND"] = "hash"
+    import logging
+    logging.disable(logging.WARNING)
+
+    selected = [b for b in BENCHMARKS if not args.filter or args.filter in b.name]
+    print(f"⏱️  Running {len(selected)} benchmarks (Python {platform.python_version()}, {platform.machine()})\n")
+    print(f"{'benchmark':<40}{'min':>12}{'median':>12}{'mean':>12}{'stddev':>12}{'ops/s':>14}{'rounds':>8}")
+    funcs: Dict[str, Callable] = {}
+    loops: Dict[str, int] = {}
+    for bench in selected:
+        try:
+            func = bench.setup()
+            for _ in range(3):  # Warm caches and lazy imports
+                func()
+        except Exception as e:
+            print(f"{bench.name:<40}  ⚠️  skipped: {e.__class__.__name__}: {e}")
+            continue
+        funcs[bench.name] = func
+        loops[bench.name] = calibrate(func, args.min_round_ms / 1000)
+
+    # Interleave passes over all benchmarks so a burst of machine noise hits
+    # every benchmark a little instead of one benchmark entirely
+    samples: Dict[str, List[float]] = {name: [] for name in funcs}
+    passes = max(1, args.passes)
+    for _ in range(passes):
+        for name, func in funcs.items():
+            samples[name] += measure(func, loops[name], args.max_time / passes, -(-args.min_rounds // passes))
+
+    results: Dict[str, dict] = {}
+    for name in funcs:
+        stats = results[name] = summarize(samples[name], loops[name])
+        print(f"{name:<40}{_fmt(stats['min']):>12}{_fmt(stats['median']):>12}{_fmt(stats['mean']):>12}"
+              f"{_fmt(stats['stddev']):>12}{stats['ops']:>14,.0f}{stats['rounds']:>8}")
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print(f"\n❌ No baseline at {args.compare}; record one with --save")
+            exit_code = 1
+        else:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            if not compare(results, baseline, args.threshold, args.noise_k):
+                exit_code = 1
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.save):
+            with open(args.save) as f:
+                baseline = json.load(f)
+        # Partial runs (-k) update only the benchmarks they ran
+        benchmarks = {**baseline.get("benchmarks", {}), **results} if baseline.get("machine") == machine_info() else results
+        with open(args.save, "w") as f:
+            json.dump({
+                "git_commit": git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "machine": machine_info(),
+                "benchmarks": benchmarks,
+            }, f, indent=2)
+        print(f"\n💾 Baseline written to {args.save}")
+
+    if exit_code == 0 and args.compare:
+        print("\n✅ No regressions")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
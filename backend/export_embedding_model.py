@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Export all-MiniLM-L6-v2 to ONNX (fp32 + int8) for EMBEDDING_BACKEND=onnx.
+
+Needs the full ML stack (torch, sentence-transformers, onnxruntime); the
+serving workers then only need onnxruntime + tokenizers.
+
+Usage:
+    python export_embedding_model.py
+    python export_embedding_model.py --out models/all-MiniLM-L6-v2-onnx --no-quantize
+"""
+import argparse
+import os
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+from app.core.config import settings
+
+
+def export(model_name: str, out_dir: str, quantize: bool = True):
+    os.makedirs(out_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    # Fast tokenizer -> tokenizer.json, loadable by the `tokenizers` package alone
+    tokenizer.save_pretrained(out_dir)
+
+    sample = tokenizer(["warm-up sentence"], return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            do_constant_folding=True,
+        )
+    print(f"✅ Exported {fp32_path} ({os.path.getsize(fp32_path) / 1e6:.1f} MB)")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = os.path.join(out_dir, "model.int8.onnx")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        print(f"✅ Quantized {int8_path} ({os.path.getsize(int8_path) / 1e6:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--out", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="Skip int8 dynamic quantization")
+    args = parser.parse_args()
+    export(args.model, args.out, quantize=not args.no_quantize)
+
+
+if __name__ == "__main__":
+    main()
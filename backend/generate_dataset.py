@@ -0,0 +1,467 @@
+#!/usr/bin/env python
+"""
+Synthetic large-scale dataset generator for scale testing.
+
+Generates hackathons and users with realistic (long-tailed) skill popularity,
+per-domain skill affinity, weighted platforms and difficulties, log-normal
+prize pools and spread-out deadlines, then bulk-loads them:
+
+* SQLite   - hackathons, users and user_skills via batched executemany inserts
+* MongoDB  - hackathons and users via unordered insert_many batches
+* Vectors  - hackathon embeddings through HackathonIndexer when Mongo is loaded
+             (so later reindexes skip them), otherwise embedded and upserted directly
+
+The same --seed and --anchor-date always produce the same rows (ids and dates
+included), so runs against different commits see identical data. Everything is streamed in --batch-size
+chunks, so memory stays flat at 100k hackathons / 1M users.
+
+Every synthetic row is marked (ids/platform_ids/emails prefixed "syn"), and
+--reset removes previously generated rows before loading (without it, a run
+against a database that already has synthetic rows exits before loading).
+
+Usage:
+    python generate_dataset.py --hackathons 100000 --users 1000000
+    python generate_dataset.py --hackathons 5000 --users 20000 --targets sqlite,vectors --seed 7
+    VECTOR_BACKEND=local LOCAL_VECTOR_INDEX_PATH=scale.npz EMBEDDING_BACKEND=hash \\
+        python generate_dataset.py --targets sqlite,vectors
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+import bcrypt
+from bson.objectid import ObjectId
+
+SYNTHETIC_PREFIX = "syn"
+DEFAULT_PASSWORD = "Synthetic123!"
+
+# Skills per domain, most popular first; popularity within a domain is Zipf-like
+DOMAINS: Dict[str, List[str]] = {
+    "web": ["JavaScript", "React", "TypeScript", "Node.js", "HTML", "CSS", "Next.js", "Tailwind",
+            "Vue.js", "Express", "GraphQL", "Svelte", "Angular"],
+    "backend": ["Python", "FastAPI", "PostgreSQL", "Django", "Go", "Redis", "MongoDB", "Java",
+                "Spring Boot", "Flask", "gRPC", "Kafka", "Rust"],
+    "ai": ["Python", "Machine Learning", "PyTorch", "TensorFlow", "LangChain", "NLP", "Computer Vision",
+           "scikit-learn", "Hugging Face", "OpenCV", "LLMs", "Pandas"],
+    "web3": ["Solidity", "Ethereum", "Web3.js", "ethers.js", "Hardhat", "Rust", "Smart Contracts",
+             "IPFS", "Polygon", "Solana"],
+    "mobile": ["Flutter", "React Native", "Kotlin", "Swift", "Dart", "Firebase", "Android", "iOS"],
+    "cloud": ["Docker", "AWS", "Kubernetes", "Terraform", "GCP", "Azure", "CI/CD", "Linux", "Serverless"],
+    "data": ["SQL", "Pandas", "Data Visualization", "Spark", "Tableau", "Power BI", "Airflow", "dbt"],
+    "iot": ["C++", "Arduino", "Raspberry Pi", "IoT", "Embedded C", "MQTT", "Python"],
+    "security": ["Cybersecurity", "Cryptography", "Penetration Testing", "Python", "Networking", "Linux"],
+    "design": ["Figma", "UI/UX", "Prototyping", "Design Systems", "Accessibility"],
+}
+DOMAIN_WEIGHTS = {"web": 24, "ai": 22, "backend": 14, "web3": 8, "mobile": 8, "cloud": 7, "data": 6,
+                  "iot": 4, "security": 4, "design": 3}
+THEMES = {
+    "web": ["Developer Tools", "Social Impact", "Productivity", "Open Innovation"],
+    "backend": ["FinTech", "Logistics", "Developer Tools", "E-Commerce"],
+    "ai": ["Healthcare", "Education", "Climate", "Agriculture", "Generative AI"],
+    "web3": ["DeFi", "Web3 Security", "DAOs", "NFT Infrastructure"],
+    "mobile": ["Accessibility", "Healthcare", "Smart Cities", "Travel"],
+    "cloud": ["DevOps", "Sustainability", "Developer Tools"],
+    "data": ["Open Data", "Public Policy", "Sports Analytics", "FinTech"],
+    "iot": ["Agriculture", "Smart Cities", "Energy", "Disaster Response"],
+    "security": ["Cybersecurity", "Privacy", "Fraud Detection"],
+    "design": ["Accessibility", "Education", "Social Impact"],
+}
+VERBS = ["Build", "Design", "Create", "Develop", "Prototype", "Ship"]
+OBJECTS = ["platform", "dashboard", "assistant", "marketplace", "mobile app", "API", "analytics engine",
+           "browser extension", "tracker", "simulator"]
+AUDIENCES = ["rural clinics", "small businesses", "students", "city planners", "farmers", "NGOs",
+             "first responders", "remote teams", "senior citizens", "open-source maintainers"]
+
+# platform value (matches PlatformEnum) -> (weight, id prefix)
+PLATFORMS = {"devpost": (30, "devpost"), "unstop": (20, "unstop"), "devfolio": (18, "devfolio"),
+             "major_league_hacking": (12, "mlh"), "hackerearth": (10, "hackerearth"),
+             "sih": (5, "sih"), "github": (5, "github")}
+DIFFICULTIES = {"beginner": 30, "intermediate": 45, "advanced": 20, "expert": 5}
+LOCATIONS = {"Online": 60, "Bengaluru": 8, "San Francisco": 6, "London": 5, "Berlin": 4, "New York": 5,
+             "Singapore": 4, "Hyderabad": 4, "Toronto": 4}
+FIRST_NAMES = ["Aarav", "Maya", "Liam", "Priya", "Noah", "Zara", "Ethan", "Ananya", "Lucas", "Sofia",
+               "Kabir", "Emma", "Arjun", "Chloe", "Rohan", "Amara", "Leo", "Isha", "Mateo", "Yuki"]
+LAST_NAMES = ["Sharma", "Smith", "Patel", "Garcia", "Chen", "Kumar", "Müller", "Okafor", "Rossi", "Kim",
+              "Singh", "Nguyen", "Silva", "Haddad", "Cohen", "Ivanova", "Tanaka", "Mensah", "Reyes", "Das"]
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+class SyntheticDataset:
+    """Deterministic row generator; every stream is derived from ``seed``."""
+
+    def __init__(self, seed: int, now: datetime):
+        self.seed = seed
+        self.now = now
+        self.domains = list(DOMAIN_WEIGHTS)
+        self.domain_weights = list(DOMAIN_WEIGHTS.values())
+        self.skill_weights = {d: _zipf_weights(len(skills)) for d, skills in DOMAINS.items()}
+        self.platforms = list(PLATFORMS)
+        self.platform_weights = [w for w, _ in PLATFORMS.values()]
+        self.difficulties = list(DIFFICULTIES)
+        self.difficulty_weights = list(DIFFICULTIES.values())
+        self.locations = list(LOCATIONS)
+        self.location_weights = list(LOCATIONS.values())
+
+    @staticmethod
+    def _object_id(rng: random.Random) -> ObjectId:
+        return ObjectId(rng.getrandbits(96).to_bytes(12, "big"))
+
+    def _skills(self, rng: random.Random, domains: List[str], count: int) -> List[str]:
+        chosen: List[str] = []
+        attempts = 0
+        while len(chosen) < count and attempts < count * 6:
+            attempts += 1
+            domain = rng.choice(domains)
+            skill = rng.choices(DOMAINS[domain], weights=self.skill_weights[domain])[0]
+            if skill not in chosen:
+                chosen.append(skill)
+        return chosen
+
+    def hackathons(self, count: int) -> Iterator[dict]:
+        rng = random.Random(f"{self.seed}:hackathons")
+        for i in range(count):
+            domain = rng.choices(self.domains, weights=self.domain_weights)[0]
+            # Most hackathons are single-domain; a third mix in a second one (e.g. AI + web)
+            domains = [domain] + ([rng.choices(self.domains, weights=self.domain_weights)[0]] if rng.random() < 0.33 else [])
+            skills = self._skills(rng, domains, rng.choices([2, 3, 4, 5, 6], weights=[15, 35, 30, 15, 5])[0])
+            theme = rng.choice(THEMES[domain])
+            platform = rng.choices(self.platforms, weights=self.platform_weights)[0]
+            difficulty = rng.choices(self.difficulties, weights=self.difficulty_weights)[0]
+
+            # Starts from six months ago to a year ahead; most run a weekend, some are month-long online events
+            start = (self.now + timedelta(days=rng.uniform(-180, 365))).replace(minute=0, second=0, microsecond=0)
+            days = rng.choices([1, 2, 3, 7, 30], weights=[15, 45, 25, 10, 5])[0]
+            end = start + timedelta(days=days)
+            registration_deadline = start - timedelta(days=rng.choice([1, 3, 7, 14]))
+            prize_pool = int(round(math.exp(rng.gauss(9.2, 1.1)), -2))  # Median ~$10k, long tail
+
+            statement = (f"{rng.choice(VERBS)} a {rng.choice(OBJECTS)} for {rng.choice(AUDIENCES)} "
+                         f"in {theme.lower()} using {', '.join(skills[:-1]) + ' and ' + skills[-1] if len(skills) > 1 else skills[0]}.")
+            platform_id = f"{SYNTHETIC_PREFIX}-{PLATFORMS[platform][1]}-{i:07d}"
+            yield {
+                "_id": self._object_id(rng),
+                "platform_id": platform_id,
+                "title": f"{theme} {rng.choice(['Hack', 'Challenge', 'Sprint', 'Jam', 'Buildathon'])} {start.year}",
+                "description": statement,
+                "theme": theme,
+                "platform": platform,
+                "difficulty": difficulty,
+                "required_skills": skills,
+                "prize_pool": prize_pool,
+                "location": rng.choices(self.locations, weights=self.location_weights)[0],
+                "team_size": rng.choice(["1-4", "2-4", "2-5", "1-3"]),
+                "start_date": start,
+                "end_date": end,
+                "registration_deadline": registration_deadline,
+                "registration_link": f"https://example.com/{platform_id}",
+                "is_active": end >= self.now,
+                "created_at": start - timedelta(days=rng.randint(14, 90)),
+                "updated_at": self.now,
+            }
+
+    def users(self, count: int) -> Iterator[dict]:
+        rng = random.Random(f"{self.seed}:users")
+        for i in range(count):
+            # Users specialise: a primary domain plus occasional secondary ones
+            domains = [rng.choices(self.domains, weights=self.domain_weights)[0]]
+            while rng.random() < 0.35 and len(domains) < 3:
+                domains.append(rng.choices(self.domains, weights=self.domain_weights)[0])
+            skill_count = min(15, max(1, int(rng.lognormvariate(1.5, 0.5))))
+            skills = self._skills(rng, domains, skill_count)
+
+            participated = min(60, int(rng.expovariate(1 / 3)))
+            won = sum(1 for _ in range(participated) if rng.random() < 0.12)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            username = f"{SYNTHETIC_PREFIX}_{first.lower()}{i}"
+            created = self.now - timedelta(days=rng.uniform(0, 720))
+            yield {
+                "_id": self._object_id(rng),
+                "email": f"{username}@example.com",
+                "username": username,
+                "full_name": f"{first} {last}",
+                "avatar_url": None,
+                "github_username": f"{first.lower()}-{last.lower()}-{i}" if rng.random() < 0.6 else None,
+                "skills": skills,
+                "bio": f"{domains[0].title()} developer",
+                "hackathons_participated": participated,
+                "hackathons_won": won,
+                "win_rate": round(won / participated, 3) if participated else 0.0,
+                "created_at": created,
+                "updated_at": created,
+                "is_active": True,
+            }
+
+
+def batched(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Loaders
+# ---------------------------------------------------------------------------
+
+class SQLiteLoader:
+    """Core-level executemany inserts, one transaction per batch."""
+
+    def __init__(self, password_hash: str):
+        from app.core.db import engine, init_db
+        from app.models import hackathon_models  # noqa: F401 - registers the tables on Base
+        from app.models.database import User
+        from app.models.hackathon_models import Hackathon, UserSkills
+
+        init_db()
+        self.engine = engine
+        # Bulk load: don't fsync every batch (the StaticPool connection keeps this setting)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        self.hackathons = Hackathon.__table__
+        self.users = User.__table__
+        self.user_skills = UserSkills.__table__
+        self.password_hash = password_hash
+
+    def has_synthetic_rows(self) -> bool:
+        from sqlalchemy import select
+        with self.engine.connect() as conn:
+            return any(conn.execute(select(table.c.id).where(condition).limit(1)).first() for table, condition in (
+                (self.hackathons, self.hackathons.c.platform_id.like(f"{SYNTHETIC_PREFIX}-%")),
+                (self.users, self.users.c.username.like(f"{SYNTHETIC_PREFIX}\\_%", escape="\\")),
+            ))
+
+    def reset(self):
+        from sqlalchemy import text
+        with self.engine.begin() as conn:
+            conn.execute(self.user_skills.delete().where(self.user_skills.c.id.like(f"{SYNTHETIC_PREFIX}-%")))
+            conn.execute(self.users.delete().where(self.users.c.username.like(f"{SYNTHETIC_PREFIX}\\_%", escape="\\")))
+            conn.execute(self.hackathons.delete().where(self.hackathons.c.platform_id.like(f"{SYNTHETIC_PREFIX}-%")))
+            conn.execute(text("PRAGMA optimize"))
+
+    def _bulk(self, table, rows: List[dict]):
+        with self.engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+
+    def load_hackathons(self, batch: List[dict]):
+        self._bulk(self.hackathons, [{
+            "id": str(h["_id"]),
+            "platform_id": h["platform_id"],
+            "title": h["title"],
+            "description": h["description"],
+            "platform": h["platform"],
+            "url": h["registration_link"],
+            "difficulty": h["difficulty"],
+            "required_skills": json.dumps(h["required_skills"]),
+            "prize_pool": f"${h['prize_pool']:,}",
+            "location": h["location"],
+            "team_size": h["team_size"],
+            "is_active": h["is_active"],
+            "created_at": h["created_at"],
+            "updated_at": h["updated_at"],
+        } for h in batch])
+
+    def load_users(self, batch: List[dict]):
+        self._bulk(self.users, [{
+            "id": str(u["_id"]),
+            "email": u["email"],
+            "username": u["username"],
+            "password_hash": self.password_hash,
+            "full_name": u["full_name"],
+            "avatar_url": None,
+            "bio": u["bio"],
+            "skills": json.dumps(u["skills"]),
+            "is_active": True,
+            "created_at": u["created_at"],
+            "updated_at": u["updated_at"],
+        } for u in batch])
+        self._bulk(self.user_skills, [{
+            "id": f"{SYNTHETIC_PREFIX}-{u['_id']}-{n}",
+            "user_id": str(u["_id"]),
+            "skill_name": skill,
+            "proficiency": "intermediate",
+            "years_of_experience": 0,
+            "created_at": u["created_at"],
+        } for u in batch for n, skill in enumerate(u["skills"])])
+
+
+class MongoLoader:
+    """Unordered insert_many batches (one round trip per batch)."""
+
+    def __init__(self, password_hash: str):
+        self.password_hash = password_hash
+
+    async def connect(self):
+        from app.core.database import init_db
+        await init_db()
+
+    async def close(self):
+        from app.core.database import close_db
+        await close_db()
+
+    async def has_synthetic_rows(self) -> bool:
+        from app.core.database import Collections
+        return bool(
+            await Collections.hackathons().count_documents({"platform_id": {"$regex": f"^{SYNTHETIC_PREFIX}-"}}, limit=1)
+            or await Collections.users().count_documents({"username": {"$regex": f"^{SYNTHETIC_PREFIX}_"}}, limit=1)
+        )
+
+    async def reset(self):
+        from app.core.database import Collections
+        hackathon_ids = [
+            str(doc["_id"]) async for doc in Collections.hackathons().find(
+                {"platform_id": {"$regex": f"^{SYNTHETIC_PREFIX}-"}}, {"_id": 1})
+        ]
+        await Collections.embeddings().delete_many({"owner_type": "hackathon", "owner_id": {"$in": hackathon_ids}})
+        await Collections.hackathons().delete_many({"platform_id": {"$regex": f"^{SYNTHETIC_PREFIX}-"}})
+        await Collections.users().delete_many({"username": {"$regex": f"^{SYNTHETIC_PREFIX}_"}})
+
+    async def load_hackathons(self, batch: List[dict]):
+        from app.core.database import Collections
+        await Collections.hackathons().insert_many(batch, ordered=False)
+
+    async def load_users(self, batch: List[dict]):
+        from app.core.database import Collections
+        await Collections.users().insert_many(
+            [{**u, "password_hash": self.password_hash} for u in batch], ordered=False,
+        )
+
+
+async def embed_direct(hackathons: List[dict], batch_size: int, upsert_chunk_size: int) -> int:
+    """Embed and upsert without Mongo, using the same text and metadata as HackathonIndexer."""
+    from app.core.database import get_pinecone_index
+    from app.utils.hackathon_indexer import METADATA_TEXT_LIMIT, hackathon_embedding_text
+    from app.utils.vectorizer import get_vector_engine
+
+    index = get_pinecone_index()
+    if index is None:
+        raise RuntimeError("No vector index available (set VECTOR_BACKEND=local or configure Pinecone)")
+    engine = get_vector_engine()
+    vectors = await asyncio.to_thread(engine.get_embeddings, [hackathon_embedding_text(h) for h in hackathons], batch_size)
+    records = [{
+        "id": str(h["_id"]),
+        "values": vector,
+        "metadata": {
+            "title": h["title"],
+            "problem_statement": h["description"][:METADATA_TEXT_LIMIT],
+            "platform": h["platform"],
+            "platform_id": h["platform_id"],
+            "difficulty": h["difficulty"],
+            "required_skills": h["required_skills"],
+        },
+    } for h, vector in zip(hackathons, vectors)]
+    for i in range(0, len(records), upsert_chunk_size):
+        await asyncio.to_thread(index.upsert, vectors=records[i:i + upsert_chunk_size])
+    return len(records)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def _progress(label: str, done: int, total: int, started: float):
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed else 0
+    print(f"\r   {label}: {done:,}/{total:,} ({rate:,.0f}/s)", end="", flush=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Synthetic large-scale dataset generator")
+    parser.add_argument("--hackathons", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5_000, help="Rows per insert batch")
+    parser.add_argument("--targets", default="sqlite,mongo,vectors",
+                        help="Comma-separated subset of sqlite, mongo, vectors")
+    parser.add_argument("--anchor-date", default=datetime.utcnow().strftime("%Y-%m-%d"),
+                        help="Date deadlines are generated around (YYYY-MM-DD, default today)")
+    parser.add_argument("--reset", action="store_true", help="Delete previously generated rows first")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password shared by every synthetic user")
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    targets = {t.strip() for t in args.targets.split(",") if t.strip()}
+    unknown = targets - {"sqlite", "mongo", "vectors"}
+    if unknown:
+        raise SystemExit(f"Unknown targets: {', '.join(sorted(unknown))}")
+
+    # One bcrypt hash for everyone: hashing 1M passwords individually would take days
+    password_hash = bcrypt.hashpw(args.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    dataset = SyntheticDataset(args.seed, datetime.strptime(args.anchor_date, "%Y-%m-%d"))
+    sqlite = SQLiteLoader(password_hash) if "sqlite" in targets else None
+    mongo = MongoLoader(password_hash) if "mongo" in targets else None
+    if mongo:
+        await mongo.connect()
+
+    print(f"🌱 Generating {args.hackathons:,} hackathons and {args.users:,} users "
+          f"(seed {args.seed}, anchored {args.anchor_date}) into {', '.join(sorted(targets))}")
+    try:
+        if args.reset:
+            if sqlite:
+                sqlite.reset()
+            if mongo:
+                await mongo.reset()
+            print("✅ Removed previously generated rows")
+        elif (sqlite and sqlite.has_synthetic_rows()) or (mongo and await mongo.has_synthetic_rows()):
+            # Ids are deterministic, so a second load would collide with the first
+            raise SystemExit("❌ Synthetic rows from a previous run already exist; rerun with --reset to replace them")
+
+        started = time.perf_counter()
+        embedded = 0
+        done = 0
+        for batch in batched(dataset.hackathons(args.hackathons), args.batch_size):
+            if sqlite:
+                await asyncio.to_thread(sqlite.load_hackathons, batch)
+            if mongo:
+                await mongo.load_hackathons(batch)
+            if "vectors" in targets and not mongo:
+                embedded += await embed_direct(batch, 64, settings.VECTOR_UPSERT_CHUNK_SIZE)
+            done += len(batch)
+            _progress("hackathons", done, args.hackathons, started)
+        print()
+
+        if "vectors" in targets and mongo:
+            from app.utils.hackathon_indexer import HackathonIndexer
+            print("   embedding through HackathonIndexer...")
+            stats = await HackathonIndexer().reindex(query={"platform_id": {"$regex": f"^{SYNTHETIC_PREFIX}-"}})
+            embedded = stats.vector_index_upserts
+            for error in stats.errors[:5]:
+                print(f"❌ {error}")
+
+        started = time.perf_counter()
+        done = 0
+        for batch in batched(dataset.users(args.users), args.batch_size):
+            if sqlite:
+                await asyncio.to_thread(sqlite.load_users, batch)
+            if mongo:
+                await mongo.load_users(batch)
+            done += len(batch)
+            _progress("users", done, args.users, started)
+        print()
+
+        if "vectors" in targets and settings.VECTOR_BACKEND == "local" and settings.LOCAL_VECTOR_INDEX_PATH:
+            from app.core.database import get_pinecone_index
+            get_pinecone_index().save()
+            print(f"💾 Local vector index saved to {settings.LOCAL_VECTOR_INDEX_PATH}")
+
+        print(f"✅ Loaded {args.hackathons:,} hackathons, {args.users:,} users, {embedded:,} vectors")
+        print(f"   Synthetic users ({SYNTHETIC_PREFIX}_<name><n>@example.com) share the password {args.password!r}")
+    finally:
+        if mongo:
+            await mongo.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
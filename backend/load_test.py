@@ -0,0 +1,504 @@
+#!/usr/bin/env python
+"""
+Reproducible, offline load test.
+
+Runs the ASGI app in-process (httpx ASGITransport, no sockets to the API) against
+local stand-ins for every external service:
+
+* Groq        -> a fake OpenAI-compatible LLM server on 127.0.0.1 with configurable
+                 latency, jitter and 429 rate (GROQ_BASE_URL points at it)
+* Pinecone    -> the in-process index (VECTOR_BACKEND=local)
+* Embeddings  -> the real model, or --embedder hash for a model-free run
+* Redis       -> fakeredis if installed, or --redis-url for a local Redis
+* MongoDB     -> mongomock-motor if installed, or --mongo-url for a local mongod
+* SQLite      -> a throwaway file in a temp directory
+
+A weighted mix of auth, recommendation, search and agent-run scenarios is driven
+by --concurrency virtual users with a seeded RNG. The report shows throughput and
+p50/p95/p99 per scenario. Save it with --output and compare against another
+commit's report with --compare (exit code 1 if p95 regresses beyond --max-regression).
+
+Usage:
+    python load_test.py --duration 30 --concurrency 20
+    python load_test.py --embedder hash --llm-latency-ms 400 --output before.json
+    python load_test.py --embedder hash --llm-latency-ms 400 --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+SKILL_POOL = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "FastAPI", "Django", "Go",
+    "Rust", "Solidity", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS",
+    "TensorFlow", "PyTorch", "LangChain", "Flutter", "Swift", "Kotlin", "GraphQL", "Tailwind",
+]
+THEMES = ["healthcare", "fintech", "climate", "education", "web3 security", "agritech", "accessibility", "logistics"]
+PLATFORMS = ["devpost", "unstop", "devfolio", "mlh", "sih"]
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+SEARCH_TERMS = ["AI", "chain", "health", "climate", "devpost", "payments", "edu", "security"]
+
+DEFAULT_MIX = "auth=2,recommendations=4,search=3,agent=1"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline in-process load test")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=50, help="Registered users to log in as")
+    parser.add_argument("--hackathons", type=int, default=500, help="Catalog size")
+    parser.add_argument("--app", choices=["lite", "full"], default="lite", help="app.main_lite or app.main")
+    parser.add_argument("--embedder", choices=["model", "hash"], default="model",
+                        help="Real embedding model or deterministic hashing (no model download)")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="Fake LLM mean latency")
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0, help="Fake LLM latency std-dev")
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="Fraction of fake LLM calls answered 429")
+    parser.add_argument("--agent-cache", action="store_true", help="Keep the whole-run agent cache on")
+    parser.add_argument("--redis-url", help="Use a local Redis instead of fakeredis")
+    parser.add_argument("--mongo-url", help="Use a local mongod instead of mongomock-motor")
+    parser.add_argument("--log-level", default="WARNING", help="App log level during the run")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="Allowed p95 regression in percent vs --compare")
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Fake LLM server
+# ---------------------------------------------------------------------------
+
+def _fake_completion_content(body: dict) -> str:
+    messages = body.get("messages", [])
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    user = next((m["content"] for m in messages if m["role"] == "user"), "")
+    if '"evaluations"' in system:
+        problem_statements = json.loads(user).get("problem_statements", [])
+        return json.dumps({"evaluations": [
+            {"id": ps["id"], "win_probability": 40 + (i * 7) % 50,
+             "critique": "Solid fit for the stack; scope the MVP tightly.",
+             "recommended_stack": ["FastAPI", "React"]}
+            for i, ps in enumerate(problem_statements)
+        ]})
+    if body.get("response_format", {}).get("type") == "json_object":
+        if "boilerplate" in user.lower():
+            return json.dumps({
+                "backend": "from fastapi import FastAPI\napp = FastAPI()\n",
+                "frontend": "export default function App() { return null; }\n",
+                "docker_compose": "services: {}\n",
+                "requirements": "fastapi\n",
+                "package_json": "{}",
+            })
+        return json.dumps({"win_probability": 55, "critique": "Reasonable fit.", "recommended_stack": ["Python"]})
+    return "```python\nprint('hello hackathon')\n```"
+
+
+def start_fake_llm(latency_ms: float, jitter_ms: float, rate_429: float, seed: int) -> str:
+    """Serve an OpenAI-compatible /openai/v1/chat/completions in a background thread; returns its base URL."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int, payload: dict, headers: Dict[str, str]):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+            if not self.path.endswith("/chat/completions"):
+                return self._reply(404, {"error": {"message": "not found"}}, {})
+            with rng_lock:
+                throttled = rate_429 and rng.random() < rate_429
+                delay = max(0.0, rng.gauss(latency_ms, jitter_ms)) / 1000
+            if throttled:
+                return self._reply(429, {"error": {"message": "rate limited", "type": "rate_limit"}},
+                                   {"retry-after": "0.2"})
+            time.sleep(delay)
+            content = _fake_completion_content(body)
+            prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+            completion_tokens = len(content) // 4
+            self._reply(200, {
+                "id": "chatcmpl-loadtest",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens,
+                          "queue_time": 0.0, "prompt_time": delay * 0.2, "completion_time": delay * 0.8,
+                          "total_time": delay},
+            }, {"x-ratelimit-remaining-tokens": "1000000"})
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ---------------------------------------------------------------------------
+# Environment
+# ---------------------------------------------------------------------------
+
+def configure_environment(args, workdir: str, llm_url: str):
+    """Point every setting at local stand-ins; must run before the app is imported."""
+    os.environ.update({
+        "SQLITE_PATH": os.path.join(workdir, "loadtest.db"),
+        "ARTIFACT_DIR": os.path.join(workdir, "artifacts"),
+        "GROQ_BASE_URL": llm_url,
+        "GROQ_API_KEY": "loadtest",
+        "VECTOR_BACKEND": "local",
+        "EMBEDDING_BACKEND": "hash" if args.embedder == "hash" else os.environ.get("EMBEDDING_BACKEND", "torch"),
+        "RATE_LIMIT_DEFAULT": "1000000/minute",
+        "RATE_LIMIT_AUTH": "1000000/minute",
+        "RATE_LIMIT_USER": "1000000/minute",
+        "LLM_REQUESTS_PER_MINUTE": "100000",
+        "LLM_TOKENS_PER_MINUTE": "100000000",
+        "LLM_MAX_CONCURRENCY": str(max(8, args.concurrency)),
+        "AGENT_RESULT_CACHE_TTL": os.environ.get("AGENT_RESULT_CACHE_TTL", "3600") if args.agent_cache else "0",
+        "TRACING_EXPORTER": "none",
+    })
+    if args.mongo_url:
+        os.environ["MONGODB_URL"] = args.mongo_url
+
+
+async def attach_redis(args):
+    from app.core import cache
+    if args.redis_url:
+        os.environ["REDIS_URL"] = args.redis_url
+        from app.core.config import settings
+        settings.REDIS_URL = args.redis_url
+        await cache.init_redis()
+        return f"redis ({args.redis_url})"
+    try:
+        import fakeredis
+    except ImportError:
+        return "none (install fakeredis or pass --redis-url)"
+    cache.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return "fakeredis"
+
+
+async def attach_mongo(args):
+    from app.core import database
+    if args.mongo_url:
+        await database.init_db()
+        return f"mongod ({args.mongo_url})"
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        return "none (install mongomock-motor or pass --mongo-url)"
+    database._client = AsyncMongoMockClient()
+    database._db = database._client["hackquest_loadtest"]
+    return "mongomock-motor"
+
+
+def _fake_hackathon(rng: random.Random, i: int) -> dict:
+    theme = rng.choice(THEMES)
+    skills = rng.sample(SKILL_POOL, rng.randint(2, 5))
+    return {
+        "id": f"lt-{i:06d}",
+        "title": f"{theme.title()} Challenge #{i}",
+        "description": f"Build a {theme} product using {', '.join(skills)} in 48 hours.",
+        "platform": rng.choice(PLATFORMS),
+        "difficulty": rng.choice(DIFFICULTIES),
+        "required_skills": skills,
+        "prize_pool": f"${rng.choice([1, 2, 5, 10, 25])}000",
+    }
+
+
+async def seed(args, rng: random.Random, client) -> List[dict]:
+    """Catalog into SQLite, Mongo (when attached) and the vector index; users via the real register endpoint."""
+    from app.core.db import SessionLocal
+    from app.core.database import get_pinecone_index
+    from app.models.hackathon_models import Hackathon, UserSkills
+    from app.utils.vectorizer import get_vector_engine
+
+    hackathons = [_fake_hackathon(rng, i) for i in range(args.hackathons)]
+    db = SessionLocal()
+    try:
+        db.bulk_save_objects([
+            Hackathon(id=h["id"], title=h["title"], description=h["description"], platform=h["platform"],
+                      difficulty=h["difficulty"], required_skills=json.dumps(h["required_skills"]),
+                      prize_pool=h["prize_pool"], is_active=True)
+            for h in hackathons
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    try:
+        from app.core.database import Collections
+        await Collections.hackathons().insert_many([
+            {"_id": h["id"], "title": h["title"], "description": h["description"], "platform": h["platform"],
+             "difficulty": h["difficulty"], "required_skills": h["required_skills"], "is_active": True}
+            for h in hackathons
+        ])
+    except RuntimeError:
+        pass  # No Mongo attached
+
+    vectors = await asyncio.to_thread(get_vector_engine().get_embeddings, [h["description"] for h in hackathons])
+    get_pinecone_index().upsert(vectors=[
+        {"id": h["id"], "values": v, "metadata": {"title": h["title"], "problem_statement": h["description"]}}
+        for h, v in zip(hackathons, vectors)
+    ])
+
+    users = []
+    for i in range(args.users):
+        user = {"email": f"loadtest{i}@example.com", "password": "LoadTest123!", "username": f"loadtest{i}",
+                "skills": rng.sample(SKILL_POOL, rng.randint(2, 6))}
+        response = await client.post("/api/auth/register", json={k: user[k] for k in ("email", "password", "username")})
+        if response.status_code >= 400:
+            raise RuntimeError(f"Seeding user failed: {response.status_code} {response.text[:200]}")
+        body = response.json()
+        user["token"] = body["access_token"]
+        user["id"] = (body.get("user") or {}).get("id")
+        users.append(user)
+
+    db = SessionLocal()
+    try:
+        db.bulk_save_objects([
+            UserSkills(id=f"{u['id']}-{s}", user_id=u["id"], skill_name=s)
+            for u in users if u["id"] for s in u["skills"]
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return users
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+async def scenario_auth(client, rng, users):
+    user = rng.choice(users)
+    response = await client.post("/api/auth/login", json={"email": user["email"], "password": user["password"]})
+    if response.status_code != 200:
+        return response
+    token = response.json()["access_token"]
+    return await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+async def scenario_recommendations(client, rng, users):
+    user = rng.choice(users)
+    return await client.get("/api/matching/recommendations", params={"limit": 10},
+                            headers={"Authorization": f"Bearer {user['token']}"})
+
+
+async def scenario_search(client, rng, users):
+    return await client.post("/api/hackathons/search", json={
+        "query": rng.choice(SEARCH_TERMS), "difficulty": rng.choice([None] + DIFFICULTIES), "limit": 20,
+    })
+
+
+async def scenario_agent(client, rng, users):
+    user = rng.choice(users)
+    return await client.post("/api/agent/analyze", json={
+        "user_id": str(user["id"]), "skills": rng.sample(SKILL_POOL, rng.randint(2, 5)),
+        "github_summary": f"Built projects in {rng.choice(THEMES)}",
+    })
+
+
+SCENARIOS = {
+    "auth": scenario_auth,
+    "recommendations": scenario_recommendations,
+    "search": scenario_search,
+    "agent": scenario_agent,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return {k: v for k, v in weights.items() if v > 0}
+
+
+async def virtual_user(client, rng, users, weights, measure_from, stop_at, samples, errors):
+    names, cumulative = list(weights), list(weights.values())
+    while time.perf_counter() < stop_at:
+        name = rng.choices(names, weights=cumulative)[0]
+        start = time.perf_counter()
+        try:
+            response = await SCENARIOS[name](client, rng, users)
+            ok = response.status_code < 400
+            label = None if ok else str(response.status_code)
+        except Exception as e:
+            ok, label = False, e.__class__.__name__
+        end = time.perf_counter()
+        if start >= measure_from:
+            samples[name].append(end - start)
+            if not ok:
+                errors[name][label] += 1
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, errors, duration: float) -> Dict[str, dict]:
+    report = {}
+    everything = []
+    for name in sorted(samples):
+        values = sorted(samples[name])
+        everything.extend(values)
+        report[name] = _stats(values, sum(errors[name].values()), duration)
+        report[name]["errors_by_type"] = dict(errors[name])
+    everything.sort()
+    report["total"] = _stats(everything, sum(sum(e.values()) for e in errors.values()), duration)
+    return report
+
+
+def _stats(values: List[float], error_count: int, duration: float) -> dict:
+    return {
+        "requests": len(values),
+        "errors": error_count,
+        "throughput_rps": round(len(values) / duration, 2) if duration else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+    }
+
+
+def print_report(report: Dict[str, dict]):
+    print(f"\n{'scenario':<16}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    print("-" * 74)
+    for name, row in report.items():
+        print(f"{name:<16}{row['requests']:>10}{row['errors']:>8}{row['throughput_rps']:>10.1f}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+
+
+def compare(report: Dict[str, dict], baseline_path: str, max_regression: float) -> bool:
+    """Print deltas vs a baseline report; False if any p95 regressed beyond the threshold."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} ({baseline.get('git_commit', '?')[:10]})")
+    print(f"{'scenario':<16}{'rps Δ%':>10}{'p50 Δ%':>10}{'p95 Δ%':>10}{'p99 Δ%':>10}")
+    ok = True
+    for name, row in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+
+        def delta(key):
+            return (row[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+
+        p95 = delta("p95_ms")
+        flag = ""
+        if p95 > max_regression and name != "total":
+            ok, flag = False, "  ❌ regression"
+        print(f"{name:<16}{delta('throughput_rps'):>+10.1f}{delta('p50_ms'):>+10.1f}{p95:>+10.1f}{delta('p99_ms'):>+10.1f}{flag}")
+    return ok
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+async def run(args) -> int:
+    import httpx
+
+    weights = parse_mix(args.mix)
+    module = __import__("app.main_lite" if args.app == "lite" else "app.main", fromlist=["app"])
+    app = module.app
+    logging.getLogger().setLevel(args.log_level.upper())
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    redis_mode = await attach_redis(args)
+    mongo_mode = await attach_mongo(args)
+    print(f"🔧 redis: {redis_mode} | mongo: {mongo_mode} | vector index: local | embedder: {args.embedder} | "
+          f"llm: fake ({args.llm_latency_ms:.0f}±{args.llm_jitter_ms:.0f} ms, 429 rate {args.llm_429_rate})")
+
+    rng = random.Random(args.seed)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120.0) as client:
+            print(f"🌱 Seeding {args.hackathons} hackathons and {args.users} users...")
+            users = await seed(args, rng, client)
+
+            samples: Dict[str, List[float]] = defaultdict(list)
+            errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+            start = time.perf_counter()
+            measure_from = start + args.warmup
+            stop_at = measure_from + args.duration
+            print(f"🚀 {args.concurrency} virtual users, {args.warmup:.0f}s warm-up + {args.duration:.0f}s measured, mix {weights}")
+            await asyncio.gather(*[
+                virtual_user(client, random.Random(args.seed * 1000 + i), users, weights,
+                             measure_from, stop_at, samples, errors)
+                for i in range(args.concurrency)
+            ])
+
+    report = {
+        "git_commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "results": summarize(samples, errors, args.duration),
+    }
+    print_report(report["results"])
+    for name, row in report["results"].items():
+        if row.get("errors_by_type"):
+            print(f"⚠️  {name} errors: {row['errors_by_type']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+    if args.compare:
+        return 0 if compare(report, args.compare, args.max_regression) else 1
+    return 0
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="hackquest-loadtest-")
+    llm_url = start_fake_llm(args.llm_latency_ms, args.llm_jitter_ms, args.llm_429_rate, args.seed)
+    configure_environment(args, workdir, llm_url)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Report per-module import cost for the backend.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+prints the most expensive imports, so regressions in worker boot time are easy
+to spot.
+
+Usage:
+    python profile_imports.py                   # profile app.main
+    python profile_imports.py app.main_lite -n 40
+    python profile_imports.py --app-only        # only modules under app.*
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def profile_imports(module: str):
+    """Import ``module`` in a subprocess; return (wall seconds, [(self_us, cumulative_us, name)])."""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+        except ValueError:
+            continue
+
+    if proc.returncode != 0:
+        print(f"❌ Importing {module} failed:\n")
+        print("\n".join(l for l in proc.stderr.splitlines() if not l.startswith("import time:")))
+    return wall, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module import cost report")
+    parser.add_argument("module", nargs="?", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("-n", "--top", type=int, default=25, help="Number of modules to show")
+    parser.add_argument("--app-only", action="store_true", help="Only show modules under app.*")
+    args = parser.parse_args()
+
+    wall, rows = profile_imports(args.module)
+    if args.app_only:
+        rows = [r for r in rows if r[2].strip().startswith("app")]
+
+    print(f"\n⏱  import {args.module}: {wall:.2f}s wall (including interpreter start)\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    print("-" * 60)
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    total_self = sum(r[0] for r in rows) / 1000
+    print("-" * 60)
+    print(f"{'':>14} {total_self:>9.1f}  total self time ({len(rows)} modules)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Embed hackathons into the embeddings collection and the Pinecone index.
+
+Only hackathons whose text (or embedding model) changed since the last run are
+re-embedded; pass --force to rebuild everything.
+
+Usage:
+    python reindex_hackathons.py
+    python reindex_hackathons.py --force --batch-size 512
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.core.database import init_db, close_db
+from app.utils.hackathon_indexer import HackathonIndexer
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk hackathon embedding reindex")
+    parser.add_argument("--force", action="store_true", help="Re-embed even unchanged hackathons")
+    parser.add_argument("--batch-size", type=int, default=settings.REINDEX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    await init_db()
+    try:
+        print("🌱 Reindexing hackathon embeddings...")
+        stats = await HackathonIndexer(batch_size=args.batch_size).reindex(force=args.force)
+        print(f"✅ {stats.embedded} embedded, {stats.skipped} unchanged, "
+              f"{stats.vector_index_upserts} vectors upserted in {stats.seconds:.1f}s")
+        for error in stats.errors:
+            print(f"❌ {error}")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
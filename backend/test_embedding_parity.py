@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Parity and throughput check: ONNX embedding backend vs. sentence-transformers.
+
+Run after export_embedding_model.py. Fails (exit code 1) if any sentence's
+ONNX vector drifts below the cosine threshold from the PyTorch vector.
+
+Usage:
+    python test_embedding_parity.py
+    python test_embedding_parity.py --fp32 --min-cosine 0.9999
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+from app.core.config import settings
+
+SENTENCES = [
+    "Develop an AI model to predict crop yield based on soil and weather data using Python and IoT sensors.",
+    "Build a real-time dashboard to monitor smart contract vulnerabilities using React, ethers.js, and Solidity.",
+    "Full-stack developer with FastAPI, React and Tailwind experience.",
+    "Skills: Rust, WebAssembly, embedded systems",
+    "Built a real-time chat app and a crypto tracker.",
+    "Healthcare accessibility app for rural clinics with offline sync",
+    "",
+    "a",
+    "Machine learning " * 100,  # exercises truncation at 256 tokens
+]
+
+
+def rss_mb() -> float:
+    """Peak RSS so far (Linux reports ru_maxrss in KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def throughput(model, sentences, rounds: int) -> float:
+    model.encode(sentences)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        model.encode(sentences)
+    return rounds * len(sentences) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX vs PyTorch embedding parity")
+    parser.add_argument("--fp32", action="store_true", help="Compare the fp32 export instead of int8")
+    parser.add_argument("--min-cosine", type=float, default=None,
+                        help="Minimum cosine similarity (default 0.99 int8, 0.9999 fp32)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    min_cosine = args.min_cosine or (0.9999 if args.fp32 else 0.99)
+
+    # Load ONNX first so its RSS is measured without PyTorch in the process
+    from app.utils.onnx_encoder import OnnxSentenceEncoder
+    base_rss = rss_mb()
+    onnx_model = OnnxSentenceEncoder(settings.EMBEDDING_ONNX_DIR, quantized=not args.fp32)
+    onnx_rss = rss_mb() - base_rss
+
+    from sentence_transformers import SentenceTransformer
+    base_rss = rss_mb()
+    torch_model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+    torch_rss = rss_mb() - base_rss
+
+    expected = torch_model.encode(SENTENCES, normalize_embeddings=True)
+    actual = onnx_model.encode(SENTENCES)
+
+    print("\n" + "=" * 60)
+    print(f"🔬 PARITY: {os.path.basename(onnx_model.model_file)} vs sentence-transformers")
+    print("=" * 60)
+    failures = 0
+    for sentence, a, b in zip(SENTENCES, expected, actual):
+        cosine = float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+        ok = cosine >= min_cosine
+        failures += not ok
+        label = (sentence[:50] + "...") if len(sentence) > 50 else repr(sentence)
+        print(f"{'✅' if ok else '❌'} {cosine:.6f}  {label}")
+
+    torch_rate = throughput(torch_model, SENTENCES * 4, args.rounds)
+    onnx_rate = throughput(onnx_model, SENTENCES * 4, args.rounds)
+    print("-" * 60)
+    print(f"⏱  PyTorch: {torch_rate:8.1f} sentences/s  (+{torch_rss:.0f} MB RSS)")
+    print(f"⏱  ONNX:    {onnx_rate:8.1f} sentences/s  (+{onnx_rss:.0f} MB RSS)")
+    print(f"   Speed-up: {onnx_rate / torch_rate:.2f}x")
+
+    if failures:
+        print(f"\n❌ {failures} sentence(s) below cosine {min_cosine}")
+        sys.exit(1)
+    print(f"\n✅ All sentences within cosine {min_cosine}")
+
+
+if __name__ == "__main__":
+    main()
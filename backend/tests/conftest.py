@@ -0,0 +1,29 @@
+"""
+Shared pytest setup.
+
+Settings are read from the environment at import time, so the test database,
+artifact store and offline embedding/vector backends are configured here,
+before any ``app`` module is imported.
+"""
+import os
+import tempfile
+
+_TEST_DIR = tempfile.mkdtemp(prefix="hackquest-tests-")
+os.environ.setdefault("SQLITE_PATH", os.path.join(_TEST_DIR, "test.db"))
+os.environ.setdefault("ARTIFACT_DIR", os.path.join(_TEST_DIR, "artifacts"))
+os.environ.setdefault("LOCAL_VECTOR_INDEX_PATH", os.path.join(_TEST_DIR, "vectors.npz"))
+os.environ.setdefault("EMBEDDING_BACKEND", "hash")
+os.environ.setdefault("VECTOR_BACKEND", "local")
+os.environ.setdefault("RATE_LIMIT_STORAGE", "memory://")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create every table once per run (models must be imported first)."""
+    import app.core.jobs  # noqa: F401  (registers background_jobs / job_workers)
+    import app.models.artifact_models  # noqa: F401
+    import app.models.hackathon_models  # noqa: F401
+    from app.core.db import init_db
+    init_db()
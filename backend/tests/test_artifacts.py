@@ -0,0 +1,101 @@
+"""Stored generations and zero-copy file responses."""
+import asyncio
+import uuid
+
+import pytest
+
+from app.core import cache
+from app.core.artifacts import canonical_json, content_hash, get_or_generate
+from app.utils import file_response
+from app.utils.file_response import ZEROCOPY_EXTENSION, ZeroCopyFileResponse
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    monkeypatch.setattr(cache, "redis_client", None)
+
+
+def test_generation_runs_once_per_inputs_and_is_then_reused():
+    calls = []
+    inputs = {"problem": f"demo {uuid.uuid4()}", "skills": ["python"]}
+
+    async def generate():
+        calls.append(1)
+        return {"backend": "print('hi')"}
+
+    artifact_id, value, reused = asyncio.run(get_or_generate("test", inputs, generate))
+    assert (value, reused) == ({"backend": "print('hi')"}, False)
+    assert artifact_id == content_hash(canonical_json(value))
+
+    again = asyncio.run(get_or_generate("test", inputs, generate))
+    assert again == (artifact_id, value, True)
+    assert calls == [1]
+
+    other = asyncio.run(get_or_generate("test", {**inputs, "skills": ["go"]}, generate))
+    assert other[2] is False and calls == [1, 1]
+
+
+def test_failed_generation_is_not_recorded():
+    inputs = {"problem": f"fails {uuid.uuid4()}"}
+
+    async def broken():
+        raise RuntimeError("llm down")
+
+    async def working():
+        return {"ok": True}
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(get_or_generate("test", inputs, broken))
+    assert asyncio.run(get_or_generate("test", inputs, working))[1:] == ({"ok": True}, False)
+
+
+def serve(response, method: str = "GET", extensions=None):
+    """Run an ASGI response and collect the messages it sends."""
+    messages = []
+    scope = {"type": "http", "method": method, "extensions": extensions or {}}
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+    return str(path)
+
+
+def test_range_is_read_in_chunks_without_the_extension(data_file, monkeypatch):
+    monkeypatch.setattr(file_response, "READ_CHUNK_SIZE", 100)
+    messages = serve(ZeroCopyFileResponse(data_file, 10, 259, status_code=206))
+
+    start, *bodies = messages
+    assert start["status"] == 206
+    assert (b"content-length", b"250") in start["headers"]
+    assert [len(m["body"]) for m in bodies] == [100, 100, 50]
+    assert [m["more_body"] for m in bodies] == [True, True, False]
+    assert b"".join(m["body"] for m in bodies) == (bytes(range(256)) * 4)[10:260]
+
+
+def test_zerocopy_extension_hands_the_file_to_the_server(data_file):
+    messages = serve(ZeroCopyFileResponse(data_file, 5, 14), extensions={ZEROCOPY_EXTENSION: {}})
+    assert messages[1]["type"] == ZEROCOPY_EXTENSION
+    assert (messages[1]["offset"], messages[1]["count"]) == (5, 10)
+
+
+def test_head_sends_headers_only(data_file):
+    messages = serve(ZeroCopyFileResponse(data_file, 0, 1023), method="HEAD")
+    assert (b"content-length", b"1024") in messages[0]["headers"]
+    assert messages[1] == {"type": "http.response.body", "body": b""}
+
+
+def test_truncated_file_still_ends_the_response(data_file):
+    messages = serve(ZeroCopyFileResponse(data_file, 1000, 2047))
+    assert b"".join(m.get("body", b"") for m in messages[1:]) == (bytes(range(256)) * 4)[1000:]
+    assert messages[-1].get("more_body", False) is False
@@ -0,0 +1,126 @@
+"""Boilerplate ZIP export: Range parsing, deterministic archives and the download endpoint's ETag/Range handling."""
+import asyncio
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import generate
+from app.core.artifacts import artifact_store, put_json
+from app.utils.boilerplate_zip import ZIP_FORMAT_VERSION, parse_range, stream_boilerplate_zip
+
+BOILERPLATE = {
+    "backend": "from fastapi import FastAPI\napp = FastAPI()\n" * 50,
+    "frontend": "export default function App() { return null }\n",
+    "requirements": "fastapi\n",
+    "package_json": {"name": "demo", "version": "0.1.0"},
+    "docker_compose": "services: {}\n",
+}
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=10-", (10, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+    ("bytes=90-500", (90, 99)),
+    ("bytes=100-", None),      # Starts past the end
+    ("bytes=9-3", None),       # Inverted
+    ("bytes=-0", None),
+    ("bytes=0-1,5-6", None),   # Multi-range is not supported
+    ("items=0-9", None),
+    ("bytes=a-b", None),
+    (None, None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+def test_zip_is_byte_identical_across_builds():
+    first = b"".join(stream_boilerplate_zip(BOILERPLATE))
+    second = b"".join(stream_boilerplate_zip(dict(reversed(list(BOILERPLATE.items())))))
+    assert first == second
+
+    with zipfile.ZipFile(io.BytesIO(first)) as archive:
+        assert "boilerplate/backend/main.py" in archive.namelist()
+        assert archive.read("boilerplate/frontend/package.json").startswith(b"{")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(generate.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def artifact_id():
+    artifact_id = asyncio.run(put_json(generate.BOILERPLATE_ARTIFACT_KIND, BOILERPLATE))
+    yield artifact_id
+    zip_path = artifact_store.path(generate.ZIP_ARTIFACT_KIND, f"{artifact_id}-v{ZIP_FORMAT_VERSION}")
+    if os.path.exists(zip_path):
+        os.remove(zip_path)
+
+
+def test_download_streams_then_serves_the_stored_zip(client, artifact_id):
+    url = f"/api/generate/download/{artifact_id}"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["etag"] == f'"{artifact_id}-v{ZIP_FORMAT_VERSION}"'
+    assert first.headers["accept-ranges"] == "bytes"
+
+    second = client.get(url)
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["content-length"] == str(len(first.content))
+
+
+def test_download_honours_if_none_match(client, artifact_id):
+    url = f"/api/generate/download/{artifact_id}"
+    etag = client.get(url).headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_download_serves_byte_ranges(client, artifact_id):
+    url = f"/api/generate/download/{artifact_id}"
+    # A range on the first download materializes the ZIP before answering
+    partial = client.get(url, headers={"Range": "bytes=0-99"})
+    full = client.get(url).content
+
+    assert partial.status_code == 206
+    assert partial.content == full[:100]
+    assert partial.headers["content-range"] == f"bytes 0-99/{len(full)}"
+
+    tail = client.get(url, headers={"Range": "bytes=-22"})
+    assert tail.status_code == 206 and tail.content == full[-22:]
+
+
+def test_download_rejects_unsatisfiable_ranges(client, artifact_id):
+    url = f"/api/generate/download/{artifact_id}"
+    size = len(client.get(url).content)
+    response = client.get(url, headers={"Range": f"bytes={size}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{size}"
+
+
+def test_if_range_with_a_stale_validator_returns_the_full_body(client, artifact_id):
+    url = f"/api/generate/download/{artifact_id}"
+    full = client.get(url)
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.content == full.content
+
+    fresh = client.get(url, headers={"Range": "bytes=0-9", "If-Range": full.headers["etag"]})
+    assert fresh.status_code == 206 and fresh.content == full.content[:10]
+
+
+def test_download_rejects_malformed_and_unknown_ids(client):
+    assert client.get("/api/generate/download/not-a-hash").status_code == 404
+    assert client.get(f"/api/generate/download/{'0' * 64}").status_code == 404
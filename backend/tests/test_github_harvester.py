@@ -0,0 +1,149 @@
+"""Incremental GitHub harvesting: cursor round trips, change detection and partial listings."""
+import asyncio
+from typing import Dict, List
+
+from app.utils.github_client import GitHubResponse
+from app.utils.github_harvester import (
+    GitHubProfileHarvester,
+    SyncCursor,
+    build_skill_vector,
+    repo_content_hash,
+)
+
+
+def repo(index: int, updated_at: str, language: str = "Python") -> Dict:
+    return {
+        "full_name": f"octo/repo{index}",
+        "name": f"repo{index}",
+        "updated_at": updated_at,
+        "pushed_at": updated_at,
+        "language": language,
+        "stargazers_count": index,
+    }
+
+
+class FakeGitHub:
+    """Serves fixed listing pages and per-repo languages; records every path requested."""
+
+    def __init__(self, pages: List[List[Dict]], failing_pages=(), not_modified_etag=None):
+        self.pages = pages
+        self.failing_pages = set(failing_pages)
+        self.not_modified_etag = not_modified_etag
+        self.requests = []
+
+    async def get_json(self, path, params=None, etag=None):
+        if path.endswith("/languages"):
+            self.requests.append(path)
+            return GitHubResponse(200, {"Python": 1000, "Shell": 10})
+        page = params["page"]
+        self.requests.append(f"page {page}")
+        if etag and etag == self.not_modified_etag:
+            return GitHubResponse(304, None)
+        if page in self.failing_pages:
+            return GitHubResponse(502, None)
+        links = {"last": f"https://api.github.com/users/octo/repos?page={len(self.pages)}"} if len(self.pages) > 1 else {}
+        return GitHubResponse(200, self.pages[page - 1], links=links, etag=f'"page-{page}"')
+
+    def language_fetches(self) -> List[str]:
+        return [r for r in self.requests if r.endswith("/languages")]
+
+
+PAGES = [
+    [repo(1, "2024-09-01T00:00:00Z"), repo(2, "2024-08-01T00:00:00Z")],
+    [repo(3, "2023-05-01T00:00:00Z"), repo(4, "2023-01-01T00:00:00Z", "Go")],
+]
+
+
+def harvest(github: FakeGitHub, cursor: SyncCursor = None, public_repos: int = 4):
+    return asyncio.run(GitHubProfileHarvester(github).harvest_incremental("octo", cursor, public_repos=public_repos))
+
+
+def initial_cursor() -> SyncCursor:
+    return harvest(FakeGitHub(PAGES)).cursor
+
+
+def test_first_sync_fetches_everything_and_fills_the_cursor():
+    github = FakeGitHub(PAGES)
+    result = harvest(github)
+
+    assert sorted(result.cursor.repos) == ["octo/repo1", "octo/repo2", "octo/repo3", "octo/repo4"]
+    assert len(github.language_fetches()) == 4
+    assert result.cursor.last_updated_at == "2024-09-01T00:00:00Z"
+    assert result.cursor.repos_etag == '"page-1"'
+    assert result.cursor.repo_hashes["octo/repo4"] == repo_content_hash(PAGES[1][1])
+    assert result.profile.skill_vector == build_skill_vector(result.profile.repos)
+
+
+def test_cursor_survives_a_dict_round_trip():
+    cursor = initial_cursor()
+    restored = SyncCursor.from_dict(cursor.to_dict())
+    assert restored == cursor
+
+
+def test_not_modified_listing_reuses_the_cursor_without_further_calls():
+    cursor = initial_cursor()
+    github = FakeGitHub(PAGES, not_modified_etag=cursor.repos_etag)
+    result = harvest(github, cursor)
+
+    assert github.requests == ["page 1"]
+    assert result.cursor is cursor
+    assert result.changed_repos == []
+
+
+def test_only_changed_repos_refetch_languages():
+    cursor = initial_cursor()
+    pages = [list(PAGES[0]), [repo(3, "2023-05-01T00:00:00Z"), {**PAGES[1][1], "description": "new"}]]
+    pages[0][1] = {**pages[0][1], "stargazers_count": 99}
+    github = FakeGitHub(pages)
+    result = harvest(github, cursor, public_repos=5)  # Count changed: full listing
+
+    assert sorted(result.changed_repos) == ["octo/repo2", "octo/repo4"]
+    assert sorted(github.language_fetches()) == ["/repos/octo/repo2/languages", "/repos/octo/repo4/languages"]
+    assert result.profile.repos[0]["languages"] == cursor.repos["octo/repo1"]["languages"]
+
+
+def test_later_pages_are_skipped_when_page_one_reaches_the_cursor():
+    cursor = initial_cursor()
+    pages = [[repo(1, "2024-10-01T00:00:00Z"), PAGES[0][1]], PAGES[1]]
+    github = FakeGitHub(pages)
+    result = harvest(github, cursor)
+
+    assert "page 2" not in github.requests
+    assert result.changed_repos == ["octo/repo1"]
+    assert sorted(result.cursor.repos) == sorted(cursor.repos)
+    assert result.cursor.last_updated_at == "2024-10-01T00:00:00Z"
+    assert result.cursor.repos_etag == '"page-1"'
+
+
+def test_new_repo_on_page_one_forces_a_full_listing():
+    cursor = initial_cursor()
+    pages = [[repo(5, "2024-10-01T00:00:00Z"), PAGES[0][0]], [PAGES[0][1], PAGES[1][0]]]
+    github = FakeGitHub(pages)
+    result = harvest(github, cursor)  # Same count: repo4 was deleted
+
+    assert "page 2" in github.requests
+    assert "octo/repo4" not in result.cursor.repos
+    assert "octo/repo5" in result.cursor.repos
+
+
+def test_repos_on_a_failed_page_keep_their_cursor_entries():
+    cursor = initial_cursor()
+    pages = [[repo(5, "2024-10-01T00:00:00Z"), PAGES[0][0]], [PAGES[0][1], PAGES[1][0]], [PAGES[1][1]]]
+    github = FakeGitHub(pages, failing_pages={3})
+    result = harvest(github, cursor, public_repos=5)
+
+    assert sorted(result.cursor.repos) == [f"octo/repo{i}" for i in range(1, 6)]
+    assert result.cursor.repos["octo/repo4"]["languages"] == cursor.repos["octo/repo4"]["languages"]
+    assert result.changed_repos == ["octo/repo5"]
+    # An incomplete listing must not let the next sync stop at a 304
+    assert result.cursor.repos_etag is None
+
+
+def test_failed_first_page_keeps_the_whole_cursor():
+    cursor = initial_cursor()
+    github = FakeGitHub(PAGES, failing_pages={1})
+    result = harvest(github, cursor, public_repos=5)
+
+    assert sorted(result.cursor.repos) == sorted(cursor.repos)
+    assert result.changed_repos == []
+    assert github.language_fetches() == []
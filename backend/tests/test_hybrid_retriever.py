@@ -0,0 +1,96 @@
+"""Hybrid retrieval: reciprocal rank fusion, the skill index and fused candidates."""
+import asyncio
+
+import pytest
+
+from app.utils.hybrid_retriever import (
+    RRF_K,
+    HybridRetriever,
+    IndexedHackathon,
+    SkillIndex,
+    reciprocal_rank_fusion,
+    skill_overlap,
+)
+
+CATALOG = [
+    IndexedHackathon("h1", "AI Sprint", "Build ML apps", "intermediate", ["Python", "PyTorch"]),
+    IndexedHackathon("h2", "Web Jam", "Ship a web app", "beginner", ["JavaScript", "React"]),
+    IndexedHackathon("h3", "Data Days", "Analytics", "advanced", ["Python", "SQL", "Spark"]),
+    IndexedHackathon("h4", "Chain Hack", "Smart contracts", "expert", ["Solidity"]),
+]
+
+
+def test_rrf_sums_reciprocal_ranks_across_rankings():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]])
+    assert fused["a"] == pytest.approx(1 / (RRF_K + 1) + 1 / (RRF_K + 2))
+    assert fused["b"] == pytest.approx(1 / (RRF_K + 2))
+    assert fused["c"] == pytest.approx(1 / (RRF_K + 3) + 1 / (RRF_K + 1))
+    assert sorted(fused, key=fused.get, reverse=True) == ["a", "c", "b"]
+
+
+def test_rrf_favours_agreement_over_a_single_top_rank():
+    fused = reciprocal_rank_fusion([["solo", "both"], ["other", "both"]])
+    assert fused["both"] > fused["solo"]
+
+
+def test_rrf_of_no_rankings_is_empty():
+    assert reciprocal_rank_fusion([]) == {}
+    assert reciprocal_rank_fusion([[], []]) == {}
+
+
+def test_skill_overlap_is_case_insensitive():
+    assert skill_overlap(["python", "sql"], ["Python", "SQL", "Spark", "Python"]) == (["Python", "SQL"], pytest.approx(2 / 3))
+    assert skill_overlap(["python"], []) == ([], None)
+
+
+def built_index() -> SkillIndex:
+    index = SkillIndex()
+    index.build(CATALOG)
+    return index
+
+
+def test_skill_index_only_returns_hackathons_sharing_a_skill():
+    ranked = built_index().search(["python", "sql"])
+    assert [hid for hid, _, _ in ranked] == ["h3", "h1"]
+    assert ranked[0][2] == ["Python", "SQL"]
+    assert built_index().search(["cobol"]) == []
+
+
+class StubRetriever(HybridRetriever):
+    """Vector side replaced by a fixed ranking (or failure)."""
+
+    def __init__(self, vector_hits, skill_index):
+        super().__init__(skill_index)
+        self.vector_hits = vector_hits
+
+    async def _vector_candidates(self, query_text, limit):
+        if isinstance(self.vector_hits, Exception):
+            raise self.vector_hits
+        return self.vector_hits
+
+
+def vector_hit(hackathon_id: str, score: float) -> dict:
+    return {"id": hackathon_id, "score": score, "title": f"vector {hackathon_id}", "ps": "from vector index"}
+
+
+def test_retrieve_fuses_vector_and_skill_rankings():
+    retriever = StubRetriever([vector_hit("h4", 0.9), vector_hit("h1", 0.8)], built_index())
+    candidates = asyncio.run(retriever.retrieve("ml", ["Python"], top_k=3))
+
+    # h1 is ranked by both sources, so it beats h4's single first place
+    assert [c["id"] for c in candidates] == ["h1", "h4", "h3"]
+    first = candidates[0]
+    assert first["score"] == pytest.approx(1 / (RRF_K + 2) + 1 / (RRF_K + 1))
+    assert first["vector_score"] == 0.8 and first["matched_skills"] == ["Python"]
+    assert first["title"] == "vector h1"
+
+    skill_only = candidates[2]
+    assert skill_only["vector_score"] is None
+    assert (skill_only["title"], skill_only["ps"]) == ("Data Days", "Analytics")
+
+
+def test_retrieve_falls_back_to_the_skill_index_when_vectors_fail():
+    retriever = StubRetriever(ConnectionError("index down"), built_index())
+    candidates = asyncio.run(retriever.retrieve("web", ["react"], top_k=5))
+    assert [c["id"] for c in candidates] == ["h2"]
+    assert candidates[0]["skill_score"] is not None
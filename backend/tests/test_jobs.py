@@ -0,0 +1,219 @@
+"""JobQueue: dedup, compare-and-set claims, lease renewal and secret ownership."""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core import jobs
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.jobs import JobQueue, LeaseLost
+from app.models.job_models import BackgroundJob, JobWorker
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    db = SessionLocal()
+    try:
+        db.query(BackgroundJob).delete()
+        db.query(JobWorker).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def make_queue(kind: str, handler=None) -> JobQueue:
+    queue = JobQueue(concurrency=1, name="Test queue")
+
+    async def default_handler(payload, secrets):
+        return {"echo": payload}
+
+    queue.handler(kind)(handler or default_handler)
+    return queue
+
+
+def job_row(job_id: str) -> BackgroundJob:
+    db = SessionLocal()
+    try:
+        return db.query(BackgroundJob).filter(BackgroundJob.id == job_id).one()
+    finally:
+        db.close()
+
+
+def update_row(model, row_id: str, **values):
+    db = SessionLocal()
+    try:
+        db.query(model).filter(model.id == row_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_enqueue_returns_active_job_for_same_dedup_key():
+    queue = make_queue("dedup")
+    first = asyncio.run(queue.enqueue("dedup", {"n": 1}, dedup_key="dedup:a"))
+    second = asyncio.run(queue.enqueue("dedup", {"n": 2}, dedup_key="dedup:a"))
+    assert second["id"] == first["id"]
+
+    other = asyncio.run(queue.enqueue("dedup", {"n": 3}, dedup_key="dedup:b"))
+    assert other["id"] != first["id"]
+
+    update_row(BackgroundJob, first["id"], status="succeeded")
+    again = asyncio.run(queue.enqueue("dedup", {"n": 4}, dedup_key="dedup:a"))
+    assert again["id"] != first["id"]
+
+
+def test_enqueue_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        asyncio.run(make_queue("known").enqueue("unknown", {}))
+
+
+def test_partial_unique_index_allows_one_active_job_per_key():
+    db = SessionLocal()
+    try:
+        db.add(BackgroundJob(id=str(uuid.uuid4()), kind="k", dedup_key="same", status="succeeded"))
+        db.add(BackgroundJob(id=str(uuid.uuid4()), kind="k", dedup_key="same", status="queued"))
+        db.commit()
+
+        db.add(BackgroundJob(id=str(uuid.uuid4()), kind="k", dedup_key="same", status="running"))
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
+    finally:
+        db.close()
+
+
+def test_claim_is_exclusive_until_the_lease_expires():
+    queue_a, queue_b = make_queue("claim"), make_queue("claim")
+    job = asyncio.run(queue_a.enqueue("claim", {"x": 1}))
+
+    claimed = queue_a._claim_sync()
+    assert claimed[:4] == (job["id"], "claim", {"x": 1}, 1)
+    assert queue_b._claim_sync() is None
+
+    update_row(BackgroundJob, job["id"], lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+    reclaimed = queue_b._claim_sync()
+    assert reclaimed[0] == job["id"] and reclaimed[3] == 2
+
+    # The first worker's claim (attempt 1) no longer owns the job
+    assert queue_a._renew_sync(job["id"], 1) is False
+    assert queue_a._finish_sync(job["id"], 1, "succeeded", {"stale": True}) is False
+    assert queue_b._finish_sync(job["id"], 2, "succeeded", {"ok": True}) is True
+    assert job_row(job["id"]).status == "succeeded"
+
+
+def test_claim_only_picks_due_jobs_of_handled_kinds():
+    queue = make_queue("due")
+    other = make_queue("other")
+    asyncio.run(other.enqueue("other", {}))
+    job = asyncio.run(queue.enqueue("due", {}))
+    update_row(BackgroundJob, job["id"], run_after=datetime.utcnow() + timedelta(minutes=5))
+    assert queue._claim_sync() is None
+
+
+def test_lost_lease_cancels_the_running_handler(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 3)  # Renew every second
+    started = asyncio.Event()
+
+    async def slow(payload, secrets):
+        started.set()
+        await asyncio.sleep(30)
+
+    queue = make_queue("lease", slow)
+
+    async def scenario():
+        job = await queue.enqueue("lease", {})
+        _, _, payload, attempt, _, _ = queue._claim_sync()
+        run = asyncio.ensure_future(queue._run_with_heartbeat(job["id"], attempt, slow(payload, {})))
+        await started.wait()
+        # Another worker reclaims the job
+        update_row(BackgroundJob, job["id"], attempts=attempt + 1)
+        with pytest.raises(LeaseLost):
+            await asyncio.wait_for(run, timeout=5)
+
+    asyncio.run(scenario())
+
+
+def test_secret_job_waits_for_its_owner_then_fails_once_orphaned():
+    calls = []
+
+    async def handler(payload, secrets):
+        calls.append(secrets)
+
+    owner, other = make_queue("secret", handler), make_queue("secret", handler)
+    job = asyncio.run(owner.enqueue("secret", {}, secrets={"token": "t"}))
+    assert job_row(job["id"]).owner_id == owner.owner_id
+
+    # Owner is alive: nobody else may claim the job
+    assert other._claim_sync() is None
+
+    stale = datetime.utcnow() - timedelta(seconds=settings.JOB_OWNER_TIMEOUT_SECONDS + 1)
+    update_row(JobWorker, owner.owner_id, heartbeat_at=stale)
+    claimed = other._claim_sync()
+    assert claimed is not None and claimed[5] is True
+
+    asyncio.run(other._run_one(*claimed))
+    row = job_row(job["id"])
+    assert row.status == "failed" and "secrets" in row.error
+    assert calls == []
+
+
+def test_owner_runs_its_secret_job_with_the_secrets():
+    seen = []
+
+    async def handler(payload, secrets):
+        seen.append(secrets)
+        return {"ok": True}
+
+    owner = make_queue("secret_run", handler)
+    job = asyncio.run(owner.enqueue("secret_run", {}, secrets={"token": "t"}))
+    asyncio.run(owner._run_one(*owner._claim_sync()))
+
+    assert seen == [{"token": "t"}]
+    assert job_row(job["id"]).status == "succeeded"
+    assert job["id"] not in owner._secrets
+
+
+def test_stop_retires_the_heartbeat_row():
+    queue = make_queue("retire")
+
+    async def scenario():
+        await queue.start()
+        assert queue._heartbeat is not None
+        await queue.stop()
+
+    asyncio.run(scenario())
+    db = SessionLocal()
+    try:
+        assert db.query(JobWorker).filter(JobWorker.id == queue.owner_id).first() is None
+    finally:
+        db.close()
+
+
+def test_failed_job_is_retried_then_succeeds(monkeypatch):
+    monkeypatch.setattr(jobs, "RETRY_BASE_SECONDS", 0.0)
+    attempts = []
+
+    async def flaky(payload, secrets):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return {"attempts": len(attempts)}
+
+    queue = make_queue("flaky", flaky)
+
+    async def scenario():
+        await queue.start()
+        try:
+            job = await queue.enqueue("flaky", {})
+            return await queue.wait(job["id"], timeout=10)
+        finally:
+            await queue.stop()
+
+    result = asyncio.run(scenario())
+    assert result["status"] == "succeeded"
+    assert result["attempts"] == 2
+    assert result["result"] == {"attempts": 2}
@@ -0,0 +1,254 @@
+"""LLM governor: retry-after parsing, token buckets, priority admission and AIMD concurrency."""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.utils import llm_governor
+from app.utils.llm_governor import (
+    PRIORITY_AGENT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMGovernor,
+    TokenBucket,
+    llm_priority,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    """Stands in for the ``time`` module inside app.utils.llm_governor."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_governor, "time", fake)
+    return fake
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after": "3"}, 3.0),
+    ({"retry-after": "-1"}, 0.0),
+    ({"x-ratelimit-reset-requests": "1m2.5s"}, 62.5),
+    ({"x-ratelimit-reset-requests": "250ms", "x-ratelimit-reset-tokens": "2s"}, 2.0),
+    ({"retry-after": "soon", "x-ratelimit-reset-tokens": "1h"}, 3600.0),
+    ({}, None),
+    (None, None),
+])
+def test_parse_retry_after(headers, expected):
+    assert parse_retry_after(headers) == expected
+
+
+def test_bucket_refills_continuously(clock):
+    bucket = TokenBucket(60)  # One token per second
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.advance(0.5)
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    clock.advance(100)
+    assert bucket.wait_time(60) == 0.0
+    assert bucket.level == 60  # Capped at capacity
+
+
+def test_oversized_request_only_needs_a_full_bucket(clock):
+    bucket = TokenBucket(100)
+    assert bucket.wait_time(500) == 0.0
+    bucket.take(500)
+    assert bucket.level == 0
+
+
+def test_bucket_clamp_and_block(clock):
+    bucket = TokenBucket(100)
+    bucket.clamp(10)
+    assert bucket.level == 10
+    bucket.give(1000)
+    assert bucket.level == 100
+
+    bucket.block_for(5)
+    assert bucket.level == 0
+    assert bucket.wait_time(1) == pytest.approx(5.0)
+
+
+def governor(**kwargs) -> LLMGovernor:
+    options = {"rpm": 1000, "tpm": 1_000_000, "max_concurrency": 8, "max_retries": 2, "workers": 1}
+    options.update(kwargs)
+    return LLMGovernor(**options)
+
+
+def test_limits_are_split_across_workers():
+    gov = governor(rpm=30, tpm=12000, workers=3)
+    assert gov.requests.capacity == 10
+    assert gov.tokens.capacity == 4000
+
+
+def test_queued_callers_are_admitted_by_priority():
+    gov = governor(max_concurrency=1)
+    order = []
+
+    async def call(name, priority):
+        await gov._acquire(priority, 1)
+        order.append(name)
+
+    async def scenario():
+        await gov._acquire(PRIORITY_INTERACTIVE, 1)  # Holds the only slot
+        waiters = [
+            asyncio.ensure_future(call("background", PRIORITY_BACKGROUND)),
+            asyncio.ensure_future(call("agent", PRIORITY_AGENT)),
+            asyncio.ensure_future(call("interactive", PRIORITY_INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        for _ in waiters:
+            gov._release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiters)
+
+    asyncio.run(scenario())
+    assert order == ["interactive", "agent", "background"]
+
+
+def test_empty_bucket_defers_admission_until_refilled():
+    gov = governor()
+
+    async def scenario():
+        gov.requests.level = 0
+        waiter = asyncio.ensure_future(gov._acquire(PRIORITY_AGENT, 1))
+        await asyncio.sleep(0)
+        assert not waiter.done() and gov._timer is not None
+        gov.requests.level = gov.requests.capacity
+        gov._timer.cancel()
+        gov._pump()
+        await asyncio.wait_for(waiter, 1)
+        return gov.in_flight
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_cancelled_waiter_does_not_take_a_slot():
+    gov = governor(max_concurrency=1)
+
+    async def scenario():
+        await gov._acquire(PRIORITY_AGENT, 1)
+        gave_up = asyncio.ensure_future(gov._acquire(PRIORITY_INTERACTIVE, 1))
+        waiting = asyncio.ensure_future(gov._acquire(PRIORITY_AGENT, 1))
+        await asyncio.sleep(0)
+        gave_up.cancel()
+        await asyncio.sleep(0)
+        gov._release()
+        await asyncio.wait_for(waiting, 1)
+        return gov.in_flight
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_aimd_adds_slowly_and_halves_once_per_cooldown(clock):
+    gov = governor(max_concurrency=8)
+    assert gov.limit == 4
+    gov._on_success(None, 0, None)
+    assert gov.limit == pytest.approx(4.25)
+
+    gov._on_rate_limited(None)
+    assert gov.limit == pytest.approx(2.125)
+    gov._on_rate_limited(None)  # Same cooldown window
+    assert gov.limit == pytest.approx(2.125)
+
+    clock.advance(llm_governor.DECREASE_COOLDOWN_SECONDS)
+    gov._on_rate_limited(2.0)
+    assert gov.limit == pytest.approx(1.0625)
+    assert gov.requests.wait_time(1) == pytest.approx(2.0)
+
+    for _ in range(1000):
+        gov._on_success(None, 0, None)
+    assert gov.limit == 8
+
+
+def test_success_refunds_estimated_tokens_and_trusts_provider_headers(clock):
+    gov = governor(tpm=10_000)
+    gov.tokens.take(3000)
+    gov._on_success({}, 3000, 1000)
+    assert gov.tokens.level == pytest.approx(9000)
+
+    gov._on_success({"x-ratelimit-remaining-tokens": "500", "x-ratelimit-remaining-requests": "bad"}, 0, None)
+    assert gov.tokens.level == pytest.approx(500)
+
+
+class FakeCompletions:
+    """``client.chat.completions`` whose raw responses follow a script of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.with_raw_response = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        completion = SimpleNamespace(content=outcome, usage=usage)
+        return SimpleNamespace(headers={"x-ratelimit-remaining-requests": "99"}, parse=lambda: completion)
+
+
+@pytest.fixture
+def groq_client(monkeypatch):
+    groq = pytest.importorskip("groq")
+    monkeypatch.setattr(llm_governor, "RETRY_BASE_SECONDS", 0.0)
+
+    def install(outcomes):
+        completions = FakeCompletions(outcomes)
+        client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        monkeypatch.setattr(llm_governor, "get_groq_client", lambda: client)
+        return completions
+
+    install.groq = groq
+    return install
+
+
+def test_chat_completion_retries_rate_limits_and_connection_errors(groq_client):
+    groq = groq_client.groq
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    throttled = groq.RateLimitError(
+        "slow down", response=httpx.Response(429, headers={"retry-after": "0"}, request=request), body=None
+    )
+    completions = groq_client([throttled, groq.APIConnectionError(request=request), "hello"])
+
+    gov = governor()
+    completion = asyncio.run(gov.chat_completion(model="m", messages=[{"role": "user", "content": "hi"}]))
+    assert completion.content == "hello"
+    assert completions.calls == 3
+    assert gov.in_flight == 0
+    assert gov.requests.level <= 99
+
+
+def test_chat_completion_does_not_retry_client_errors(groq_client):
+    groq = groq_client.groq
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    bad_request = groq.BadRequestError("bad", response=httpx.Response(400, request=request), body=None)
+    completions = groq_client([bad_request, "unused"])
+
+    gov = governor()
+    with pytest.raises(groq.BadRequestError):
+        asyncio.run(gov.chat_completion(model="m", messages=[]))
+    assert completions.calls == 1
+    assert gov.in_flight == 0
+
+
+def test_llm_priority_sets_the_default_priority():
+    assert llm_governor._default_priority.get() == PRIORITY_AGENT
+    with llm_priority(PRIORITY_BACKGROUND):
+        assert llm_governor._default_priority.get() == PRIORITY_BACKGROUND
+    assert llm_governor._default_priority.get() == PRIORITY_AGENT
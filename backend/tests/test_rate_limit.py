@@ -0,0 +1,202 @@
+"""GCRA rate limiting: limit parsing, the memory and Lua backends, prefetch and the middleware."""
+import asyncio
+import os
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    GCRA_LUA,
+    GCRARateLimiter,
+    MemoryGCRABackend,
+    RateLimit,
+    create_rate_limit_middleware,
+    parse_limit,
+)
+
+
+class FakeClock:
+    """Stands in for the ``time`` module inside app.core.rate_limit."""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("100/minute", RateLimit(100, 60)),
+    ("100 per minute", RateLimit(100, 60)),
+    ("10/2 seconds", RateLimit(10, 2)),
+    (" 5 / hour ", RateLimit(5, 3600)),
+])
+def test_parse_limit(value, expected):
+    assert parse_limit(value) == expected
+
+
+def test_parse_limit_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_limit("lots/fortnight")
+
+
+def test_prefetch_is_a_small_fraction_of_the_limit():
+    assert RateLimit(10, 60).prefetch == 1
+    assert RateLimit(100, 60).prefetch == 5
+    assert RateLimit(100_000, 60).prefetch == rate_limit.PREFETCH_MAX
+
+
+def test_memory_backend_allows_a_full_burst_then_one_token_per_interval(clock):
+    backend = MemoryGCRABackend()
+    limit = RateLimit(10, 60)  # One token every 6s
+
+    granted = [asyncio.run(backend.acquire("k", limit, 1))[0] for _ in range(12)]
+    assert granted == [1] * 10 + [0, 0]
+
+    _, retry_after_ms = asyncio.run(backend.acquire("k", limit, 1))
+    assert retry_after_ms == pytest.approx(6000)
+
+    clock.advance(6)
+    assert asyncio.run(backend.acquire("k", limit, 1))[0] == 1
+    assert asyncio.run(backend.acquire("k", limit, 1))[0] == 0
+
+
+def test_memory_backend_grants_at_most_what_is_available(clock):
+    backend = MemoryGCRABackend()
+    limit = RateLimit(10, 60)
+    assert asyncio.run(backend.acquire("k", limit, 8))[0] == 8
+    assert asyncio.run(backend.acquire("k", limit, 8))[0] == 2
+    assert asyncio.run(backend.acquire("other", limit, 8))[0] == 8
+
+
+def test_limiter_spends_prefetched_tokens_locally(clock):
+    limiter = GCRARateLimiter("memory://")
+    calls = []
+    acquire = limiter.backend.acquire
+
+    async def counting_acquire(key, limit, requested):
+        calls.append(requested)
+        return await acquire(key, limit, requested)
+
+    limiter.backend.acquire = counting_acquire
+    limit = RateLimit(100, 60)  # prefetch 5
+
+    allowed = [asyncio.run(limiter.hit("k", limit))[0] for _ in range(100)]
+    assert all(allowed)
+    assert calls == [5] * 20
+
+    ok, retry_after = asyncio.run(limiter.hit("k", limit))
+    assert not ok and retry_after == pytest.approx(0.6)
+
+
+def test_unused_prefetched_tokens_expire(clock):
+    limiter = GCRARateLimiter("memory://")
+    limit = RateLimit(100, 60)
+    asyncio.run(limiter.hit("k", limit))
+    assert limiter._local["k"][0] == 4
+
+    clock.advance(rate_limit.PREFETCH_TTL_SECONDS + 0.1)
+    asyncio.run(limiter.hit("k", limit))
+    # A fresh batch was fetched; the 4 stale tokens were not spent
+    assert limiter._local["k"][0] == 4
+
+
+def test_limiter_falls_back_to_memory_when_backend_fails(clock):
+    limiter = GCRARateLimiter("memory://")
+
+    async def broken(key, limit, requested):
+        raise ConnectionError("redis down")
+
+    limiter.backend = type("Broken", (), {"acquire": staticmethod(broken)})()
+    limit = RateLimit(2, 60)
+    results = [asyncio.run(limiter.hit("k", limit))[0] for _ in range(3)]
+    assert results == [True, True, False]
+
+
+@pytest.fixture
+def redis_client():
+    """A real Redis from ``TEST_REDIS_URL``, else fakeredis with its Lua runtime."""
+    url = os.environ.get("TEST_REDIS_URL")
+    if url:
+        import redis
+        client = redis.Redis.from_url(url)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeRedis()
+    yield client
+    client.close()
+
+
+def test_lua_script_matches_memory_backend(redis_client, clock):
+    script = redis_client.register_script(GCRA_LUA)
+    key = f"rl:test:{uuid.uuid4().hex}"
+    limit = RateLimit(10, 60)
+    now_ms = int(clock.time() * 1000)
+    memory = MemoryGCRABackend()
+
+    def lua(requested, at_ms):
+        granted, retry_after_ms, _ = script(keys=[key], args=[limit.interval_ms, limit.tolerance_ms, at_ms, requested])
+        return int(granted), float(retry_after_ms)
+
+    try:
+        granted = []
+        for requested in (4, 4, 4, 1):
+            result = lua(requested, now_ms)
+            assert result == pytest.approx(asyncio.run(memory.acquire(key, limit, requested)))
+            granted.append(result[0])
+        assert granted == [4, 4, 2, 0]
+        assert 0 < redis_client.pttl(key) <= 60_000
+
+        clock.advance(6)
+        assert lua(4, now_ms + 6000) == pytest.approx(asyncio.run(memory.acquire(key, limit, 4)))
+    finally:
+        redis_client.delete(key)
+
+
+def make_app(limiter: GCRARateLimiter, ip_limit: str = "2/minute") -> TestClient:
+    app = FastAPI()
+    app.middleware("http")(create_rate_limit_middleware(limiter, ip_limit=ip_limit, user_limit="100/minute"))
+
+    @app.get("/x")
+    async def x():
+        return {"ok": True}
+
+    @app.get("/api/ready")
+    async def ready():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_middleware_returns_429_with_retry_headers():
+    client = make_app(GCRARateLimiter("memory://"))
+    assert [client.get("/x").status_code for _ in range(2)] == [200, 200]
+
+    response = client.get("/x")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["RateLimit-Limit"] == "2"
+    assert response.json()["retry_after"] == int(response.headers["Retry-After"])
+
+
+def test_middleware_exempts_probe_and_metrics_paths():
+    client = make_app(GCRARateLimiter("memory://"))
+    assert {client.get("/api/ready").status_code for _ in range(10)} == {200}
+    assert client.options("/x").status_code != 429
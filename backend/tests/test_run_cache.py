@@ -0,0 +1,99 @@
+"""Whole-run agent cache: fingerprints, catalog-version invalidation and coalescing."""
+import asyncio
+
+import pytest
+
+import app.agents
+from app.agents import run_cache
+from app.agents.run_cache import AgentRunCache, profile_fingerprint, run_agent_cached
+from app.core import cache
+
+
+@pytest.fixture(autouse=True)
+def local_only(monkeypatch):
+    monkeypatch.setattr(cache, "redis_client", None)
+    monkeypatch.setattr(run_cache, "agent_run_cache", AgentRunCache(max_entries=2, ttl_seconds=60))
+
+
+class FakeAgent:
+    def __init__(self, degraded: bool = False):
+        self.calls = 0
+        self.degraded = degraded
+
+    async def ainvoke(self, state):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {**state, "selected_hackathon": {"id": "h1"}, "degraded": self.degraded, "messages": [object()]}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    fake = FakeAgent()
+    monkeypatch.setattr(app.agents, "get_agent", lambda: fake)
+    return fake
+
+
+def state(user_id: str, skills=("Python", "React")) -> dict:
+    return {"user_id": user_id, "skills": list(skills), "github_summary": "Builds  web apps", "github_username": "Octo"}
+
+
+def test_fingerprint_ignores_case_order_duplicates_and_whitespace():
+    a = profile_fingerprint(["Python", "react", "python"], "Builds\n web  apps", "Octo")
+    b = profile_fingerprint([" React ", "PYTHON", ""], "Builds web apps", "octo")
+    assert a == b
+    assert a != profile_fingerprint(["Python"], "Builds web apps", "octo")
+
+
+def test_identical_profiles_reuse_the_run_with_their_own_user_id(agent):
+    first, hit = asyncio.run(run_agent_cached(state("u1")))
+    assert hit is False and first["user_id"] == "u1"
+    assert first["messages"] == []
+
+    second, hit = asyncio.run(run_agent_cached(state("u2", skills=("react", "PYTHON"))))
+    assert hit is True and second["user_id"] == "u2"
+    assert second["selected_hackathon"] == {"id": "h1"}
+    assert agent.calls == 1
+
+
+def test_concurrent_identical_runs_execute_once(agent):
+    async def scenario():
+        return await asyncio.gather(*[run_agent_cached(state(f"u{i}")) for i in range(4)])
+
+    results = asyncio.run(scenario())
+    assert agent.calls == 1
+    assert [r["user_id"] for r, _ in results] == ["u0", "u1", "u2", "u3"]
+
+
+def test_catalog_bump_invalidates_cached_runs(agent):
+    asyncio.run(run_agent_cached(state("u1")))
+    asyncio.run(run_cache.bump_catalog_version())
+    _, hit = asyncio.run(run_agent_cached(state("u1")))
+    assert hit is False and agent.calls == 2
+
+
+def test_degraded_runs_are_not_cached(monkeypatch):
+    fake = FakeAgent(degraded=True)
+    monkeypatch.setattr(app.agents, "get_agent", lambda: fake)
+    asyncio.run(run_agent_cached(state("u1")))
+    asyncio.run(run_agent_cached(state("u1")))
+    assert fake.calls == 2
+
+
+def test_local_cache_is_bounded_lru():
+    runs = AgentRunCache(max_entries=2, ttl_seconds=60)
+
+    async def scenario():
+        for name in ("a", "b"):
+            await runs.set(name, {"name": name})
+        assert await runs.get("a") is not None  # Touch a: b is now oldest
+        await runs.set("c", {"name": "c"})
+        return [await runs.get(name) for name in ("a", "b", "c")]
+
+    a, b, c = asyncio.run(scenario())
+    assert a["name"] == "a" and b is None and c["name"] == "c"
+
+
+def test_disabled_cache_stores_nothing():
+    runs = AgentRunCache(ttl_seconds=0)
+    asyncio.run(runs.set("x", {"v": 1}))
+    assert asyncio.run(runs.get("x")) is None
@@ -0,0 +1,127 @@
+"""SingleFlight: in-process coalescing and cross-worker coalescing through Redis."""
+import asyncio
+
+import pytest
+
+from app.core import cache
+from app.core.single_flight import SingleFlight
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(cache, "redis_client", None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lock release is a Lua script
+    monkeypatch.setattr(cache, "redis_client", fakeredis.aioredis.FakeRedis())
+
+
+def test_concurrent_calls_share_one_execution(no_redis):
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    async def scenario():
+        return await asyncio.gather(*[flight.do("key", work) for _ in range(5)])
+
+    results = asyncio.run(scenario())
+    assert calls == [1]
+    assert [r for r, _ in results] == [{"value": 42}] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight._inflight == {}
+
+
+def test_different_keys_run_independently(no_redis):
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def scenario():
+        return await asyncio.gather(flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b")))
+
+    assert asyncio.run(scenario()) == [("a", False), ("b", False)]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_errors_reach_every_caller_and_the_key_is_released(no_redis):
+    flight = SingleFlight("test")
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        return await asyncio.gather(*[flight.do("key", failing) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert calls == [1]
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def ok():
+        return "fresh"
+
+    assert asyncio.run(flight.do("key", ok)) == ("fresh", False)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_work(no_redis):
+    flight = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == ("done", True)
+
+
+def test_follower_in_another_worker_receives_the_leaders_result(fake_redis):
+    # Separate instances share nothing in-process, like two uvicorn workers
+    leader, follower = SingleFlight("test"), SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return {"value": 7}
+
+    async def scenario():
+        lead = asyncio.ensure_future(leader.do("key", work))
+        await asyncio.sleep(0.05)  # Leader holds the Redis lock
+        follow = asyncio.ensure_future(follower.do("key", work))
+        return await asyncio.gather(lead, follow)
+
+    assert asyncio.run(scenario()) == [({"value": 7}, False), ({"value": 7}, True)]
+    assert calls == [1]
+
+
+def test_follower_runs_the_work_when_the_leader_vanishes(fake_redis):
+    flight = SingleFlight("test", lock_ttl_seconds=5)
+
+    async def work():
+        return "ran locally"
+
+    async def scenario():
+        # A leader in a crashed worker: lock held briefly, no result ever published
+        await cache.redis_client.set("test:lock:key", "dead-leader", px=300)
+        return await flight.do("key", work)
+
+    assert asyncio.run(scenario()) == ("ran locally", False)